@@ -3,9 +3,10 @@ Centralized configuration management for PlayerGold
 Handles environment variables, config files, and default settings
 """
 
+import copy
 import os
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 import yaml
 from pydantic import Field
 from pydantic_settings import BaseSettings
@@ -87,6 +88,28 @@ class PlayerGoldConfig(BaseSettings):
     }
 
 
+# Use libyaml's C parser when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Parsed config files keyed by resolved path, with the mtime they were parsed at
+_yaml_cache: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
+
+def _load_yaml_file(config_path: Path) -> Dict[str, Any]:
+    """Parse a YAML config file, reusing the previous parse if the file is unchanged"""
+    path = str(config_path.resolve())
+    mtime = config_path.stat().st_mtime_ns
+    
+    cached = _yaml_cache.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(config_path, 'r') as f:
+            cached = (mtime, yaml.load(f, Loader=_YAML_LOADER) or {})
+        _yaml_cache[path] = cached
+    
+    # Callers may mutate the result
+    return copy.deepcopy(cached[1])
+
+
 def load_config(config_file: Optional[str] = None) -> PlayerGoldConfig:
     """Load configuration from file and environment variables"""
     
@@ -98,10 +121,7 @@ def load_config(config_file: Optional[str] = None) -> PlayerGoldConfig:
     
     # Load from YAML config file if provided
     if config_file and Path(config_file).exists():
-        with open(config_file, 'r') as f:
-            file_config = yaml.safe_load(f)
-            if file_config:
-                config_data.update(file_config)
+        config_data.update(_load_yaml_file(Path(config_file)))
     
     # Create configuration instance (will also load from environment)
     config = PlayerGoldConfig(**config_data)
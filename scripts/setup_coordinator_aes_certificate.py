@@ -157,8 +157,7 @@ def save_certificate(master_key, key_hash, public_pem, private_pem):
         "master_key_hash": key_hash,
         "key_size_bits": 256,
         "algorithm": "AES-256-GCM",
-        "kdf": "PBKDF2-HMAC-SHA256",
-        "iterations": 100000,
+        "kdf": "HKDF-SHA256",
         "description": "PlayerGold Network Coordinator AES Certificate",
         "permanent": True,
         "auto_renew": False
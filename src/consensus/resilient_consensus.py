@@ -6,17 +6,35 @@ when connectivity is restored, and automatic defenses against attacks.
 """
 
 import asyncio
+import functools
+import inspect
+import itertools
 import logging
+import struct
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional, Set, Tuple, Any
-from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple, Any, Union
+from collections import defaultdict, deque
 import hashlib
 import json
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# Slotted dataclasses drop the per-instance __dict__ (Python 3.10+)
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+def _make_partition_id(node_ids: Set[str]) -> str:
+    """Derive a partition id from its members and the current wall-clock time"""
+    hasher = hashlib.sha256(str(sorted(node_ids)).encode())
+    hasher.update(struct.pack('<Q', time.time_ns()))
+    return hasher.hexdigest()[:16]
+
 
 class NetworkState(Enum):
     """State of the network"""
@@ -36,37 +54,353 @@ class AttackType(Enum):
     TIMING_ATTACK = "timing_attack"
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class NetworkPartition:
     """Represents a network partition"""
     partition_id: str
     node_ids: Set[str]
     partition_size: int
     is_majority: bool
-    created_at: float = field(default_factory=time.time)
+    created_at: float = field(default_factory=time.monotonic)
     last_block_hash: Optional[str] = None
     block_height: int = 0
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class SyncState:
     """Synchronization state between nodes"""
     node_id: str
-    last_sync_time: float
+    last_sync_time: float  # time.monotonic() of the last completed sync
     blocks_behind: int
     sync_in_progress: bool = False
     sync_progress: float = 0.0  # 0.0 to 1.0
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
+class SybilEvidence:
+    """Evidence for a suspected Sybil attack"""
+    isolation_ratio_low: bool
+    cluster_size: int
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {'isolation_ratio': 'low' if self.isolation_ratio_low else 'normal', 'cluster_size': self.cluster_size}
+
+
+@dataclass(**_DATACLASS_SLOTS)
+class FloodingEvidence:
+    """Evidence for a suspected flooding attack"""
+    avg_rate: float
+    threshold: float
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {'avg_rate': self.avg_rate, 'threshold': self.threshold}
+
+
+@dataclass(**_DATACLASS_SLOTS)
+class ConsensusEvidence:
+    """Evidence for suspected consensus manipulation"""
+    pattern: str
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {'pattern': self.pattern}
+
+
+AttackEvidence = Union[SybilEvidence, FloodingEvidence, ConsensusEvidence]
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class AttackDetection:
     """Attack detection record"""
     attack_type: AttackType
     suspected_nodes: List[str]
-    detection_time: float = field(default_factory=time.time)
+    detection_time: float = field(default_factory=time.monotonic)
     confidence: float = 0.0  # 0.0 to 1.0
-    evidence: Dict[str, Any] = field(default_factory=dict)
+    evidence: Optional[AttackEvidence] = None
     mitigated: bool = False
+    
+    def evidence_dict(self) -> Dict[str, Any]:
+        """Get the evidence as a plain dict for serialization"""
+        return self.evidence.to_dict() if self.evidence is not None else {}
+
+
+class MessageRateTracker:
+    """Per-node message rates with an incrementally maintained total"""
+    
+    def __init__(self):
+        self._index: Dict[str, int] = {}
+        self._node_ids: List[str] = []
+        self._rates: List[int] = []
+        self._sum = 0
+    
+    def set_rate(self, node_id: str, rate: int):
+        """Set the current message rate for a node"""
+        idx = self._index.get(node_id)
+        if idx is None:
+            self._index[node_id] = len(self._node_ids)
+            self._node_ids.append(node_id)
+            self._rates.append(rate)
+            self._sum += rate
+        else:
+            self._sum += rate - self._rates[idx]
+            self._rates[idx] = rate
+    
+    def remove(self, node_id: str):
+        """Stop tracking a node"""
+        idx = self._index.pop(node_id, None)
+        if idx is None:
+            return
+        
+        self._sum -= self._rates[idx]
+        
+        # Swap the last entry into the freed slot to keep the lists dense
+        last_id = self._node_ids.pop()
+        last_rate = self._rates.pop()
+        if idx < len(self._node_ids):
+            self._node_ids[idx] = last_id
+            self._rates[idx] = last_rate
+            self._index[last_id] = idx
+    
+    def get_rate(self, node_id: str) -> int:
+        """Get the current message rate for a node"""
+        idx = self._index.get(node_id)
+        return self._rates[idx] if idx is not None else 0
+    
+    @property
+    def node_ids(self) -> List[str]:
+        return self._node_ids
+    
+    @property
+    def rates(self) -> List[int]:
+        return self._rates
+    
+    @property
+    def average(self) -> float:
+        return self._sum / len(self._rates) if self._rates else 0.0
+    
+    def __len__(self) -> int:
+        return len(self._rates)
+    
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self._index
+
+
+class ResponseTimeWindow:
+    """Fixed-size window of response times with a running sum"""
+    
+    def __init__(self, window_size: int = 1000):
+        self._samples: deque = deque(maxlen=window_size)
+        self._sum = 0.0
+    
+    def add(self, response_time: float):
+        """Add a sample, evicting the oldest one when the window is full"""
+        if len(self._samples) == self._samples.maxlen:
+            self._sum -= self._samples[0]
+        self._samples.append(response_time)
+        self._sum += response_time
+    
+    @property
+    def average(self) -> float:
+        return self._sum / len(self._samples) if self._samples else 0.0
+    
+    def __len__(self) -> int:
+        return len(self._samples)
+
+
+class NodeScoreTable:
+    """Dense float32 behavior scores indexed by node id"""
+    
+    def __init__(self, default_score: float = 1.0, initial_capacity: int = 64):
+        self.default_score = default_score
+        self._index: Dict[str, int] = {}
+        self._node_ids: List[str] = []
+        self._scores = np.full(initial_capacity, default_score, dtype=np.float32)
+    
+    def _slot(self, node_id: str) -> int:
+        idx = self._index.get(node_id)
+        if idx is not None:
+            return idx
+        
+        idx = len(self._node_ids)
+        if idx == len(self._scores):
+            grown = np.full(len(self._scores) * 2, self.default_score, dtype=np.float32)
+            grown[:idx] = self._scores
+            self._scores = grown
+        
+        self._index[node_id] = idx
+        self._node_ids.append(node_id)
+        return idx
+    
+    def __getitem__(self, node_id: str) -> float:
+        idx = self._index.get(node_id)
+        return float(self._scores[idx]) if idx is not None else self.default_score
+    
+    def __setitem__(self, node_id: str, score: float):
+        idx = self._slot(node_id)
+        self._scores[idx] = score
+    
+    def set_many(self, node_ids: List[str], scores: np.ndarray):
+        """Set the scores of several nodes at once"""
+        if not node_ids:
+            return
+        indices = [self._slot(node_id) for node_id in node_ids]
+        self._scores[indices] = scores
+    
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self._index
+    
+    def __len__(self) -> int:
+        return len(self._node_ids)
+    
+    def scores_below(self, threshold: float) -> List[str]:
+        """Get the nodes whose score is below a threshold"""
+        n = len(self._node_ids)
+        return [self._node_ids[i] for i in np.flatnonzero(self._scores[:n] < threshold)]
+    
+    def mean_score(self) -> float:
+        """Get the mean score across tracked nodes"""
+        n = len(self._node_ids)
+        return float(self._scores[:n].mean()) if n else self.default_score
+
+
+class BlockedNodeSet:
+    """Set of blocked nodes with a bloom filter for fast negative lookups
+    
+    Wraps a private set and exposes only the mutators below, so every change
+    bumps version and keeps the filter in step. Every insertion path sets the
+    node's two filter bits, so a clear bit proves the node is not blocked.
+    Removals rebuild the filter from the set.
+    """
+    
+    _BLOOM_BITS = 8192
+    _BLOOM_MASK = _BLOOM_BITS - 1
+    
+    def __init__(self, node_ids=()):
+        self._nodes: Set[str] = set()
+        self.version = 0
+        self._bloom = bytearray(self._BLOOM_BITS // 8)
+        self.update(node_ids)
+    
+    def _set_bits(self, node_id: str):
+        h = hash(node_id)
+        h1 = h & self._BLOOM_MASK
+        h2 = (h >> 16) & self._BLOOM_MASK
+        self._bloom[h1 >> 3] |= 1 << (h1 & 7)
+        self._bloom[h2 >> 3] |= 1 << (h2 & 7)
+    
+    def _rebuild_bloom(self):
+        self.version += 1
+        self._bloom = bytearray(self._BLOOM_BITS // 8)
+        for node_id in self._nodes:
+            self._set_bits(node_id)
+    
+    def might_contain(self, node_id: str) -> bool:
+        """Return False only if the node is definitely not in the set"""
+        h = hash(node_id)
+        h1 = h & self._BLOOM_MASK
+        h2 = (h >> 16) & self._BLOOM_MASK
+        return bool(self._bloom[h1 >> 3] & (1 << (h1 & 7))) and bool(self._bloom[h2 >> 3] & (1 << (h2 & 7)))
+    
+    def __contains__(self, node_id) -> bool:
+        return node_id in self._nodes
+    
+    def __len__(self) -> int:
+        return len(self._nodes)
+    
+    def __iter__(self):
+        return iter(self._nodes)
+    
+    def __repr__(self) -> str:
+        return f"BlockedNodeSet({self._nodes!r})"
+    
+    def add(self, node_id: str):
+        self._nodes.add(node_id)
+        self._set_bits(node_id)
+        self.version += 1
+    
+    def update(self, *others):
+        for other in others:
+            for node_id in other:
+                self.add(node_id)
+    
+    def __ior__(self, other):
+        self.update(other)
+        return self
+    
+    def remove(self, node_id: str):
+        self._nodes.remove(node_id)
+        self._rebuild_bloom()
+    
+    def discard(self, node_id: str):
+        if node_id in self._nodes:
+            self.remove(node_id)
+    
+    def clear(self):
+        self._nodes.clear()
+        self.version += 1
+        self._bloom = bytearray(self._BLOOM_BITS // 8)
+
+
+class AttackHistory:
+    """Bounded attack history with incrementally maintained statistics"""
+    
+    def __init__(self, max_size: int = 10000):
+        self._attacks: deque = deque(maxlen=max_size)
+        self._attack_ids: Set[int] = set()
+        self.version = 0
+        self.mitigated_count = 0
+        self.attack_type_counts: Dict[str, int] = defaultdict(int)
+    
+    def append(self, attack: AttackDetection):
+        """Record an attack, evicting the oldest one when full"""
+        if len(self._attacks) == self._attacks.maxlen:
+            self._forget(self._attacks[0])
+        
+        self._attacks.append(attack)
+        self._attack_ids.add(id(attack))
+        self.version += 1
+        self.attack_type_counts[attack.attack_type.value] += 1
+        if attack.mitigated:
+            self.mitigated_count += 1
+    
+    def extend(self, attacks: List[AttackDetection]):
+        """Record several attacks"""
+        for attack in attacks:
+            self.append(attack)
+    
+    def mark_mitigated(self, attack: AttackDetection):
+        """Flag an attack as mitigated, keeping the counters consistent"""
+        if attack.mitigated:
+            return
+        
+        attack.mitigated = True
+        if id(attack) in self._attack_ids:
+            self.mitigated_count += 1
+            self.version += 1
+    
+    def clear(self):
+        """Forget all recorded attacks"""
+        self._attacks.clear()
+        self._attack_ids.clear()
+        self.version += 1
+        self.mitigated_count = 0
+        self.attack_type_counts.clear()
+    
+    def _forget(self, attack: AttackDetection):
+        self._attack_ids.discard(id(attack))
+        self.attack_type_counts[attack.attack_type.value] -= 1
+        if not self.attack_type_counts[attack.attack_type.value]:
+            del self.attack_type_counts[attack.attack_type.value]
+        if attack.mitigated:
+            self.mitigated_count -= 1
+    
+    def __len__(self) -> int:
+        return len(self._attacks)
+    
+    def __iter__(self):
+        return iter(self._attacks)
+    
+    def __getitem__(self, index: int) -> AttackDetection:
+        return self._attacks[index]
 
 
 class PartitionDetector:
@@ -77,11 +411,30 @@ class PartitionDetector:
         self.partition_threshold = partition_threshold
         self.partitions: Dict[str, NetworkPartition] = {}
         self.node_to_partition: Dict[str, str] = {}
+        self._majority_nodes: Set[str] = set()
+        self.version = 0
+        
+        # Fingerprint of the last detect_partition input, for the steady-state fast path
+        self._last_reachable_hash: Optional[int] = None
+        self._last_reachable_key: Optional[Tuple[frozenset, frozenset]] = None
+        self._last_partition: Optional[NetworkPartition] = None
         
         logger.info("Partition Detector initialized")
     
     def detect_partition(self, reachable_nodes: Set[str], all_nodes: Set[str]) -> Optional[NetworkPartition]:
         """Detect if a network partition has occurred"""
+        reachable_key = (frozenset(reachable_nodes), frozenset(all_nodes))
+        reachable_hash = hash(reachable_key)
+        
+        # Unchanged connectivity: return the partition we already built
+        if (
+            reachable_hash == self._last_reachable_hash
+            and self._last_partition is not None
+            and self._last_partition.partition_id in self.partitions
+            and reachable_key == self._last_reachable_key
+        ):
+            return self._last_partition
+        
         unreachable_nodes = all_nodes - reachable_nodes
         
         if len(unreachable_nodes) == 0:
@@ -99,9 +452,7 @@ class PartitionDetector:
         # Create partition for reachable nodes
         is_majority = reachable_size > (len(all_nodes) * self.partition_threshold)
         
-        partition_id = hashlib.sha256(
-            f"{sorted(reachable_nodes)}_{time.time()}".encode()
-        ).hexdigest()[:16]
+        partition_id = _make_partition_id(reachable_nodes)
         
         partition = NetworkPartition(
             partition_id=partition_id,
@@ -111,11 +462,21 @@ class PartitionDetector:
         )
         
         self.partitions[partition_id] = partition
+        self.version += 1
         
         # Update node to partition mapping
         for node_id in reachable_nodes:
             self.node_to_partition[node_id] = partition_id
         
+        if is_majority:
+            self._majority_nodes |= reachable_nodes
+        else:
+            self._majority_nodes -= reachable_nodes
+        
+        self._last_reachable_hash = reachable_hash
+        self._last_reachable_key = reachable_key
+        self._last_partition = partition
+        
         logger.warning(f"Network partition detected: {partition_id} with {reachable_size} nodes (majority: {is_majority})")
         
         return partition
@@ -129,8 +490,7 @@ class PartitionDetector:
     
     def is_in_majority_partition(self, node_id: str) -> bool:
         """Check if a node is in the majority partition"""
-        partition = self.get_partition(node_id)
-        return partition.is_majority if partition else False
+        return node_id in self._majority_nodes
     
     def merge_partitions(self, partition_ids: List[str]) -> Optional[NetworkPartition]:
         """Merge multiple partitions when connectivity is restored"""
@@ -138,17 +498,16 @@ class PartitionDetector:
             return None
         
         # Collect all nodes from partitions
-        merged_nodes = set()
-        for partition_id in partition_ids:
-            if partition_id in self.partitions:
-                merged_nodes.update(self.partitions[partition_id].node_ids)
+        merged_nodes = set().union(*(
+            self.partitions[partition_id].node_ids
+            for partition_id in partition_ids
+            if partition_id in self.partitions
+        ))
         
         # Create new merged partition
         is_majority = len(merged_nodes) > (self.total_nodes * self.partition_threshold)
         
-        merged_partition_id = hashlib.sha256(
-            f"{sorted(merged_nodes)}_{time.time()}".encode()
-        ).hexdigest()[:16]
+        merged_partition_id = _make_partition_id(merged_nodes)
         
         merged_partition = NetworkPartition(
             partition_id=merged_partition_id,
@@ -158,15 +517,19 @@ class PartitionDetector:
         )
         
         self.partitions[merged_partition_id] = merged_partition
+        self.version += 1
         
         # Update mappings
-        for node_id in merged_nodes:
-            self.node_to_partition[node_id] = merged_partition_id
+        self.node_to_partition.update(dict.fromkeys(merged_nodes, merged_partition_id))
+        
+        if is_majority:
+            self._majority_nodes |= merged_nodes
+        else:
+            self._majority_nodes -= merged_nodes
         
         # Remove old partitions
         for partition_id in partition_ids:
-            if partition_id in self.partitions:
-                del self.partitions[partition_id]
+            self.partitions.pop(partition_id, None)
         
         logger.info(f"Merged {len(partition_ids)} partitions into {merged_partition_id}")
         
@@ -181,8 +544,10 @@ class PartitionDetector:
             for node_id in partition.node_ids:
                 if self.node_to_partition.get(node_id) == partition_id:
                     del self.node_to_partition[node_id]
+                    self._majority_nodes.discard(node_id)
             
             del self.partitions[partition_id]
+            self.version += 1
             logger.info(f"Cleared partition {partition_id}")
 
 
@@ -193,12 +558,39 @@ class AutoSynchronizer:
         self.sync_states: Dict[str, SyncState] = {}
         self.sync_callbacks: Dict[str, Any] = {}
         
+        # Blocking callbacks run here so block validation never stalls the event loop
+        self._blocking_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sync-blocking")
+        self._apply_lock: Optional[asyncio.Lock] = None
+        
         logger.info("Auto Synchronizer initialized")
     
     def register_sync_callback(self, callback_name: str, callback: Any):
         """Register a callback for synchronization operations"""
+        if not self._is_async_callable(callback):
+            callback = self._wrap_blocking_callback(callback)
         self.sync_callbacks[callback_name] = callback
     
+    @staticmethod
+    def _is_async_callable(callback: Any) -> bool:
+        """Return True for coroutine functions, including objects with an async __call__"""
+        return (asyncio.iscoroutinefunction(callback) or
+                asyncio.iscoroutinefunction(getattr(callback, '__call__', None)))
+    
+    def _wrap_blocking_callback(self, callback: Any) -> Any:
+        """Wrap a synchronous callback so it is awaited from the blocking executor"""
+        @functools.wraps(callback)
+        async def wrapper(*args, **kwargs):
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                self._blocking_executor, functools.partial(callback, *args, **kwargs)
+            )
+            # Lambdas and partials over async functions return an awaitable; finish it on the loop
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+        
+        return wrapper
+    
     async def synchronize_node(self, node_id: str, reference_nodes: List[str]) -> bool:
         """Synchronize a node with reference nodes"""
         if node_id not in self.sync_states:
@@ -214,6 +606,21 @@ class AutoSynchronizer:
             logger.debug(f"Sync already in progress for node {node_id}")
             return False
         
+        # Fast path: compare block heights before paying for full state transfers
+        if 'peek_height' in self.sync_callbacks:
+            try:
+                reference_height = await self.sync_callbacks['peek_height'](reference_nodes[0])
+                local_height = await self.sync_callbacks['peek_height'](node_id)
+            except Exception as e:
+                logger.debug(f"Height probe failed for node {node_id}, running full sync: {e}")
+            else:
+                if local_height >= reference_height:
+                    logger.debug(f"Node {node_id} is already synchronized at height {local_height}")
+                    sync_state.blocks_behind = 0
+                    sync_state.sync_progress = 1.0
+                    sync_state.last_sync_time = time.monotonic()
+                    return True
+        
         sync_state.sync_in_progress = True
         sync_state.sync_progress = 0.0
         
@@ -243,7 +650,7 @@ class AutoSynchronizer:
             if blocks_behind <= 0:
                 logger.info(f"Node {node_id} is already synchronized")
                 sync_state.sync_progress = 1.0
-                sync_state.last_sync_time = time.time()
+                sync_state.last_sync_time = time.monotonic()
                 sync_state.sync_in_progress = False
                 return True
             
@@ -266,7 +673,12 @@ class AutoSynchronizer:
             
             # Step 5: Validate and apply blocks
             if 'validate_and_apply_blocks' in self.sync_callbacks:
-                success = await self.sync_callbacks['validate_and_apply_blocks'](node_id)
+                # Only one block application may be in flight at a time
+                if self._apply_lock is None:
+                    self._apply_lock = asyncio.Lock()
+                
+                async with self._apply_lock:
+                    success = await self.sync_callbacks['validate_and_apply_blocks'](node_id)
                 
                 if not success:
                     logger.error(f"Failed to validate blocks for node {node_id}")
@@ -274,7 +686,7 @@ class AutoSynchronizer:
                     return False
             
             sync_state.sync_progress = 1.0
-            sync_state.last_sync_time = time.time()
+            sync_state.last_sync_time = time.monotonic()
             sync_state.blocks_behind = 0
             
             logger.info(f"Successfully synchronized node {node_id}")
@@ -292,7 +704,7 @@ class AutoSynchronizer:
         logger.info(f"Synchronizing partition {partition.partition_id} with {reference_partition.partition_id}")
         
         # Get reference nodes from the reference partition
-        reference_nodes = list(reference_partition.node_ids)[:3]  # Use top 3 nodes
+        reference_nodes = list(itertools.islice(reference_partition.node_ids, 3))  # Use top 3 nodes
         
         # Synchronize each node in the partition
         successful_syncs = 0
@@ -319,11 +731,15 @@ class AutoSynchronizer:
 class AttackDefenseSystem:
     """Automatic defense system against attacks and anomalous behavior"""
     
-    def __init__(self, detection_threshold: float = 0.7):
+    def __init__(self, detection_threshold: float = 0.7, max_attack_history: int = 10000,
+                 response_window_size: int = 1000):
         self.detection_threshold = detection_threshold
-        self.detected_attacks: List[AttackDetection] = []
-        self.node_behavior_scores: Dict[str, float] = defaultdict(lambda: 1.0)
-        self.blocked_nodes: Set[str] = set()
+        self.response_window_size = response_window_size
+        self.response_windows: Dict[str, ResponseTimeWindow] = {}
+        self.detected_attacks = AttackHistory(max_size=max_attack_history)
+        self.node_behavior_scores = NodeScoreTable(default_score=1.0)
+        self.blocked_nodes = BlockedNodeSet()
+        self._stats_cache: Optional[Tuple[Tuple[int, int], Dict[str, Any]]] = None
         self.defense_callbacks: Dict[str, Any] = {}
         
         logger.info("Attack Defense System initialized")
@@ -332,29 +748,59 @@ class AttackDefenseSystem:
         """Register a callback for defense actions"""
         self.defense_callbacks[callback_name] = callback
     
+    def record_response_time(self, node_id: str, response_time: float):
+        """Add a response time sample to a node's sliding window"""
+        window = self.response_windows.get(node_id)
+        if window is None:
+            window = self.response_windows[node_id] = ResponseTimeWindow(self.response_window_size)
+        window.add(response_time)
+    
     def analyze_node_behavior(self, node_id: str, behavior_data: Dict[str, Any]) -> float:
-        """Analyze node behavior and return anomaly score (0.0 = normal, 1.0 = highly anomalous)"""
-        anomaly_score = 0.0
+        """Analyze node behavior and return anomaly score (0.0 = normal, 1.0 = highly anomalous)
         
-        # Check for timing anomalies
-        if 'response_times' in behavior_data:
-            response_times = behavior_data['response_times']
-            if response_times:
-                avg_time = sum(response_times) / len(response_times)
-                if avg_time > 300:  # More than 300ms average
-                    anomaly_score += 0.3
+        Timing is taken from ``response_times`` when a full list is given; otherwise a
+        single ``response_time`` sample is pushed into the node's sliding window and
+        the window's running average is used.
+        """
+        _, scores = self.analyze_all({node_id: behavior_data})
+        return float(scores[0])
+    
+    def analyze_all(self, behavior_frame: Dict[str, Dict[str, Any]]) -> Tuple[List[str], np.ndarray]:
+        """Analyze the behavior of many nodes at once
+        
+        Returns the node ids alongside an array of their anomaly scores, in the
+        same order. Each node's behavior data is interpreted as in analyze_node_behavior.
+        """
+        node_ids = list(behavior_frame)
+        count = len(node_ids)
+        avg_times = np.zeros(count)
+        failure_rates = np.zeros(count)
+        pattern_scores = np.zeros(count)
+        
+        for i, (node_id, behavior_data) in enumerate(behavior_frame.items()):
+            if 'response_times' in behavior_data:
+                response_times = behavior_data['response_times']
+                if response_times:
+                    avg_times[i] = sum(response_times) / len(response_times)
+            elif 'response_time' in behavior_data:
+                self.record_response_time(node_id, behavior_data['response_time'])
+                avg_times[i] = self.response_windows[node_id].average
+            
+            if 'validation_failures' in behavior_data:
+                failure_rates[i] = behavior_data['validation_failures'] / max(behavior_data.get('total_validations', 1), 1)
+            
+            pattern_scores[i] = behavior_data.get('pattern_score', 0.0)
         
-        # Check for validation failures
-        if 'validation_failures' in behavior_data:
-            failure_rate = behavior_data['validation_failures'] / max(behavior_data.get('total_validations', 1), 1)
-            if failure_rate > 0.2:  # More than 20% failures
-                anomaly_score += 0.4
+        # More than 300ms average, more than 20% failures, suspicious patterns
+        scores = np.minimum(
+            0.3 * (avg_times > 300) + 0.4 * (failure_rates > 0.2) + 0.3 * pattern_scores,
+            1.0
+        )
         
-        # Check for suspicious patterns
-        if 'pattern_score' in behavior_data:
-            anomaly_score += behavior_data['pattern_score'] * 0.3
+        unblocked = [i for i, node_id in enumerate(node_ids) if node_id not in self.blocked_nodes]
+        self.node_behavior_scores.set_many([node_ids[i] for i in unblocked], 1.0 - scores[unblocked])
         
-        return min(anomaly_score, 1.0)
+        return node_ids, scores
     
     def detect_sybil_attack(self, node_connections: Dict[str, Set[str]]) -> Optional[AttackDetection]:
         """Detect potential Sybil attack"""
@@ -382,7 +828,7 @@ class AttackDefenseSystem:
                 attack_type=AttackType.SYBIL_ATTACK,
                 suspected_nodes=suspicious_clusters,
                 confidence=0.7,
-                evidence={'isolation_ratio': 'low', 'cluster_size': len(suspicious_clusters)}
+                evidence=SybilEvidence(isolation_ratio_low=True, cluster_size=len(suspicious_clusters))
             )
             
             self.detected_attacks.append(attack)
@@ -392,27 +838,31 @@ class AttackDefenseSystem:
         
         return None
     
-    def detect_flooding_attack(self, message_rates: Dict[str, int]) -> Optional[AttackDetection]:
+    def detect_flooding_attack(self, message_rates: Union[Dict[str, int], MessageRateTracker]) -> Optional[AttackDetection]:
         """Detect flooding attack based on message rates"""
-        suspicious_nodes = []
-        
         # Calculate average message rate
         if not message_rates:
             return None
         
-        avg_rate = sum(message_rates.values()) / len(message_rates)
+        if isinstance(message_rates, MessageRateTracker):
+            node_ids = message_rates.node_ids
+            rates = np.fromiter(message_rates.rates, dtype=np.int64, count=len(message_rates))
+            avg_rate = message_rates.average
+        else:
+            node_ids = list(message_rates)
+            rates = np.fromiter(message_rates.values(), dtype=np.int64, count=len(message_rates))
+            avg_rate = float(rates.sum()) / len(rates)
+        
         threshold = avg_rate * 5  # 5x average is suspicious
         
-        for node_id, rate in message_rates.items():
-            if rate > threshold:
-                suspicious_nodes.append(node_id)
+        suspicious_nodes = [node_ids[i] for i in np.flatnonzero(rates > threshold)]
         
         if suspicious_nodes:
             attack = AttackDetection(
                 attack_type=AttackType.FLOODING,
                 suspected_nodes=suspicious_nodes,
                 confidence=0.8,
-                evidence={'avg_rate': avg_rate, 'threshold': threshold}
+                evidence=FloodingEvidence(avg_rate=avg_rate, threshold=threshold)
             )
             
             self.detected_attacks.append(attack)
@@ -446,7 +896,7 @@ class AttackDefenseSystem:
                 attack_type=AttackType.CONSENSUS_MANIPULATION,
                 suspected_nodes=suspicious_nodes,
                 confidence=0.75,
-                evidence={'pattern': 'suspicious_validation_pattern'}
+                evidence=ConsensusEvidence(pattern='suspicious_validation_pattern')
             )
             
             self.detected_attacks.append(attack)
@@ -486,7 +936,7 @@ class AttackDefenseSystem:
                 if 'increase_consensus_threshold' in self.defense_callbacks:
                     await self.defense_callbacks['increase_consensus_threshold']()
             
-            attack.mitigated = True
+            self.detected_attacks.mark_mitigated(attack)
             logger.info(f"Successfully mitigated {attack.attack_type.value} attack")
             
             return True
@@ -497,7 +947,7 @@ class AttackDefenseSystem:
     
     def is_node_blocked(self, node_id: str) -> bool:
         """Check if a node is blocked"""
-        return node_id in self.blocked_nodes
+        return self.blocked_nodes.might_contain(node_id) and node_id in self.blocked_nodes
     
     def unblock_node(self, node_id: str) -> bool:
         """Unblock a node (after manual review or timeout)"""
@@ -510,24 +960,32 @@ class AttackDefenseSystem:
     
     def get_attack_history(self) -> List[AttackDetection]:
         """Get history of detected attacks"""
-        return self.detected_attacks.copy()
+        return list(self.detected_attacks)
     
     def get_defense_stats(self) -> Dict[str, Any]:
         """Get defense system statistics"""
-        total_attacks = len(self.detected_attacks)
-        mitigated_attacks = sum(1 for a in self.detected_attacks if a.mitigated)
+        version = (self.detected_attacks.version, self.blocked_nodes.version)
+        if self._stats_cache is not None and self._stats_cache[0] == version:
+            return self._copy_stats(self._stats_cache[1])
         
-        attack_types = defaultdict(int)
-        for attack in self.detected_attacks:
-            attack_types[attack.attack_type.value] += 1
+        total_attacks = len(self.detected_attacks)
+        mitigated_attacks = self.detected_attacks.mitigated_count
         
-        return {
+        stats = {
             'total_attacks_detected': total_attacks,
             'mitigated_attacks': mitigated_attacks,
             'blocked_nodes': len(self.blocked_nodes),
-            'attack_types': dict(attack_types),
+            'attack_types': dict(self.detected_attacks.attack_type_counts),
             'mitigation_rate': (mitigated_attacks / total_attacks * 100) if total_attacks > 0 else 0.0
         }
+        
+        self._stats_cache = (version, stats)
+        return self._copy_stats(stats)
+    
+    @staticmethod
+    def _copy_stats(stats: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy cached stats, including the nested attack_types dict, for a caller"""
+        return {**stats, 'attack_types': dict(stats['attack_types'])}
 
 
 class ResilientConsensusSystem:
@@ -541,6 +999,7 @@ class ResilientConsensusSystem:
         
         self.network_state = NetworkState.NORMAL
         self.running = False
+        self._state_cache: Optional[Tuple[Tuple[Any, ...], Dict[str, Any]]] = None
         
         logger.info("Resilient Consensus System initialized")
     
@@ -635,10 +1094,27 @@ class ResilientConsensusSystem:
     
     def get_system_state(self) -> Dict[str, Any]:
         """Get current system state"""
-        return {
+        version = (
+            self.network_state,
+            self.partition_detector.version,
+            self.attack_defense.detected_attacks.version,
+            self.attack_defense.blocked_nodes.version
+        )
+        if self._state_cache is not None and self._state_cache[0] == version:
+            return self._copy_state(self._state_cache[1])
+        
+        state = {
             'network_state': self.network_state.value,
             'active_partitions': len(self.partition_detector.partitions),
             'blocked_nodes': len(self.attack_defense.blocked_nodes),
             'detected_attacks': len(self.attack_defense.detected_attacks),
             'defense_stats': self.attack_defense.get_defense_stats()
         }
+        
+        self._state_cache = (version, state)
+        return self._copy_state(state)
+    
+    @staticmethod
+    def _copy_state(state: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy cached state, including the nested defense stats, for a caller"""
+        return {**state, 'defense_stats': AttackDefenseSystem._copy_stats(state['defense_stats'])}
@@ -9,18 +9,176 @@ Provides:
 - Digital signatures
 """
 
+import asyncio
+import functools
 import hashlib
+import hmac
+import os
 import secrets
-import base58
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import ed25519
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import mnemonic
+import numpy as np
 import logging
 
+# Prefer the native (Rust) base58 codec; the pure-Python package does bigint
+# arithmetic in the interpreter
+try:
+    import based58 as base58
+except ImportError:
+    import base58
+
+# libsodium (via PyNaCl) is faster than OpenSSL for Ed25519 keygen and signing;
+# cryptography remains the fallback backend. Verification always uses
+# cryptography: the two libraries disagree on edge cases such as small-order
+# keys, and validity must not depend on which packages a node has installed.
+try:
+    from nacl.bindings import crypto_sign_seed_keypair
+    from nacl.signing import SigningKey
+    NACL_AVAILABLE = True
+except ImportError:
+    NACL_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Worker pool for the *_async wrappers; Ed25519 and hashing run in OpenSSL with
+# the GIL released, so these threads execute in parallel
+_CRYPTO_POOL = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="crypto")
+
+# Hash contexts initialised once and cloned per use; hashlib dispatches to
+# OpenSSL's EVP implementations, which use SHA-NI where the CPU supports it
+_SHA256_EMPTY = hashlib.sha256()
+_SYSTEM_PREFIX_CTX = hashlib.sha256(b"PLAYERGOLD_SYSTEM_")
+
+
+# BIP-39 English wordlist, loaded once; the reverse index turns word lookups
+# into dict hits instead of linear list scans
+_MNEMO = mnemonic.Mnemonic("english")
+_WORD_INDEX = {word: index for index, word in enumerate(_MNEMO.wordlist)}
+_VALID_WORD_COUNTS = (12, 15, 18, 21, 24)
+
+
+def _mnemonic_to_entropy(mnemonic_phrase: str) -> Optional[bytes]:
+    """Decode a BIP-39 phrase to its entropy, or None if it is invalid"""
+    words = mnemonic.Mnemonic.normalize_string(mnemonic_phrase).split(" ")
+    if len(words) not in _VALID_WORD_COUNTS:
+        return None
+    
+    # Concatenate the 11-bit word indices into one integer
+    bits = 0
+    for word in words:
+        index = _WORD_INDEX.get(word)
+        if index is None:
+            return None
+        bits = (bits << 11) | index
+    
+    checksum_bits = len(words) * 11 // 33
+    entropy = (bits >> checksum_bits).to_bytes((len(words) * 11 - checksum_bits) // 8, 'big')
+    checksum = bits & ((1 << checksum_bits) - 1)
+    
+    if hashlib.sha256(entropy).digest()[0] >> (8 - checksum_bits) != checksum:
+        return None
+    
+    return entropy
+
+
+# Errors raised by hex decoding, encoding or key loading on malformed or non-str input
+_MALFORMED_INPUT = (TypeError, ValueError, AttributeError)
+
+
+def _ed25519_generate() -> Tuple[bytes, bytes]:
+    """Generate a raw (private, public) Ed25519 key pair"""
+    if NACL_AVAILABLE:
+        signing_key = SigningKey.generate()
+        return bytes(signing_key), bytes(signing_key.verify_key)
+    
+    private_key = ed25519.Ed25519PrivateKey.generate()
+    private_key_bytes = private_key.private_bytes(
+        encoding=serialization.Encoding.Raw,
+        format=serialization.PrivateFormat.Raw,
+        encryption_algorithm=serialization.NoEncryption()
+    )
+    public_key_bytes = private_key.public_key().public_bytes(
+        encoding=serialization.Encoding.Raw,
+        format=serialization.PublicFormat.Raw
+    )
+    return private_key_bytes, public_key_bytes
+
+
+def _ed25519_public_from_seed(private_key_bytes: bytes) -> bytes:
+    """Derive the raw Ed25519 public key for a raw 32-byte private key"""
+    if NACL_AVAILABLE:
+        public_key_bytes, _ = crypto_sign_seed_keypair(private_key_bytes)
+        return public_key_bytes
+    
+    return ed25519.Ed25519PrivateKey.from_private_bytes(private_key_bytes).public_key().public_bytes(
+        encoding=serialization.Encoding.Raw,
+        format=serialization.PublicFormat.Raw
+    )
+
+
+def _ed25519_sign(private_key_bytes: bytes, data: bytes) -> bytes:
+    """Sign data with a raw 32-byte Ed25519 private key"""
+    if NACL_AVAILABLE:
+        return SigningKey(private_key_bytes).sign(data).signature
+    
+    return ed25519.Ed25519PrivateKey.from_private_bytes(private_key_bytes).sign(data)
+
+
+def _ed25519_verifier(public_key_bytes: bytes) -> Callable[[bytes, bytes], bool]:
+    """
+    Load a raw Ed25519 public key and return a (signature, data) -> bool check
+    
+    Uses cryptography regardless of NACL_AVAILABLE, matching
+    Transaction.verify_signature. Raises ValueError if the key is malformed.
+    """
+    public_key = ed25519.Ed25519PublicKey.from_public_bytes(public_key_bytes)
+    
+    def check(signature: bytes, data: bytes) -> bool:
+        try:
+            public_key.verify(signature, data)
+            return True
+        except (InvalidSignature, ValueError):
+            return False
+    
+    return check
+
+
+@functools.lru_cache(maxsize=None)
+def _ripemd160_prototype():
+    """
+    RIPEMD-160 context to clone per address, created on first use
+    
+    OpenSSL 3 builds without the legacy provider reject ripemd160, so creating
+    it at import would make the whole module unimportable there.
+    """
+    return hashlib.new('ripemd160')
+
+
+def _address_checksum(versioned_hash: bytes) -> bytes:
+    """Double SHA-256 checksum of a versioned address hash"""
+    first = _SHA256_EMPTY.copy()
+    first.update(versioned_hash)
+    second = _SHA256_EMPTY.copy()
+    second.update(first.digest())
+    return second.digest()[:4]
+
+
+def _address_payload(public_key_bytes: bytes) -> bytes:
+    """Build the 25-byte address payload: version + RIPEMD-160(SHA-256(key)) + checksum"""
+    sha256 = _SHA256_EMPTY.copy()
+    sha256.update(public_key_bytes)
+    ripemd160 = _ripemd160_prototype().copy()
+    ripemd160.update(sha256.digest())
+    
+    # Version byte 0x00 for PlayerGold mainnet
+    versioned_hash = b'\x00' + ripemd160.digest()
+    return versioned_hash + _address_checksum(versioned_hash)
+
 
 def generate_keypair() -> Dict[str, str]:
     """
@@ -29,42 +187,50 @@ def generate_keypair() -> Dict[str, str]:
     Returns:
         Dict containing private_key, public_key, and mnemonic
     """
-    try:
-        # Generate Ed25519 private key
-        private_key = ed25519.Ed25519PrivateKey.generate()
-        public_key = private_key.public_key()
-        
-        # Serialize keys
-        private_key_bytes = private_key.private_bytes(
-            encoding=serialization.Encoding.Raw,
-            format=serialization.PrivateFormat.Raw,
-            encryption_algorithm=serialization.NoEncryption()
-        )
-        
-        public_key_bytes = public_key.public_bytes(
-            encoding=serialization.Encoding.Raw,
-            format=serialization.PublicFormat.Raw
-        )
-        
-        # Convert to hex strings
-        private_key_hex = private_key_bytes.hex()
-        public_key_hex = public_key_bytes.hex()
-        
-        # Generate mnemonic phrase
-        mnemonic_phrase = generate_mnemonic_from_key(private_key_bytes)
-        
-        logger.debug(f"Generated new key pair")
-        logger.debug(f"Public key: {public_key_hex}")
-        
-        return {
-            'private_key': private_key_hex,
-            'public_key': public_key_hex,
-            'mnemonic': mnemonic_phrase
-        }
+    # Generate Ed25519 key pair
+    private_key_bytes, public_key_bytes = _ed25519_generate()
+    
+    # Convert to hex strings
+    private_key_hex = private_key_bytes.hex()
+    public_key_hex = public_key_bytes.hex()
+    
+    # Generate mnemonic phrase
+    mnemonic_phrase = generate_mnemonic_from_key(private_key_bytes)
+    
+    logger.debug("Generated new key pair")
+    logger.debug("Public key: %s", public_key_hex)
+    
+    return {
+        'private_key': private_key_hex,
+        'public_key': public_key_hex,
+        'mnemonic': mnemonic_phrase
+    }
+
+
+def generate_keypairs_batch(count: int) -> Dict[str, np.ndarray]:
+    """
+    Generate many Ed25519 key pairs at once, e.g. for faucet or validator provisioning
+    
+    Randomness for every key is drawn in a single call and keys are stored as
+    rows of contiguous arrays. Mnemonics are not generated; use
+    generate_mnemonic_from_key on the rows that need one.
+    
+    Args:
+        count: Number of key pairs to generate
         
-    except Exception as e:
-        logger.error(f"Error generating key pair: {e}")
-        raise
+    Returns:
+        Dict with 'private_keys' and 'public_keys' uint8 arrays of shape (count, 32)
+    """
+    private_keys = np.frombuffer(secrets.token_bytes(32 * count), dtype=np.uint8).reshape(count, 32)
+    public_keys = np.empty((count, 32), dtype=np.uint8)
+    
+    for i in range(count):
+        public_keys[i] = np.frombuffer(_ed25519_public_from_seed(private_keys[i].tobytes()), dtype=np.uint8)
+    
+    return {
+        'private_keys': private_keys,
+        'public_keys': public_keys
+    }
 
 
 def derive_address(public_key_hex: str) -> str:
@@ -77,34 +243,29 @@ def derive_address(public_key_hex: str) -> str:
     Returns:
         PlayerGold address string (PG prefix + base58 encoded)
     """
-    try:
-        # Convert hex to bytes
-        public_key_bytes = bytes.fromhex(public_key_hex)
-        
-        # Create address hash (SHA-256 + RIPEMD-160)
-        sha256_hash = hashlib.sha256(public_key_bytes).digest()
-        ripemd160_hash = hashlib.new('ripemd160', sha256_hash).digest()
-        
-        # Add version byte (0x00 for PlayerGold mainnet)
-        versioned_hash = b'\x00' + ripemd160_hash
-        
-        # Calculate checksum (double SHA-256)
-        checksum = hashlib.sha256(hashlib.sha256(versioned_hash).digest()).digest()[:4]
-        
-        # Combine versioned hash + checksum
-        full_address = versioned_hash + checksum
-        
-        # Encode with base58 and add PG prefix
-        base58_address = base58.b58encode(full_address).decode('utf-8')
-        playergold_address = 'PG' + base58_address
-        
-        logger.debug(f"Derived address: {playergold_address}")
-        
-        return playergold_address
+    return derive_address_from_pubkey(bytes.fromhex(public_key_hex))
+
+
+def derive_address_from_pubkey(public_key_bytes: bytes) -> str:
+    """
+    Derive a PlayerGold address from raw public key bytes
+    
+    Args:
+        public_key_bytes: Raw 32-byte public key
         
-    except Exception as e:
-        logger.error(f"Error deriving address: {e}")
-        raise
+    Returns:
+        PlayerGold address string (PG prefix + base58 encoded)
+    """
+    # Versioned SHA-256 + RIPEMD-160 hash with double SHA-256 checksum
+    full_address = _address_payload(public_key_bytes)
+    
+    # Encode with base58 and add PG prefix
+    base58_address = base58.b58encode(full_address).decode('utf-8')
+    playergold_address = 'PG' + base58_address
+    
+    logger.debug("Derived address: %s", playergold_address)
+    
+    return playergold_address
 
 
 def generate_mnemonic_from_key(private_key_bytes: bytes) -> str:
@@ -117,21 +278,15 @@ def generate_mnemonic_from_key(private_key_bytes: bytes) -> str:
     Returns:
         12-word mnemonic phrase
     """
-    try:
-        # Use the private key as entropy for mnemonic generation
-        entropy = hashlib.sha256(private_key_bytes).digest()[:16]  # 128 bits for 12 words
-        
-        # Generate mnemonic
-        mnemo = mnemonic.Mnemonic("english")
-        mnemonic_phrase = mnemo.to_mnemonic(entropy)
-        
-        logger.debug(f"Generated mnemonic phrase")
-        
-        return mnemonic_phrase
-        
-    except Exception as e:
-        logger.error(f"Error generating mnemonic: {e}")
-        raise
+    # Use the private key as entropy for mnemonic generation
+    entropy = hashlib.sha256(private_key_bytes).digest()[:16]  # 128 bits for 12 words
+    
+    # Generate mnemonic
+    mnemonic_phrase = _MNEMO.to_mnemonic(entropy)
+    
+    logger.debug("Generated mnemonic phrase")
+    
+    return mnemonic_phrase
 
 
 def validate_address(address: str) -> bool:
@@ -144,36 +299,59 @@ def validate_address(address: str) -> bool:
     Returns:
         True if valid, False otherwise
     """
+    # Check prefix
+    if not isinstance(address, str) or not address.startswith('PG'):
+        return False
+    
+    # Remove prefix
+    base58_part = address[2:]
+    
+    # Decode base58
     try:
-        # Check prefix
-        if not address.startswith('PG'):
-            return False
+        decoded = base58.b58decode(base58_part.encode('ascii'))
+    except ValueError:
+        return False
+    
+    return _validate_address_payload(decoded)
+
+
+def validate_addresses(addresses: Iterable[str]) -> List[bool]:
+    """
+    Validate many PlayerGold addresses, e.g. when screening mempool or gossip input
+    
+    Args:
+        addresses: PlayerGold addresses to validate
         
-        # Remove prefix
-        base58_part = address[2:]
+    Returns:
+        One validation result per address, in the same order
+    """
+    b58decode = base58.b58decode
+    results: List[bool] = []
+    
+    for address in addresses:
+        if not isinstance(address, str) or not address.startswith('PG'):
+            results.append(False)
+            continue
         
-        # Decode base58
         try:
-            decoded = base58.b58decode(base58_part)
-        except:
-            return False
+            decoded = b58decode(address[2:].encode('ascii'))
+        except ValueError:
+            results.append(False)
+            continue
         
-        # Check length (1 version byte + 20 hash bytes + 4 checksum bytes)
-        if len(decoded) != 25:
-            return False
-        
-        # Split components
-        versioned_hash = decoded[:-4]
-        checksum = decoded[-4:]
-        
-        # Verify checksum
-        calculated_checksum = hashlib.sha256(hashlib.sha256(versioned_hash).digest()).digest()[:4]
-        
-        return checksum == calculated_checksum
-        
-    except Exception as e:
-        logger.error(f"Error validating address: {e}")
+        results.append(_validate_address_payload(decoded))
+    
+    return results
+
+
+def _validate_address_payload(decoded: bytes) -> bool:
+    """Check the length and checksum of a base58-decoded address"""
+    # 1 version byte + 20 hash bytes + 4 checksum bytes
+    if len(decoded) != 25:
         return False
+    
+    # Constant-time compare; addresses usually arrive from untrusted peers
+    return hmac.compare_digest(decoded[-4:], _address_checksum(decoded[:-4]))
 
 
 def sign_transaction(private_key_hex: str, transaction_data: str) -> str:
@@ -187,26 +365,25 @@ def sign_transaction(private_key_hex: str, transaction_data: str) -> str:
     Returns:
         Hexadecimal signature string
     """
-    try:
-        # Convert hex to bytes
-        private_key_bytes = bytes.fromhex(private_key_hex)
-        
-        # Create Ed25519 private key object
-        private_key = ed25519.Ed25519PrivateKey.from_private_bytes(private_key_bytes)
-        
-        # Sign the transaction data
-        signature = private_key.sign(transaction_data.encode('utf-8'))
-        
-        # Convert to hex
-        signature_hex = signature.hex()
-        
-        logger.debug(f"Transaction signed")
-        
-        return signature_hex
+    return sign_transaction_bytes(bytes.fromhex(private_key_hex), transaction_data.encode('utf-8')).hex()
+
+
+def sign_transaction_bytes(private_key_bytes: bytes, transaction_data: bytes) -> bytes:
+    """
+    Sign raw transaction bytes with a raw private key
+    
+    Args:
+        private_key_bytes: Raw 32-byte private key
+        transaction_data: Encoded transaction data to sign
         
-    except Exception as e:
-        logger.error(f"Error signing transaction: {e}")
-        raise
+    Returns:
+        Raw 64-byte signature
+    """
+    signature = _ed25519_sign(private_key_bytes, transaction_data)
+    
+    logger.debug("Transaction signed")
+    
+    return signature
 
 
 def verify_signature(public_key_hex: str, signature_hex: str, transaction_data: str) -> bool:
@@ -222,59 +399,100 @@ def verify_signature(public_key_hex: str, signature_hex: str, transaction_data:
         True if signature is valid, False otherwise
     """
     try:
-        # Convert hex to bytes
         public_key_bytes = bytes.fromhex(public_key_hex)
         signature_bytes = bytes.fromhex(signature_hex)
+        message = transaction_data.encode('utf-8')
+    except _MALFORMED_INPUT:
+        return False
+    
+    return verify_signature_bytes(public_key_bytes, signature_bytes, message)
+
+
+def verify_signature_bytes(public_key_bytes: bytes, signature_bytes: bytes, transaction_data: bytes) -> bool:
+    """
+    Verify a raw signature over raw transaction bytes
+    
+    Args:
+        public_key_bytes: Raw 32-byte public key
+        signature_bytes: Raw 64-byte signature
+        transaction_data: Encoded transaction data
         
-        # Create Ed25519 public key object
-        public_key = ed25519.Ed25519PublicKey.from_public_bytes(public_key_bytes)
+    Returns:
+        True if signature is valid, False otherwise
+    """
+    try:
+        return _ed25519_verifier(public_key_bytes)(signature_bytes, transaction_data)
+    except _MALFORMED_INPUT:
+        return False
+
+
+def verify_signatures_batch(items: List[Tuple[str, str, str]], batch_size: int = 128) -> List[bool]:
+    """
+    Verify many transaction signatures in one call
+    
+    Public keys are loaded once per distinct key in each batch, so blocks with
+    several transactions from the same sender skip repeated key parsing.
+    
+    Args:
+        items: (public_key_hex, signature_hex, transaction_data) tuples
+        batch_size: Number of signatures processed per batch
         
-        # Verify signature
-        try:
-            public_key.verify(signature_bytes, transaction_data.encode('utf-8'))
-            return True
-        except:
-            return False
+    Returns:
+        One verification result per item, in the same order
+    """
+    results: List[bool] = []
+    
+    for start in range(0, len(items), batch_size):
+        verifiers: Dict[str, Optional[Callable[[bytes, bytes], bool]]] = {}
+        
+        for public_key_hex, signature_hex, transaction_data in items[start:start + batch_size]:
+            # Malformed input fails only its own item
+            try:
+                if public_key_hex not in verifiers:
+                    try:
+                        verifiers[public_key_hex] = _ed25519_verifier(bytes.fromhex(public_key_hex))
+                    except _MALFORMED_INPUT:
+                        verifiers[public_key_hex] = None
+                
+                verifier = verifiers[public_key_hex]
+                signature_bytes = bytes.fromhex(signature_hex)
+                message = transaction_data.encode('utf-8')
+            except _MALFORMED_INPUT:
+                results.append(False)
+                continue
             
-    except Exception as e:
-        logger.error(f"Error verifying signature: {e}")
-        return False
+            results.append(verifier is not None and verifier(signature_bytes, message))
+    
+    return results
 
 
+@functools.lru_cache(maxsize=256)
 def generate_system_address(purpose: str) -> str:
     """
     Generate a deterministic system address for specific purposes
     
+    The address depends only on the purpose, so results are memoized.
+    
     Args:
         purpose: Purpose string (e.g., "LIQUIDITY_POOL", "BURN_ADDRESS")
         
     Returns:
         PlayerGold system address
     """
-    try:
-        # Create deterministic seed from purpose
-        seed = hashlib.sha256(f"PLAYERGOLD_SYSTEM_{purpose}".encode()).digest()
-        
-        # Generate deterministic key pair
-        private_key = ed25519.Ed25519PrivateKey.from_private_bytes(seed[:32])
-        public_key = private_key.public_key()
-        
-        # Get public key bytes
-        public_key_bytes = public_key.public_bytes(
-            encoding=serialization.Encoding.Raw,
-            format=serialization.PublicFormat.Raw
-        )
-        
-        # Derive address
-        address = derive_address(public_key_bytes.hex())
-        
-        logger.info(f"Generated system address for {purpose}: {address}")
-        
-        return address
-        
-    except Exception as e:
-        logger.error(f"Error generating system address: {e}")
-        raise
+    # Create deterministic seed from purpose
+    hasher = _SYSTEM_PREFIX_CTX.copy()
+    hasher.update(purpose.encode())
+    seed = hasher.digest()
+    
+    # Derive the deterministic public key from the seed
+    public_key_bytes = _ed25519_public_from_seed(seed[:32])
+    
+    # Derive address
+    address = derive_address_from_pubkey(public_key_bytes)
+    
+    logger.info(f"Generated system address for {purpose}: {address}")
+    
+    return address
 
 
 def restore_keypair_from_mnemonic(mnemonic_phrase: str) -> Optional[Dict[str, str]]:
@@ -288,28 +506,21 @@ def restore_keypair_from_mnemonic(mnemonic_phrase: str) -> Optional[Dict[str, st
         Dict containing private_key and public_key, or None if invalid
     """
     try:
-        # Validate mnemonic
-        mnemo = mnemonic.Mnemonic("english")
-        if not mnemo.check(mnemonic_phrase):
+        # Validate mnemonic and convert it to entropy
+        entropy = _mnemonic_to_entropy(mnemonic_phrase)
+        if entropy is None:
             logger.error("Invalid mnemonic phrase")
             return None
         
-        # Convert mnemonic to entropy
-        entropy = mnemo.to_entropy(mnemonic_phrase)
-        
         # Generate private key from entropy
         private_key_bytes = hashlib.sha256(entropy).digest()[:32]
         
-        # Create Ed25519 key pair
-        private_key = ed25519.Ed25519PrivateKey.from_private_bytes(private_key_bytes)
-        public_key = private_key.public_key()
+        # Derive the Ed25519 public key straight from the seed
+        public_key_bytes = _ed25519_public_from_seed(private_key_bytes)
         
         # Serialize keys
         private_key_hex = private_key_bytes.hex()
-        public_key_hex = public_key.public_bytes(
-            encoding=serialization.Encoding.Raw,
-            format=serialization.PublicFormat.Raw
-        ).hex()
+        public_key_hex = public_key_bytes.hex()
         
         logger.info("Key pair restored from mnemonic")
         
@@ -324,7 +535,33 @@ def restore_keypair_from_mnemonic(mnemonic_phrase: str) -> Optional[Dict[str, st
         return None
 
 
+# Async wrappers that keep CPU-bound crypto off the event loop
+async def _run_in_crypto_pool(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(_CRYPTO_POOL, func, *args)
+
+
+async def generate_keypair_async() -> Dict[str, str]:
+    """Async variant of generate_keypair"""
+    return await _run_in_crypto_pool(generate_keypair)
+
+
+async def sign_transaction_async(private_key_hex: str, transaction_data: str) -> str:
+    """Async variant of sign_transaction"""
+    return await _run_in_crypto_pool(sign_transaction, private_key_hex, transaction_data)
+
+
+async def verify_signature_async(public_key_hex: str, signature_hex: str, transaction_data: str) -> bool:
+    """Async variant of verify_signature"""
+    return await _run_in_crypto_pool(verify_signature, public_key_hex, signature_hex, transaction_data)
+
+
+async def generate_system_address_async(purpose: str) -> str:
+    """Async variant of generate_system_address"""
+    return await _run_in_crypto_pool(generate_system_address, purpose)
+
+
 # Utility functions for address generation
+@functools.lru_cache(maxsize=None)
 def generate_faucet_address() -> str:
     """Generate the standard faucet address"""
     return generate_system_address("FAUCET")
@@ -335,11 +572,28 @@ def generate_validator_address(node_id: str) -> str:
     return generate_system_address(f"VALIDATOR_{node_id}")
 
 
+@functools.lru_cache(maxsize=None)
 def generate_burn_address() -> str:
     """Generate the standard burn address"""
     return generate_system_address("BURN_ADDRESS")
 
 
+@functools.lru_cache(maxsize=None)
 def generate_liquidity_pool_address() -> str:
     """Generate the standard liquidity pool address"""
-    return generate_system_address("LIQUIDITY_POOL")
\ No newline at end of file
+    return generate_system_address("LIQUIDITY_POOL")
+
+
+# Fixed-purpose system addresses, derived on first access rather than at import
+_SYSTEM_ADDRESS_CONSTANTS = {
+    'FAUCET_ADDRESS': generate_faucet_address,
+    'BURN_ADDRESS': generate_burn_address,
+    'LIQUIDITY_POOL_ADDRESS': generate_liquidity_pool_address,
+}
+
+
+def __getattr__(name: str):
+    generate = _SYSTEM_ADDRESS_CONSTANTS.get(name)
+    if generate is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return generate()
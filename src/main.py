@@ -4,6 +4,7 @@ Initializes the distributed AI nodes architecture
 """
 
 import asyncio
+import functools
 import signal
 import sys
 from pathlib import Path
@@ -26,8 +27,13 @@ class PlayerGoldApp:
             log_file=self.config.logging.log_file
         )
         
-        self.logger = get_logger("main")
+        # Bind the static application context once instead of passing it per call
+        self.logger = get_logger("main").bind(
+            environment=self.config.environment,
+            debug=self.config.debug
+        )
         self.running = False
+        self._stop_event = asyncio.Event()
         
         # Initialize components (will be implemented in later tasks)
         self.blockchain = None
@@ -37,13 +43,11 @@ class PlayerGoldApp:
         
     async def start(self):
         """Start the PlayerGold application"""
-        self.logger.info("Starting PlayerGold application", 
-                        environment=self.config.environment,
-                        debug=self.config.debug)
+        self.logger.info("Starting PlayerGold application")
         
         try:
             # Create necessary directories
-            self._create_directories()
+            await self._create_directories()
             
             # Initialize components (placeholders for now)
             await self._initialize_components()
@@ -57,33 +61,48 @@ class PlayerGoldApp:
             # Main application loop
             await self._run_main_loop()
             
-        except Exception as e:
-            self.logger.error("Failed to start PlayerGold application", error=str(e))
+        except Exception:
+            self.logger.error("Failed to start PlayerGold application", exc_info=True)
             raise
     
     async def stop(self):
         """Stop the PlayerGold application"""
         self.logger.info("Stopping PlayerGold application")
         self.running = False
+        self._stop_event.set()
         
         # Cleanup components (will be implemented in later tasks)
         await self._cleanup_components()
         
         self.logger.info("PlayerGold application stopped")
     
-    def _create_directories(self):
+    async def _create_directories(self):
         """Create necessary directories"""
-        directories = [
-            self.config.blockchain.data_dir,
-            self.config.wallet.wallet_dir,
-            self.config.ai.models_dir,
-            Path(self.config.logging.log_file).parent if self.config.logging.log_file else None
+        directories = {
+            Path(directory).resolve()
+            for directory in (
+                self.config.blockchain.data_dir,
+                self.config.wallet.wallet_dir,
+                self.config.ai.models_dir,
+                Path(self.config.logging.log_file).parent if self.config.logging.log_file else None
+            )
+            if directory
+        }
+        
+        # mkdir(parents=True) creates ancestors, so only leaf directories are needed
+        leaves = [
+            directory for directory in directories
+            if not any(directory in other.parents for other in directories)
         ]
         
-        for directory in directories:
-            if directory:
-                Path(directory).mkdir(parents=True, exist_ok=True)
-                self.logger.debug("Created directory", path=str(directory))
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(None, functools.partial(directory.mkdir, parents=True, exist_ok=True))
+            for directory in leaves
+        ))
+        
+        for directory in leaves:
+            self.logger.debug("Created directory", path=str(directory))
     
     async def _initialize_components(self):
         """Initialize application components"""
@@ -123,26 +142,37 @@ class PlayerGoldApp:
         """Main application loop"""
         self.logger.info("Entering main application loop")
         
+        retry_delay = 1
+        
         while self.running:
             try:
-                # Main application logic will be implemented in later tasks
-                await asyncio.sleep(1)
+                # Main application logic will be implemented in later tasks;
+                # until then park on the stop event instead of polling
+                await self._stop_event.wait()
                 
             except asyncio.CancelledError:
                 self.logger.info("Main loop cancelled")
                 break
-            except Exception as e:
-                self.logger.error("Error in main loop", error=str(e))
-                await asyncio.sleep(5)  # Wait before retrying
+            except Exception:
+                self.logger.error("Error in main loop", retry_in=retry_delay, exc_info=True)
+                await asyncio.sleep(retry_delay)  # Back off before retrying
+                retry_delay = min(retry_delay * 2, 60)
     
     def _setup_signal_handlers(self):
         """Setup signal handlers for graceful shutdown"""
-        def signal_handler(signum, frame):
+        loop = asyncio.get_running_loop()
+        
+        def signal_handler(signum):
             self.logger.info("Received signal", signal=signum)
-            asyncio.create_task(self.stop())
+            loop.create_task(self.stop())
         
-        signal.signal(signal.SIGINT, signal_handler)
-        signal.signal(signal.SIGTERM, signal_handler)
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                # Deliver the signal through the event loop's wakeup pipe
+                loop.add_signal_handler(sig, signal_handler, sig)
+            except NotImplementedError:
+                # Event loops without Unix signal support (e.g. Windows)
+                signal.signal(sig, lambda signum, frame: loop.call_soon_threadsafe(signal_handler, signum))
 
 
 async def main():
@@ -5,8 +5,9 @@ Combines alert system and immutable logging
 
 from .alert_system import (
     AlertSystem, Alert, AlertSeverity, AlertType,
-    AlertHandler, ConsoleAlertHandler, FileAlertHandler, WebhookAlertHandler,
-    AnomalyDetector, create_alert_system
+    AlertHandler, ConsoleAlertHandler, FileAlertHandler, BinaryFileAlertHandler,
+    WebhookAlertHandler, AnomalyDetector, HEALTH_SAMPLE_DTYPE, create_alert_system,
+    read_alerts
 )
 
 from .immutable_logger import (
@@ -16,8 +17,9 @@ from .immutable_logger import (
 
 __all__ = [
     'AlertSystem', 'Alert', 'AlertSeverity', 'AlertType',
-    'AlertHandler', 'ConsoleAlertHandler', 'FileAlertHandler', 'WebhookAlertHandler',
-    'AnomalyDetector', 'create_alert_system',
+    'AlertHandler', 'ConsoleAlertHandler', 'FileAlertHandler', 'BinaryFileAlertHandler',
+    'WebhookAlertHandler', 'AnomalyDetector', 'HEALTH_SAMPLE_DTYPE', 'create_alert_system',
+    'read_alerts',
     'ImmutableLogger', 'LogEntry', 'LogLevel', 'LogCategory',
     'PatternAnalyzer', 'create_immutable_logger'
 ]
@@ -4,13 +4,36 @@ Detects anomalies and sends automatic alerts for critical events
 """
 
 from enum import Enum
-from dataclasses import dataclass
-from typing import List, Dict, Callable, Optional
+from dataclasses import dataclass, field
+from typing import Deque, List, Dict, Callable, Iterator, Optional
 from datetime import datetime, timedelta
+import asyncio
+import atexit
+import sched
 import time
 import threading
 import json
-from collections import deque
+import math
+import queue
+import struct
+import sys
+from collections import Counter, deque
+
+import numpy as np
+
+# orjson encodes alerts several times faster than the stdlib encoder
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Numba compiles the batch EWMA scan to native code when installed
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 
 class AlertSeverity(Enum):
@@ -35,7 +58,18 @@ class AlertType(Enum):
     BLOCK_VALIDATION_TIMEOUT = "block_validation_timeout"
 
 
-@dataclass
+# dataclass(slots=True) is only available from Python 3.10
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+# Stable ordinals for compact encodings, in declaration order
+_SEVERITIES = tuple(AlertSeverity)
+_ALERT_TYPES = tuple(AlertType)
+_SEVERITY_ORDS = {severity: i for i, severity in enumerate(_SEVERITIES)}
+_TYPE_ORDS = {alert_type: i for i, alert_type in enumerate(_ALERT_TYPES)}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class Alert:
     """Alert data structure"""
     alert_id: str
@@ -46,6 +80,56 @@ class Alert:
     details: Dict
     resolved: bool = False
     resolved_at: Optional[float] = None
+    
+    # Enum values, ordinals and ID number cached at construction for serialization
+    type_str: str = field(init=False, repr=False, compare=False)
+    severity_str: str = field(init=False, repr=False, compare=False)
+    type_ord: int = field(init=False, repr=False, compare=False)
+    severity_ord: int = field(init=False, repr=False, compare=False)
+    alert_num: int = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.type_str = self.alert_type.value
+        self.severity_str = self.severity.value
+        self.type_ord = _TYPE_ORDS[self.alert_type]
+        self.severity_ord = _SEVERITY_ORDS[self.severity]
+        
+        suffix = self.alert_id.rpartition('-')[2]
+        self.alert_num = int(suffix) if suffix.isdigit() else 0
+
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY if ORJSON_AVAILABLE else 0
+
+
+def _json_bytes(data: Dict) -> bytes:
+    """Serialize a record as UTF-8 JSON"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=_ORJSON_OPTIONS)
+    return json.dumps(data).encode('utf-8')
+
+
+def _json_line(data: Dict) -> bytes:
+    """Serialize a record as one newline-terminated JSON line"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=_ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(data) + '\n').encode('utf-8')
+
+
+# Constant JSON prefix for every (type, severity) pair; encoders only
+# serialize the per-alert fields and splice them in after it
+_ALERT_JSON_PREFIXES = {
+    (alert_type, severity): ('{"type":%s,"severity":%s,' % (
+        json.dumps(alert_type.value), json.dumps(severity.value)
+    )).encode('utf-8')
+    for alert_type in AlertType
+    for severity in AlertSeverity
+}
+
+
+def _alert_json(alert: Alert, fields: Dict, newline: bool = False) -> bytes:
+    """Serialize an alert's type and severity plus the given (non-empty) fields as JSON"""
+    body = _json_line(fields) if newline else _json_bytes(fields)
+    return _ALERT_JSON_PREFIXES[(alert.alert_type, alert.severity)] + body[1:]
 
 
 class AlertHandler:
@@ -56,45 +140,184 @@ class AlertHandler:
         raise NotImplementedError
 
 
+# Console colours indexed by Alert.severity_ord
+_SEVERITY_COLORS = (
+    '\033[94m',  # Blue - info
+    '\033[93m',  # Yellow - warning
+    '\033[91m',  # Red - error
+    '\033[95m'   # Magenta - critical
+)
+_RESET_COLOR = '\033[0m'
+
+
 class ConsoleAlertHandler(AlertHandler):
     """Print alerts to console"""
     
     def handle(self, alert: Alert):
-        severity_colors = {
-            AlertSeverity.INFO: '\033[94m',      # Blue
-            AlertSeverity.WARNING: '\033[93m',   # Yellow
-            AlertSeverity.ERROR: '\033[91m',     # Red
-            AlertSeverity.CRITICAL: '\033[95m'   # Magenta
-        }
-        reset_color = '\033[0m'
-        
-        color = severity_colors.get(alert.severity, '')
+        color = _SEVERITY_COLORS[alert.severity_ord]
         timestamp = datetime.fromtimestamp(alert.timestamp).strftime('%Y-%m-%d %H:%M:%S')
         
-        print(f"{color}[{alert.severity.value.upper()}] {timestamp} - {alert.alert_type.value}{reset_color}")
-        print(f"  {alert.message}")
+        # One write per alert keeps concurrent output from interleaving
+        output = (
+            f"{color}[{alert.severity_str.upper()}] {timestamp} - {alert.type_str}{_RESET_COLOR}\n"
+            f"  {alert.message}\n"
+        )
         if alert.details:
-            print(f"  Details: {json.dumps(alert.details, indent=2)}")
+            output += f"  Details: {json.dumps(alert.details, indent=2)}\n"
+        sys.stdout.write(output)
 
 
 class FileAlertHandler(AlertHandler):
     """Write alerts to file"""
     
+    # A background writer appends queued alerts in batches of up to
+    # BATCH_SIZE lines, waiting at most BATCH_INTERVAL seconds to fill one
+    BATCH_SIZE = 64
+    BATCH_INTERVAL = 0.05
+    
     def __init__(self, filepath: str):
         self.filepath = filepath
+        self._file = open(filepath, 'ab', buffering=1 << 16)
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        self._writer = threading.Thread(target=self._drain, name="alert-file-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
     
     def handle(self, alert: Alert):
-        with open(self.filepath, 'a') as f:
-            alert_data = {
-                'alert_id': alert.alert_id,
-                'type': alert.alert_type.value,
-                'severity': alert.severity.value,
-                'message': alert.message,
-                'timestamp': alert.timestamp,
-                'details': alert.details,
-                'resolved': alert.resolved
-            }
-            f.write(json.dumps(alert_data) + '\n')
+        self._queue.put_nowait(self._encode(alert))
+    
+    def _encode(self, alert: Alert) -> bytes:
+        """Encode an alert as one JSON line"""
+        alert_data = {
+            'alert_id': alert.alert_id,
+            'message': alert.message,
+            'timestamp': alert.timestamp,
+            'details': alert.details,
+            'resolved': alert.resolved
+        }
+        return _alert_json(alert, alert_data, newline=True)
+    
+    def _drain(self):
+        """Writer thread: batch queued records into single writes"""
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.BATCH_INTERVAL
+            
+            while len(batch) < self.BATCH_SIZE:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            
+            # None is the shutdown sentinel queued by close()
+            if None in batch:
+                running = False
+            lines = [line for line in batch if line is not None]
+            
+            try:
+                if lines:
+                    self._file.write(b''.join(lines))
+                    self._file.flush()
+            except Exception as e:
+                print(f"Failed to write file alerts: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+    
+    def flush(self):
+        """Block until every queued alert has been written"""
+        if not self._closed:
+            self._queue.join()
+    
+    def close(self):
+        """Write any queued alerts, stop the writer thread and close the file"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._writer.join()
+        self._file.close()
+        atexit.unregister(self.close)
+
+
+# Binary alert record header: alert number, severity ordinal, type ordinal,
+# resolved flag, timestamp, message length, details length
+_ALERT_RECORD = struct.Struct('<IBBBdII')
+
+
+class BinaryFileAlertHandler(FileAlertHandler):
+    """Write alerts to file as compact binary records, read back with read_alerts"""
+    
+    def _encode(self, alert: Alert) -> bytes:
+        """Encode an alert as a fixed header followed by UTF-8 payloads"""
+        message = alert.message.encode('utf-8')
+        details = _json_bytes(alert.details)
+        header = _ALERT_RECORD.pack(
+            alert.alert_num, alert.severity_ord, alert.type_ord, alert.resolved,
+            alert.timestamp, len(message), len(details)
+        )
+        return header + message + details
+
+
+def read_alerts(filepath: str) -> Iterator[Dict]:
+    """Iterate over the alerts in a BinaryFileAlertHandler file"""
+    with open(filepath, 'rb') as f:
+        data = f.read()
+    
+    offset = 0
+    while offset < len(data):
+        alert_num, severity_ord, type_ord, resolved, timestamp, message_len, details_len = \
+            _ALERT_RECORD.unpack_from(data, offset)
+        offset += _ALERT_RECORD.size
+        message = data[offset:offset + message_len].decode('utf-8')
+        offset += message_len
+        details = json.loads(data[offset:offset + details_len])
+        offset += details_len
+        
+        yield {
+            'alert_id': f"ALERT-{alert_num:06d}",
+            'type': _ALERT_TYPES[type_ord].value,
+            'severity': _SEVERITIES[severity_ord].value,
+            'message': message,
+            'timestamp': timestamp,
+            'details': details,
+            'resolved': bool(resolved)
+        }
+
+
+# Shared keep-alive session so webhook posts reuse pooled connections
+_webhook_session = None
+_webhook_session_lock = threading.Lock()
+
+
+def _get_webhook_session():
+    """Create the shared webhook session on first use"""
+    global _webhook_session
+    
+    with _webhook_session_lock:
+        if _webhook_session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+            
+            # Retry covers connection failures; POSTs that reached the
+            # server are not resent, so alerts are never duplicated
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=8,
+                pool_maxsize=32,
+                max_retries=Retry(total=2, backoff_factor=0.1)
+            )
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _webhook_session = session
+    
+    return _webhook_session
 
 
 class WebhookAlertHandler(AlertHandler):
@@ -104,49 +327,232 @@ class WebhookAlertHandler(AlertHandler):
         self.webhook_url = webhook_url
     
     def handle(self, alert: Alert):
-        import requests
-        
-        payload = {
+        payload = _alert_json(alert, {
             'alert_id': alert.alert_id,
-            'type': alert.alert_type.value,
-            'severity': alert.severity.value,
             'message': alert.message,
             'timestamp': alert.timestamp,
             'details': alert.details
-        }
+        })
         
         try:
-            requests.post(self.webhook_url, json=payload, timeout=5)
+            _get_webhook_session().post(
+                self.webhook_url,
+                data=payload,
+                headers={'Content-Type': 'application/json'},
+                timeout=5
+            )
         except Exception as e:
             print(f"Failed to send webhook alert: {e}")
 
 
+def _ewma_scan_py(values, samples, mean, variance, alpha):
+    """
+    Fold values into an exponentially weighted (samples, mean, variance)
+    
+    Returns the updated state followed by the mean and variance from before
+    the last value was folded in.
+    """
+    prior_mean = mean
+    prior_variance = variance
+    for x in values:
+        prior_mean = mean
+        prior_variance = variance
+        if samples == 0:
+            mean = x
+            variance = 0.0
+        else:
+            delta = x - mean
+            mean += alpha * delta
+            variance = (1 - alpha) * (variance + alpha * delta * delta)
+        samples += 1
+    return samples, mean, variance, prior_mean, prior_variance
+
+
+_ewma_scan = njit(cache=True)(_ewma_scan_py) if NUMBA_AVAILABLE else _ewma_scan_py
+
+
+# Row layout accepted by AlertSystem.check_network_health_batch
+HEALTH_SAMPLE_DTYPE = np.dtype([
+    ('tps', np.float64),
+    ('latency', np.float64),
+    ('active_nodes', np.int64)
+])
+
+
+def _welford_add(n: int, mean: float, m2: float, x: float):
+    """Fold a sample into running (count, mean, M2) moments"""
+    n += 1
+    delta = x - mean
+    mean += delta / n
+    m2 += delta * (x - mean)
+    return n, mean, m2
+
+
+def _welford_remove(n: int, mean: float, m2: float, x: float):
+    """Remove a previously added sample from running (count, mean, M2) moments"""
+    n -= 1
+    if n == 0:
+        return 0, 0.0, 0.0
+    delta = x - mean
+    mean -= delta / n
+    m2 -= delta * (x - mean)
+    return n, mean, max(m2, 0.0)
+
+
 class AnomalyDetector:
     """Detects anomalies in network behavior"""
     
-    def __init__(self, window_size: int = 100):
+    # Number of most recent samples used as the node count baseline
+    NODE_BASELINE_SAMPLES = 10
+    
+    def __init__(self, window_size: int = 100, ewma: bool = False):
         self.window_size = window_size
-        self.tps_history = deque(maxlen=window_size)
-        self.latency_history = deque(maxlen=window_size)
-        self.node_count_history = deque(maxlen=window_size)
+        
+        # Preallocated ring buffers; _head is the next write slot
+        self._tps = np.zeros(window_size, dtype=np.float64)
+        self._latency = np.zeros(window_size, dtype=np.float64)
+        self._node_counts = np.zeros(window_size, dtype=np.int64)
+        self._head = 0
+        self._count = 0
+        self._baseline_offsets = np.arange(1, self.NODE_BASELINE_SAMPLES + 1)
+        
+        # Running (count, mean, M2) over the current window so checks
+        # don't rescan the history
+        self._tps_moments = (0, 0.0, 0.0)
+        self._latency_moments = (0, 0.0, 0.0)
+        
+        # Each inverse update leaves a little rounding error behind, which
+        # piles up when the level of the data shifts; recomputing the moments
+        # once per window of evictions bounds it at O(1) amortized cost
+        self._evictions = 0
+        
+        # With ewma=True TPS anomalies are judged against an exponentially
+        # weighted mean/variance (span window_size) instead of the exact
+        # window: one update per sample and it follows gradual drift
+        self.ewma = ewma
+        self._ewma_alpha = 2 / (window_size + 1)
+        self._tps_ewma = (0, 0.0, 0.0)  # (samples, mean, variance)
+        self._tps_ewma_prior = (0.0, 0.0)  # estimate the latest sample is judged against
+    
+    def _ordered(self, buffer: np.ndarray) -> np.ndarray:
+        """Return a ring buffer's samples oldest first"""
+        if self._count < self.window_size:
+            return buffer[:self._count].copy()
+        return np.concatenate((buffer[self._head:], buffer[:self._head]))
+    
+    @property
+    def tps_history(self) -> np.ndarray:
+        """TPS samples in the current window, oldest first"""
+        return self._ordered(self._tps)
+    
+    @property
+    def latency_history(self) -> np.ndarray:
+        """Latency samples in the current window, oldest first"""
+        return self._ordered(self._latency)
+    
+    @property
+    def node_count_history(self) -> np.ndarray:
+        """Active node counts in the current window, oldest first"""
+        return self._ordered(self._node_counts)
     
     def add_sample(self, tps: float, latency: float, node_count: int):
         """Add a sample to the history"""
-        self.tps_history.append(tps)
-        self.latency_history.append(latency)
-        self.node_count_history.append(node_count)
+        head = self._head
+        full = self._count == self.window_size
+        resync = full and self._evictions + 1 >= self.window_size
+        
+        if not full:
+            self._count += 1
+        elif not resync:
+            # Retire the samples about to be overwritten
+            self._evictions += 1
+            if not self.ewma:
+                self._tps_moments = _welford_remove(*self._tps_moments, float(self._tps[head]))
+            self._latency_moments = _welford_remove(*self._latency_moments, float(self._latency[head]))
+        
+        self._tps[head] = tps
+        self._latency[head] = latency
+        self._node_counts[head] = node_count
+        self._head = (head + 1) % self.window_size
+        
+        if self.ewma:
+            self._update_tps_ewma((float(tps),))
+        
+        if resync:
+            self._resync_moments()
+        else:
+            if not self.ewma:
+                self._tps_moments = _welford_add(*self._tps_moments, tps)
+            self._latency_moments = _welford_add(*self._latency_moments, latency)
+    
+    def _update_tps_ewma(self, values, scan=_ewma_scan_py):
+        """Fold TPS samples into the exponentially weighted estimate"""
+        samples, mean, variance, prior_mean, prior_variance = scan(
+            values, *self._tps_ewma, self._ewma_alpha
+        )
+        self._tps_ewma = (samples, mean, variance)
+        self._tps_ewma_prior = (prior_mean, prior_variance)
+    
+    def add_samples(self, tps: np.ndarray, latency: np.ndarray, node_counts: np.ndarray):
+        """Add a batch of samples to the history, oldest first"""
+        total = len(tps)
+        if total == 0:
+            return
+        
+        # Only the newest window_size samples survive the batch
+        kept = min(total, self.window_size)
+        slots = (self._head + (total - kept) + np.arange(kept)) % self.window_size
+        self._tps[slots] = tps[-kept:]
+        self._latency[slots] = latency[-kept:]
+        self._node_counts[slots] = node_counts[-kept:]
+        
+        self._head = (self._head + total) % self.window_size
+        self._count = min(self._count + total, self.window_size)
+        
+        if self.ewma:
+            if NUMBA_AVAILABLE:
+                self._update_tps_ewma(np.ascontiguousarray(tps, dtype=np.float64), _ewma_scan)
+            else:
+                self._update_tps_ewma(tps.tolist())
+        self._resync_moments()
+    
+    def _resync_moments(self):
+        """Recompute the running moments from the samples in the window"""
+        self._evictions = 0
+        if not self.ewma:
+            self._tps_moments = self._window_moments(self._tps)
+        self._latency_moments = self._window_moments(self._latency)
+    
+    def _window_moments(self, buffer: np.ndarray):
+        """(count, mean, M2) of the samples currently held in a ring buffer"""
+        window = buffer[:self._count]
+        if not self._count:
+            return 0, 0.0, 0.0
+        mean = float(window.mean())
+        return self._count, mean, float(np.square(window - mean).sum())
+    
+    def _latest(self, buffer: np.ndarray):
+        """Most recently added sample of a ring buffer"""
+        return buffer[self._head - 1].item()
     
     def detect_tps_anomaly(self, threshold_std: float = 2.0) -> Optional[Dict]:
         """Detect TPS anomalies using standard deviation"""
-        if len(self.tps_history) < 10:
-            return None
+        if self.ewma:
+            if self._tps_ewma[0] < 10:
+                return None
+            mean, variance = self._tps_ewma_prior
+        else:
+            n, mean, m2 = self._tps_moments
+            if n < 10:
+                return None
+            variance = m2 / (n - 1)
         
-        import statistics
-        mean = statistics.mean(self.tps_history)
-        stdev = statistics.stdev(self.tps_history)
-        current = self.tps_history[-1]
+        current = self._latest(self._tps)
+        deviation = current - mean
         
-        if abs(current - mean) > threshold_std * stdev:
+        # Compare squares so the square root is only taken for anomalies
+        if deviation * deviation > threshold_std * threshold_std * variance:
+            stdev = math.sqrt(variance)
             return {
                 'current': current,
                 'mean': mean,
@@ -157,27 +563,31 @@ class AnomalyDetector:
     
     def detect_latency_anomaly(self, threshold_ms: int = 2000) -> Optional[Dict]:
         """Detect high latency"""
-        if not self.latency_history:
+        if not self._count:
             return None
         
-        current = self.latency_history[-1]
+        current = self._latest(self._latency)
         if current > threshold_ms:
-            import statistics
-            avg = statistics.mean(self.latency_history)
             return {
                 'current': current,
-                'average': avg,
+                'average': self._latency_moments[1],
                 'threshold': threshold_ms
             }
         return None
     
     def detect_node_failure(self, threshold_drop: float = 0.3) -> Optional[Dict]:
         """Detect significant drop in active nodes"""
-        if len(self.node_count_history) < 10:
+        if self._count < self.NODE_BASELINE_SAMPLES:
             return None
         
-        recent_avg = sum(list(self.node_count_history)[-10:]) / 10
-        current = self.node_count_history[-1]
+        # Slice the baseline directly unless it wraps around the buffer end
+        head = self._head
+        if head >= self.NODE_BASELINE_SAMPLES:
+            baseline = self._node_counts[head - self.NODE_BASELINE_SAMPLES:head]
+        else:
+            baseline = self._node_counts.take((head - self._baseline_offsets) % self.window_size)
+        recent_avg = float(baseline.mean())
+        current = self._latest(self._node_counts)
         
         if recent_avg > 0 and (recent_avg - current) / recent_avg > threshold_drop:
             return {
@@ -191,21 +601,52 @@ class AnomalyDetector:
 class AlertSystem:
     """Main alert system for network monitoring"""
     
-    def __init__(self):
+    # Alert rule thresholds, stored as attributes and exposed through rules
+    RULE_NAMES = (
+        'high_latency_threshold',
+        'low_tps_threshold',
+        'node_failure_threshold',
+        'reputation_drop_threshold'
+    )
+    
+    def __init__(self, max_alerts: int = 100_000):
         self.handlers: List[AlertHandler] = []
-        self.alerts: List[Alert] = []
+        self.max_alerts = max_alerts
+        self.alerts: Deque[Alert] = deque()
         self.alert_counter = 0
+        
+        # Indexes over self.alerts; _active preserves creation order
+        self._by_id: Dict[str, Alert] = {}
+        self._active: Dict[str, Alert] = {}
+        self._severity_counts: Counter = Counter()
+        self._type_counts: Counter = Counter()
+        
         self.anomaly_detector = AnomalyDetector()
         self.monitoring_active = False
-        self.monitoring_thread = None
+        
+        # Handlers run on a dispatcher thread, started on the first alert,
+        # so slow handlers don't block alert producers
+        self._dispatch_queue: queue.Queue = queue.Queue(maxsize=10000)
+        self._dispatcher: Optional[threading.Thread] = None
+        self._dispatcher_lock = threading.Lock()
         
         # Alert rules
-        self.rules = {
-            'high_latency_threshold': 2000,  # ms
-            'low_tps_threshold': 10,
-            'node_failure_threshold': 0.3,  # 30% drop
-            'reputation_drop_threshold': 20  # points
-        }
+        self.high_latency_threshold = 2000  # ms
+        self.low_tps_threshold = 10
+        self.node_failure_threshold = 0.3  # 30% drop
+        self.reputation_drop_threshold = 20  # points
+    
+    @property
+    def rules(self) -> Dict:
+        """Snapshot of the alert rule thresholds"""
+        return {name: getattr(self, name) for name in self.RULE_NAMES}
+    
+    @rules.setter
+    def rules(self, rules: Dict):
+        for name, value in rules.items():
+            if name not in self.RULE_NAMES:
+                raise KeyError(f"Unknown alert rule: {name}")
+            setattr(self, name, value)
     
     def add_handler(self, handler: AlertHandler):
         """Add an alert handler"""
@@ -224,67 +665,167 @@ class AlertSystem:
             details=details or {}
         )
         
+        if len(self.alerts) >= self.max_alerts:
+            self._evict_alert()
+        
         self.alerts.append(alert)
+        self._by_id[alert.alert_id] = alert
+        self._active[alert.alert_id] = alert
+        self._severity_counts[severity] += 1
+        self._type_counts[alert_type] += 1
+        
         self._dispatch_alert(alert)
         
         return alert
     
+    def _evict_alert(self):
+        """Drop the oldest resolved alert, or the oldest alert if none are resolved"""
+        index = 0
+        if len(self._active) < len(self.alerts):
+            # Active alerts older than the first resolved one are usually few
+            for index, alert in enumerate(self.alerts):
+                if alert.resolved:
+                    break
+        
+        alert = self.alerts[index]
+        del self.alerts[index]
+        
+        del self._by_id[alert.alert_id]
+        self._active.pop(alert.alert_id, None)
+        self._severity_counts[alert.severity] -= 1
+        self._type_counts[alert.alert_type] -= 1
+    
     def _dispatch_alert(self, alert: Alert):
-        """Dispatch alert to all handlers"""
-        for handler in self.handlers:
-            try:
-                handler.handle(alert)
-            except Exception as e:
-                print(f"Error in alert handler: {e}")
+        """Queue alert for delivery to all handlers"""
+        if self._dispatcher is None:
+            self._start_dispatcher()
+        
+        try:
+            self._dispatch_queue.put_nowait(alert)
+        except queue.Full:
+            print(f"Alert dispatch queue full, dropping {alert.alert_id}")
+    
+    def _start_dispatcher(self):
+        """Start the dispatcher thread if it is not running yet"""
+        with self._dispatcher_lock:
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(
+                    target=self._dispatch_loop, name="alert-dispatcher", daemon=True
+                )
+                self._dispatcher.start()
+                atexit.register(self.flush)
+    
+    def _dispatch_loop(self):
+        """Dispatcher thread: deliver queued alerts to every handler"""
+        while True:
+            alert = self._dispatch_queue.get()
+            for handler in tuple(self.handlers):
+                try:
+                    handler.handle(alert)
+                except Exception as e:
+                    print(f"Error in alert handler: {e}")
+            self._dispatch_queue.task_done()
+    
+    def flush(self):
+        """Block until queued alerts have been delivered and handlers have flushed"""
+        self._dispatch_queue.join()
+        for handler in tuple(self.handlers):
+            flush = getattr(handler, 'flush', None)
+            if flush is not None:
+                flush()
+    
+    def get_alert(self, alert_id: str) -> Optional[Alert]:
+        """Look up an alert by ID"""
+        return self._by_id.get(alert_id)
     
     def resolve_alert(self, alert_id: str):
         """Mark an alert as resolved"""
-        for alert in self.alerts:
-            if alert.alert_id == alert_id and not alert.resolved:
-                alert.resolved = True
-                alert.resolved_at = time.time()
-                return True
-        return False
+        alert = self._active.pop(alert_id, None)
+        if alert is None:
+            return False
+        
+        alert.resolved = True
+        alert.resolved_at = time.time()
+        return True
     
     def get_active_alerts(self, severity: Optional[AlertSeverity] = None) -> List[Alert]:
         """Get all active (unresolved) alerts"""
-        active = [a for a in self.alerts if not a.resolved]
         if severity:
-            active = [a for a in active if a.severity == severity]
-        return active
+            return [a for a in self._active.values() if a.severity == severity]
+        return list(self._active.values())
     
     def get_recent_alerts(self, hours: int = 24) -> List[Alert]:
         """Get alerts from the last N hours"""
         cutoff = time.time() - (hours * 3600)
-        return [a for a in self.alerts if a.timestamp >= cutoff]
+        
+        # Alerts are stored in creation order, so walk back from the newest
+        recent = []
+        for alert in reversed(self.alerts):
+            if alert.timestamp < cutoff:
+                break
+            recent.append(alert)
+        recent.reverse()
+        return recent
     
     def check_network_health(self, metrics: Dict):
         """Check network health and create alerts if needed"""
+        tps = metrics.get('tps', 0)
+        latency = metrics.get('latency', 0)
+        
         # Add sample to anomaly detector
-        self.anomaly_detector.add_sample(
-            metrics.get('tps', 0),
-            metrics.get('latency', 0),
-            metrics.get('active_nodes', 0)
-        )
+        self.anomaly_detector.add_sample(tps, latency, metrics.get('active_nodes', 0))
         
         # Check for high latency
-        if metrics.get('latency', 0) > self.rules['high_latency_threshold']:
-            self.create_alert(
-                AlertType.HIGH_LATENCY,
-                AlertSeverity.WARNING,
-                f"High latency detected: {metrics['latency']}ms",
-                {'latency': metrics['latency'], 'threshold': self.rules['high_latency_threshold']}
-            )
+        if latency > self.high_latency_threshold:
+            self._alert_high_latency(latency)
         
         # Check for low TPS
-        if metrics.get('tps', 0) < self.rules['low_tps_threshold']:
-            self.create_alert(
-                AlertType.LOW_TPS,
-                AlertSeverity.WARNING,
-                f"Low TPS detected: {metrics['tps']:.2f}",
-                {'tps': metrics['tps'], 'threshold': self.rules['low_tps_threshold']}
-            )
+        if tps < self.low_tps_threshold:
+            self._alert_low_tps(tps)
+        
+        self._check_anomalies()
+    
+    def check_network_health_batch(self, samples: np.ndarray):
+        """
+        Check a batch of metric samples, oldest first
+        
+        Threshold alerts are raised for every offending sample; anomaly
+        checks run once against the history after the whole batch is added.
         
+        Args:
+            samples: Structured array with HEALTH_SAMPLE_DTYPE fields
+        """
+        tps = samples['tps']
+        latency = samples['latency']
+        
+        self.anomaly_detector.add_samples(tps, latency, samples['active_nodes'])
+        
+        for i in np.flatnonzero(latency > self.high_latency_threshold):
+            self._alert_high_latency(latency[i].item())
+        
+        for i in np.flatnonzero(tps < self.low_tps_threshold):
+            self._alert_low_tps(tps[i].item())
+        
+        self._check_anomalies()
+    
+    def _alert_high_latency(self, latency: float):
+        self.create_alert(
+            AlertType.HIGH_LATENCY,
+            AlertSeverity.WARNING,
+            f"High latency detected: {latency}ms",
+            {'latency': latency, 'threshold': self.high_latency_threshold}
+        )
+    
+    def _alert_low_tps(self, tps: float):
+        self.create_alert(
+            AlertType.LOW_TPS,
+            AlertSeverity.WARNING,
+            f"Low TPS detected: {tps:.2f}",
+            {'tps': tps, 'threshold': self.low_tps_threshold}
+        )
+    
+    def _check_anomalies(self):
+        """Raise alerts for anomalies in the detector's current history"""
         # Check for TPS anomalies
         tps_anomaly = self.anomaly_detector.detect_tps_anomaly()
         if tps_anomaly:
@@ -328,7 +869,7 @@ class AlertSystem:
             )
         
         # Check for reputation drop
-        if behavior_data.get('reputation_drop', 0) > self.rules['reputation_drop_threshold']:
+        if behavior_data.get('reputation_drop', 0) > self.reputation_drop_threshold:
             self.create_alert(
                 AlertType.REPUTATION_DROP,
                 AlertSeverity.WARNING,
@@ -365,43 +906,49 @@ class AlertSystem:
                 consensus_data
             )
     
-    def start_monitoring(self, check_interval: int = 30):
-        """Start background monitoring thread"""
-        if self.monitoring_active:
-            return
-        
+    def start_monitoring(self):
+        """Enable periodic health checks scheduled with schedule_check or monitor_loop"""
         self.monitoring_active = True
-        
-        def monitor_loop():
-            while self.monitoring_active:
-                # Monitoring logic would go here
-                # This would be called by the main application
-                time.sleep(check_interval)
-        
-        self.monitoring_thread = threading.Thread(target=monitor_loop, daemon=True)
-        self.monitoring_thread.start()
     
     def stop_monitoring(self):
-        """Stop background monitoring"""
+        """Stop periodic health checks after the current one"""
         self.monitoring_active = False
-        if self.monitoring_thread:
-            self.monitoring_thread.join(timeout=5)
+    
+    def schedule_check(self, scheduler: sched.scheduler, check_interval: float,
+                       metrics_source: Callable[[], Dict]):
+        """
+        Run check_network_health every check_interval seconds on a caller-owned scheduler
+        
+        Args:
+            scheduler: Scheduler driven by the caller's main loop
+            check_interval: Seconds between checks
+            metrics_source: Returns the metrics dict for each check
+        """
+        def run_check():
+            if not self.monitoring_active:
+                return
+            self.check_network_health(metrics_source())
+            scheduler.enter(check_interval, 1, run_check)
+        
+        self.start_monitoring()
+        scheduler.enter(check_interval, 1, run_check)
+    
+    async def monitor_loop(self, metrics_source: Callable[[], Dict], check_interval: float = 30):
+        """Run check_network_health every check_interval seconds on the running event loop"""
+        self.start_monitoring()
+        while self.monitoring_active:
+            await asyncio.sleep(check_interval)
+            if self.monitoring_active:
+                self.check_network_health(metrics_source())
     
     def get_statistics(self) -> Dict:
         """Get alert statistics"""
         total = len(self.alerts)
-        active = len(self.get_active_alerts())
+        active = len(self._active)
         resolved = total - active
         
-        by_severity = {}
-        for severity in AlertSeverity:
-            by_severity[severity.value] = len([a for a in self.alerts 
-                                               if a.severity == severity])
-        
-        by_type = {}
-        for alert_type in AlertType:
-            by_type[alert_type.value] = len([a for a in self.alerts 
-                                             if a.alert_type == alert_type])
+        by_severity = {severity.value: self._severity_counts[severity] for severity in AlertSeverity}
+        by_type = {alert_type.value: self._type_counts[alert_type] for alert_type in AlertType}
         
         return {
             'total_alerts': total,
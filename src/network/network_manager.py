@@ -9,14 +9,27 @@ Manages network configurations for testnet and mainnet:
 - Network-aware IP validation (testnet allows private, mainnet public-only)
 """
 
+import bisect
 import logging
+import socket
+import sys
 from enum import Enum
-from dataclasses import dataclass
-from typing import List, Optional
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Union
 import ipaddress
 
+try:
+    import pytricia
+    PYTRICIA_AVAILABLE = True
+except ImportError:
+    PYTRICIA_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# dataclass(slots=True) is only available from Python 3.10
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
 
 class NetworkType(Enum):
     """Network types supported by PlayerGold"""
@@ -24,14 +37,14 @@ class NetworkType(Enum):
     MAINNET = "mainnet"
 
 
-@dataclass
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class NetworkConfig:
     """Configuration for a specific network"""
     network_id: str
     network_type: NetworkType
     p2p_port: int
     api_port: int
-    bootstrap_nodes: List[str]
+    bootstrap_nodes: Tuple[str, ...]
     genesis_pioneers_required: int = 2
     consensus_threshold: float = 0.66  # 66%
     block_interval: int = 10  # seconds
@@ -41,6 +54,46 @@ class NetworkConfig:
     reset_allowed: bool = False  # Only testnet allows reset
 
 
+@lru_cache(maxsize=4096)
+def _parse_ip(ip_address: str) -> Tuple[Union[ipaddress.IPv4Address, ipaddress.IPv6Address], bool, bool, bool, bool]:
+    """
+    Parse an IP address once per distinct peer and cache its classification
+    
+    Returns (ip, is_private, is_loopback, is_link_local, is_ipv4). Raises
+    ValueError for malformed addresses; failures are not cached.
+    """
+    ip = ipaddress.ip_address(ip_address)
+    return ip, ip.is_private, ip.is_loopback, ip.is_link_local, isinstance(ip, ipaddress.IPv4Address)
+
+
+@lru_cache(maxsize=4096)
+def _classify_peer_ip(ip_address: str, testnet: bool) -> Tuple[str, bool, bool, bool, bool, bool, Optional[str]]:
+    """
+    Classify a peer address and decide whether it may connect, in a single cached step
+    
+    Returns (type, is_private, is_loopback, is_link_local, is_valid, is_public,
+    rejection) where rejection names the offending address class or is None.
+    Testnet accepts loopback and private peers for local testing but never marks
+    them public. Raises ValueError for malformed addresses.
+    """
+    _, is_private, is_loopback, is_link_local, is_ipv4 = _parse_ip(ip_address)
+    ip_type = 'IPv4' if is_ipv4 else 'IPv6'
+    
+    if testnet and (is_loopback or is_private):
+        return ip_type, is_private, is_loopback, is_link_local, True, False, None
+    
+    if is_private:
+        rejection = 'Private'
+    elif is_loopback:
+        rejection = 'Loopback'
+    elif is_link_local:
+        rejection = 'Link-local'
+    else:
+        return ip_type, is_private, is_loopback, is_link_local, True, True, None
+    
+    return ip_type, is_private, is_loopback, is_link_local, False, False, rejection
+
+
 class NetworkManager:
     """
     Manages network configurations and provides network-specific functionality
@@ -50,6 +103,9 @@ class NetworkManager:
         self.current_network = NetworkType.TESTNET
         self.networks = self._initialize_networks()
         
+        # Config-derived network info keyed by network, with the NetworkConfig it was built from
+        self._network_info: Dict[NetworkType, Tuple[NetworkConfig, dict]] = {}
+        
         # IP validation for network-aware filtering (testnet allows private, mainnet public-only)
         self.private_ipv4_ranges = [
             ipaddress.IPv4Network('10.0.0.0/8'),
@@ -65,8 +121,32 @@ class NetworkManager:
             ipaddress.IPv6Network('::1/128'),   # Loopback
         ]
         
+        # Longest-prefix-match tries answer membership in C without building ip_address objects
+        self._private_trie_v4 = None
+        self._private_trie_v6 = None
+        if PYTRICIA_AVAILABLE:
+            self._private_trie_v4 = pytricia.PyTricia(32, socket.AF_INET)
+            for network in self.private_ipv4_ranges:
+                self._private_trie_v4[str(network)] = True
+            self._private_trie_v6 = pytricia.PyTricia(128, socket.AF_INET6)
+            for network in self.private_ipv6_ranges:
+                self._private_trie_v6[str(network)] = True
+        
+        # Sorted integer bounds of the collapsed ranges, searched with bisect when pytricia is missing
+        self._private_v4_lows, self._private_v4_highs = self._range_bounds(self.private_ipv4_ranges)
+        self._private_v6_lows, self._private_v6_highs = self._range_bounds(self.private_ipv6_ranges)
+        
         logger.info(f"Network Manager initialized - Current network: {self.current_network.value}")
     
+    @staticmethod
+    def _range_bounds(networks) -> Tuple[List[int], List[int]]:
+        """Return sorted, non-overlapping (lows, highs) integer bounds for a set of networks"""
+        collapsed = sorted(ipaddress.collapse_addresses(networks))
+        return (
+            [int(network.network_address) for network in collapsed],
+            [int(network.broadcast_address) for network in collapsed]
+        )
+    
     def _initialize_networks(self) -> dict:
         """Initialize network configurations"""
         return {
@@ -75,11 +155,11 @@ class NetworkManager:
                 network_type=NetworkType.TESTNET,
                 p2p_port=18080,
                 api_port=19080,
-                bootstrap_nodes=[
+                bootstrap_nodes=(
                     # Add testnet bootstrap nodes here
                     # "testnet-node1.playergold.com:18080",
                     # "testnet-node2.playergold.com:18080",
-                ],
+                ),
                 faucet_enabled=True,
                 reset_allowed=True  # Testnet allows blockchain reset
             ),
@@ -89,11 +169,11 @@ class NetworkManager:
                 network_type=NetworkType.MAINNET,
                 p2p_port=18081,
                 api_port=19081,
-                bootstrap_nodes=[
+                bootstrap_nodes=(
                     # Add mainnet bootstrap nodes here
                     # "mainnet-node1.playergold.com:18081",
                     # "mainnet-node2.playergold.com:18081",
-                ],
+                ),
                 faucet_enabled=False,
                 reset_allowed=False  # Mainnet never allows reset
             )
@@ -138,102 +218,82 @@ class NetworkManager:
     
     def is_public_ip(self, ip_address: str) -> bool:
         """Check if an IP address is public (not private/local)"""
+        if ':' in ip_address:
+            family, trie = socket.AF_INET6, self._private_trie_v6
+            lows, highs = self._private_v6_lows, self._private_v6_highs
+        else:
+            family, trie = socket.AF_INET, self._private_trie_v4
+            lows, highs = self._private_v4_lows, self._private_v4_highs
+        
         try:
-            ip = ipaddress.ip_address(ip_address)
-            
-            # Check IPv4 private ranges
-            if isinstance(ip, ipaddress.IPv4Address):
-                for private_range in self.private_ipv4_ranges:
-                    if ip in private_range:
-                        return False
-                return True
-            
-            # Check IPv6 private ranges
-            elif isinstance(ip, ipaddress.IPv6Address):
-                for private_range in self.private_ipv6_ranges:
-                    if ip in private_range:
-                        return False
-                return True
-            
-            return False
+            # Strict C parse; pytricia and inet_aton accept malformed strings
+            packed = socket.inet_pton(family, ip_address)
+        except (OSError, TypeError):
+            packed = None
+        
+        if packed is not None:
+            if trie is not None:
+                return ip_address not in trie
             
+            ip_int = int.from_bytes(packed, 'big')
+            index = bisect.bisect_right(lows, ip_int) - 1
+            return index < 0 or ip_int > highs[index]
+        
+        # Scoped IPv6 and malformed input go through ipaddress
+        try:
+            ip, _, _, _, is_ipv4 = _parse_ip(ip_address)
         except ValueError:
             logger.error(f"Invalid IP address: {ip_address}")
             return False
+        
+        private_ranges = self.private_ipv4_ranges if is_ipv4 else self.private_ipv6_ranges
+        for private_range in private_ranges:
+            if ip in private_range:
+                return False
+        return True
     
     def validate_peer_ip(self, ip_address: str) -> dict:
         """Validate a peer's IP address for network connection"""
-        result = {
-            'is_valid': False,
-            'is_public': False,
-            'rejection_reason': None,
+        try:
+            ip_type, is_private, is_loopback, is_link_local, is_valid, is_public, rejection = _classify_peer_ip(
+                ip_address, self.current_network == NetworkType.TESTNET
+            )
+        except ValueError:
+            ip_type, is_private, is_loopback, is_link_local, is_valid, is_public = None, False, False, False, False, False
+            rejection_reason = f"Invalid IP address format: {ip_address}"
+        else:
+            if rejection:
+                rejection_reason = f"{rejection} IP address not allowed in {self.current_network.value}: {ip_address}"
+            else:
+                rejection_reason = None
+                logger.debug(f"Valid {'public' if is_public else 'testnet local'} IP: {ip_address}")
+        
+        return {
+            'is_valid': is_valid,
+            'is_public': is_public,
+            'rejection_reason': rejection_reason,
             'ip_info': {
                 'address': ip_address,
-                'type': None,
-                'is_private': False,
-                'is_loopback': False,
-                'is_link_local': False
+                'type': ip_type,
+                'is_private': is_private,
+                'is_loopback': is_loopback,
+                'is_link_local': is_link_local
             }
         }
-        
-        try:
-            ip = ipaddress.ip_address(ip_address)
-            
-            # Determine IP type
-            if isinstance(ip, ipaddress.IPv4Address):
-                result['ip_info']['type'] = 'IPv4'
-            elif isinstance(ip, ipaddress.IPv6Address):
-                result['ip_info']['type'] = 'IPv6'
-            
-            # Check IP properties
-            result['ip_info']['is_private'] = ip.is_private
-            result['ip_info']['is_loopback'] = ip.is_loopback
-            result['ip_info']['is_link_local'] = ip.is_link_local
-            
-            # TESTNET EXCEPTION: Allow local IPs for testing
-            if self.current_network == NetworkType.TESTNET:
-                # In testnet, allow localhost and private IPs for local testing
-                if ip.is_loopback or ip_address in ['127.0.0.1', '::1', 'localhost']:
-                    result['is_valid'] = True
-                    result['is_public'] = False  # Still mark as not public
-                    logger.debug(f"Valid testnet local IP: {ip_address}")
-                    return result
-                elif ip.is_private:
-                    # Allow private IPs in testnet for local network testing
-                    result['is_valid'] = True
-                    result['is_public'] = False
-                    logger.debug(f"Valid testnet private IP: {ip_address}")
-                    return result
-            
-            # Validate for public network (mainnet or strict mode)
-            if ip.is_private:
-                result['rejection_reason'] = f"Private IP address not allowed in {self.current_network.value}: {ip_address}"
-            elif ip.is_loopback:
-                result['rejection_reason'] = f"Loopback IP address not allowed in {self.current_network.value}: {ip_address}"
-            elif ip.is_link_local:
-                result['rejection_reason'] = f"Link-local IP address not allowed in {self.current_network.value}: {ip_address}"
-            else:
-                # IP is public
-                result['is_valid'] = True
-                result['is_public'] = True
-                logger.debug(f"Valid public IP: {ip_address}")
-            
-        except ValueError:
-            result['rejection_reason'] = f"Invalid IP address format: {ip_address}"
-        
-        return result
     
-    def get_bootstrap_nodes(self, network_type: Optional[NetworkType] = None) -> List[str]:
+    def get_bootstrap_nodes(self, network_type: Optional[NetworkType] = None) -> Tuple[str, ...]:
         """Get bootstrap nodes for a specific network"""
         config = self.get_network_config(network_type)
-        return config.bootstrap_nodes.copy()
+        return config.bootstrap_nodes
     
     def add_bootstrap_node(self, node_address: str, network_type: Optional[NetworkType] = None):
         """Add a bootstrap node to a network"""
         config = self.get_network_config(network_type)
         
         if node_address not in config.bootstrap_nodes:
-            config.bootstrap_nodes.append(node_address)
+            self.networks[config.network_type] = replace(
+                config, bootstrap_nodes=config.bootstrap_nodes + (node_address,)
+            )
             logger.info(f"Added bootstrap node to {config.network_type.value}: {node_address}")
         else:
             logger.warning(f"Bootstrap node already exists: {node_address}")
@@ -243,7 +303,9 @@ class NetworkManager:
         config = self.get_network_config(network_type)
         
         if node_address in config.bootstrap_nodes:
-            config.bootstrap_nodes.remove(node_address)
+            self.networks[config.network_type] = replace(
+                config, bootstrap_nodes=tuple(node for node in config.bootstrap_nodes if node != node_address)
+            )
             logger.info(f"Removed bootstrap node from {config.network_type.value}: {node_address}")
         else:
             logger.warning(f"Bootstrap node not found: {node_address}")
@@ -262,21 +324,30 @@ class NetworkManager:
         """Get comprehensive network information"""
         config = self.get_network_config(network_type)
         
-        return {
-            'network_id': config.network_id,
-            'network_type': config.network_type.value,
-            'p2p_port': config.p2p_port,
-            'api_port': config.api_port,
-            'bootstrap_nodes': config.bootstrap_nodes,
-            'genesis_pioneers_required': config.genesis_pioneers_required,
-            'consensus_threshold': config.consensus_threshold,
-            'block_interval': config.block_interval,
-            'initial_block_reward': config.initial_block_reward,
-            'halving_interval': config.halving_interval,
-            'faucet_enabled': config.faucet_enabled,
-            'reset_allowed': config.reset_allowed,
-            'is_current': config.network_type == self.current_network
-        }
+        # NetworkConfig is frozen and replaced on every change, so identity marks a stale entry
+        cached = self._network_info.get(config.network_type)
+        if cached is None or cached[0] is not config:
+            cached = (config, {
+                'network_id': config.network_id,
+                'network_type': config.network_type.value,
+                'p2p_port': config.p2p_port,
+                'api_port': config.api_port,
+                'bootstrap_nodes': None,
+                'genesis_pioneers_required': config.genesis_pioneers_required,
+                'consensus_threshold': config.consensus_threshold,
+                'block_interval': config.block_interval,
+                'initial_block_reward': config.initial_block_reward,
+                'halving_interval': config.halving_interval,
+                'faucet_enabled': config.faucet_enabled,
+                'reset_allowed': config.reset_allowed,
+                'is_current': None
+            })
+            self._network_info[config.network_type] = cached
+        
+        info = cached[1].copy()
+        info['bootstrap_nodes'] = list(config.bootstrap_nodes)
+        info['is_current'] = config.network_type == self.current_network
+        return info
     
     def get_all_networks_info(self) -> dict:
         """Get information about all configured networks"""
@@ -7,18 +7,32 @@ Fixed version that properly handles node registration, keepalive, and genesis de
 
 from fastapi import FastAPI, HTTPException, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
+from sqlalchemy import func, and_, or_, select
 from pydantic import BaseModel, Field
 from typing import Optional, List
+import asyncio
 import logging
+import time
+from contextlib import asynccontextmanager, suppress
 from datetime import datetime, timedelta
+from functools import lru_cache
 import json
 
-from .database import get_db, engine
-from .models import Base, NetworkNode, NodeType, NodeStatus
+import numpy as np
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+from .database import get_db, engine, SessionLocal
+from .models import Base, NetworkNode, NodeType, NodeStatus, NODE_TYPE_BY_NAME, NODE_DICT_COLUMNS
 from .encryption import NetworkEncryption
-from .utils import calculate_distance, validate_user_agent
+from .keepalive_buffer import KeepaliveBuffer
+from .utils import bounding_box, calculate_distances, validate_user_agent
 
 # Create tables
 Base.metadata.create_all(bind=engine)
@@ -27,7 +41,45 @@ Base.metadata.create_all(bind=engine)
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="PlayerGold Network Coordinator", version="2.0.0")
+
+class OrjsonResponse(JSONResponse):
+    """JSON response rendered by orjson, which is several times faster on large network maps"""
+    
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+# Keepalives are coalesced in memory and written to the database in batches
+KEEPALIVE_FLUSH_INTERVAL = 0.5  # seconds
+keepalive_buffer = KeepaliveBuffer(SessionLocal)
+
+
+async def _flush_keepalives():
+    """Periodically write buffered keepalives to the database"""
+    while True:
+        await asyncio.sleep(KEEPALIVE_FLUSH_INTERVAL)
+        await asyncio.to_thread(keepalive_buffer.flush)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the keepalive flusher for the lifetime of the app"""
+    flusher = asyncio.create_task(_flush_keepalives())
+    try:
+        yield
+    finally:
+        flusher.cancel()
+        with suppress(asyncio.CancelledError):
+            await flusher
+        keepalive_buffer.flush()
+
+
+app = FastAPI(
+    title="PlayerGold Network Coordinator",
+    version="2.0.0",
+    lifespan=lifespan,
+    default_response_class=OrjsonResponse if ORJSON_AVAILABLE else JSONResponse
+)
 
 # CORS middleware
 app.add_middleware(
@@ -41,6 +93,20 @@ app.add_middleware(
 # Encryption handler
 encryption = NetworkEncryption()
 
+# Nodes not seen within this window are no longer considered active
+ACTIVE_NODE_TIMEOUT = timedelta(minutes=5)
+
+
+@lru_cache(maxsize=1)
+def _cutoff_for_second(second: int) -> datetime:
+    """Compute the active-node cutoff once per monotonic second"""
+    return datetime.utcnow() - ACTIVE_NODE_TIMEOUT
+
+
+def get_active_cutoff() -> datetime:
+    """Get the last_seen cutoff for active nodes, at one-second resolution"""
+    return _cutoff_for_second(int(time.monotonic()))
+
 
 class NodeRegistration(BaseModel):
     """Node registration request model"""
@@ -88,7 +154,7 @@ async def health_check():
 
 
 @app.post("/api/v1/register")
-async def register_node(
+def register_node(
     registration: NodeRegistration,
     request: Request,
     db: Session = Depends(get_db)
@@ -123,25 +189,8 @@ async def register_node(
             
             # FIXED: Properly handle node_type update
             node_type_str = registration.node_type.lower()
-            if node_type_str == 'genesis':
-                existing_node.node_type = NodeType.GENESIS
-                existing_node.is_genesis = True
-            elif node_type_str == 'validator':
-                existing_node.node_type = NodeType.VALIDATOR
-                existing_node.is_genesis = False
-            elif node_type_str == 'miner':
-                existing_node.node_type = NodeType.MINER
-                existing_node.is_genesis = False
-            elif node_type_str == 'relay':
-                existing_node.node_type = NodeType.RELAY
-                existing_node.is_genesis = False
-            elif node_type_str == 'light':
-                existing_node.node_type = NodeType.LIGHT
-                existing_node.is_genesis = False
-            else:
-                # Default to genesis
-                existing_node.node_type = NodeType.GENESIS
-                existing_node.is_genesis = True
+            existing_node.node_type = NODE_TYPE_BY_NAME.get(node_type_str, NodeType.GENESIS)
+            existing_node.is_genesis = existing_node.node_type is NodeType.GENESIS
             
             existing_node.public_key = registration.public_key
             existing_node.signature = registration.signature
@@ -153,7 +202,7 @@ async def register_node(
             logger.info(f"🆕 Creating new node: {registration.node_id}")
             
             # FIXED: Use the corrected from_registration_data method
-            node = NetworkNode.from_registration_data(registration.dict())
+            node = NetworkNode.from_registration_data(registration.model_dump(exclude_none=True))
             db.add(node)
         
         # FIXED: Commit the transaction to ensure data is saved
@@ -167,20 +216,6 @@ async def register_node(
             db.rollback()
             raise HTTPException(status_code=500, detail=f"Database error: {str(commit_error)}")
         
-        # Verify the node was saved by querying it back
-        verification_node = db.query(NetworkNode).filter(
-            NetworkNode.node_id == registration.node_id
-        ).first()
-        
-        if verification_node:
-            logger.info(f"🔍 Verification: Node {registration.node_id} found in database")
-            logger.info(f"   Database ID: {verification_node.id}")
-            logger.info(f"   Type: {verification_node.node_type.value}")
-            logger.info(f"   Is Genesis: {verification_node.is_genesis}")
-        else:
-            logger.error(f"❌ Verification failed: Node {registration.node_id} NOT found in database")
-            raise HTTPException(status_code=500, detail="Node registration verification failed")
-        
         return {
             "status": "success",
             "message": "Node registered successfully",
@@ -199,7 +234,7 @@ async def register_node(
 
 
 @app.post("/api/v1/keepalive")
-async def keepalive(
+def keepalive(
     keepalive_data: KeepaliveRequest,
     request: Request,
     db: Session = Depends(get_db)
@@ -216,41 +251,28 @@ async def keepalive(
         logger.debug(f"💓 KEEPALIVE REQUEST: {keepalive_data.node_id}")
         
         # FIXED: Find the node in database
-        node = db.query(NetworkNode).filter(
+        node_pk = db.query(NetworkNode.id).filter(
             NetworkNode.node_id == keepalive_data.node_id
-        ).first()
+        ).scalar()
         
-        if not node:
+        if node_pk is None:
             logger.warning(f"❌ Keepalive failed: Node {keepalive_data.node_id} not found in database")
-            
-            # Debug: List all nodes in database
-            all_nodes = db.query(NetworkNode).all()
-            logger.warning(f"🔍 Database contains {len(all_nodes)} nodes:")
-            for db_node in all_nodes:
-                logger.warning(f"   - {db_node.node_id} (ID: {db_node.id})")
-            
             raise HTTPException(status_code=404, detail="Node not found")
         
-        logger.debug(f"✅ Node found: {node.node_id} (ID: {node.id})")
+        logger.debug(f"✅ Node found: {keepalive_data.node_id} (ID: {node_pk})")
         
-        # Update keepalive data
-        node.update_keepalive(keepalive_data.dict())
-        node.last_seen = func.now()
-        
-        # FIXED: Commit the keepalive update
-        try:
-            db.commit()
-            logger.debug(f"✅ Keepalive updated for {keepalive_data.node_id}")
-        except Exception as commit_error:
-            logger.error(f"❌ Keepalive commit failed: {commit_error}")
-            db.rollback()
-            raise HTTPException(status_code=500, detail=f"Keepalive update failed: {str(commit_error)}")
+        # Buffer the update; the background flusher commits all pending keepalives together
+        last_seen = datetime.utcnow()
+        keepalive_buffer.add(node_pk, {
+            **NetworkNode.keepalive_values(keepalive_data.model_dump(exclude_none=True)),
+            'last_seen': last_seen
+        })
         
         return {
             "status": "success",
             "message": "Keepalive processed",
             "node_id": keepalive_data.node_id,
-            "last_seen": datetime.utcnow().isoformat()
+            "last_seen": last_seen.isoformat()
         }
         
     except HTTPException:
@@ -261,7 +283,7 @@ async def keepalive(
 
 
 @app.post("/api/v1/network-map")
-async def get_network_map(
+def get_network_map(
     map_request: NetworkMapRequest,
     request: Request,
     db: Session = Depends(get_db)
@@ -281,50 +303,58 @@ async def get_network_map(
         logger.info(f"   Limit: {map_request.limit}")
         
         # Get active nodes within distance
-        cutoff_time = datetime.utcnow() - timedelta(minutes=5)  # 5 minute timeout
-        
-        active_nodes = db.query(NetworkNode).filter(
-            and_(
+        cutoff_time = get_active_cutoff()
+        
+        # Prune far-away nodes in the database with a bounding box; exact distances are checked below
+        min_lat, max_lat, min_lon, max_lon = bounding_box(
+            map_request.requester_latitude,
+            map_request.requester_longitude,
+            map_request.max_distance_km
+        )
+        in_box = NetworkNode.latitude.between(min_lat, max_lat)
+        if min_lon is not None:
+            in_box = and_(in_box, NetworkNode.longitude.between(min_lon, max_lon))
+        
+        # Plain column rows skip ORM object hydration and the identity map
+        active_nodes = db.execute(
+            select(*NODE_DICT_COLUMNS).where(
                 NetworkNode.status == NodeStatus.ACTIVE,
-                NetworkNode.last_seen >= cutoff_time
-            )
-        ).limit(map_request.limit).all()
+                NetworkNode.last_seen >= cutoff_time,
+                or_(NetworkNode.latitude.is_(None), NetworkNode.longitude.is_(None), in_box)
+            ).limit(map_request.limit)
+        ).all()
         
         logger.info(f"📊 Found {len(active_nodes)} active nodes in database")
         
-        # FIXED: Properly count genesis nodes
-        genesis_nodes = [node for node in active_nodes if node.is_genesis]
-        genesis_count = len(genesis_nodes)
+        # FIXED: Properly count genesis nodes, gathering coordinates in the same pass
+        genesis_count = 0
+        coordinates = []
+        for node in active_nodes:
+            if node.is_genesis:
+                genesis_count += 1
+                logger.info(f"   - Genesis {node.node_id} (Type: {node.node_type.value})")
+            coordinates.append((node.latitude, node.longitude))
         
         logger.info(f"🎯 Genesis nodes found: {genesis_count}")
-        for genesis_node in genesis_nodes:
-            logger.info(f"   - {genesis_node.node_id} (Type: {genesis_node.node_type.value})")
         
-        # Filter by distance if coordinates are available
-        filtered_nodes = []
-        for node in active_nodes:
-            if node.latitude is not None and node.longitude is not None:
-                distance = calculate_distance(
-                    map_request.requester_latitude,
-                    map_request.requester_longitude,
-                    node.latitude,
-                    node.longitude
-                )
-                if distance <= map_request.max_distance_km:
-                    filtered_nodes.append(node)
-            else:
-                # Include nodes without coordinates
-                filtered_nodes.append(node)
-        
-        logger.info(f"📍 Nodes within distance: {len(filtered_nodes)}")
-        
-        # Convert to dict format
-        nodes_data = [node.to_dict() for node in filtered_nodes]
+        # Filter by distance if coordinates are available; missing coordinates become NaN
+        coordinates = np.array(coordinates, dtype=np.float64).reshape(-1, 2)
+        distances = calculate_distances(
+            map_request.requester_latitude,
+            map_request.requester_longitude,
+            coordinates[:, 0],
+            coordinates[:, 1]
+        )
+        # Include nodes without coordinates, serialising only the nodes kept
+        within_distance = np.isnan(distances) | (distances <= map_request.max_distance_km)
+        nodes_data = [NetworkNode.serialize(active_nodes[i]) for i in np.flatnonzero(within_distance)]
+        
+        logger.info(f"📍 Nodes within distance: {len(nodes_data)}")
         
         # Create network map
         network_map = {
-            "total_nodes": len(filtered_nodes),
-            "active_nodes": len(filtered_nodes),
+            "total_nodes": len(nodes_data),
+            "active_nodes": len(nodes_data),
             "genesis_nodes": genesis_count,  # FIXED: Correct genesis count
             "nodes": nodes_data,
             "timestamp": datetime.utcnow().isoformat(),
@@ -356,12 +386,12 @@ async def get_network_map(
 
 
 @app.get("/api/v1/nodes/stats")
-async def get_node_stats(db: Session = Depends(get_db)):
+def get_node_stats(db: Session = Depends(get_db)):
     """Get network statistics"""
     try:
         total_nodes = db.query(NetworkNode).count()
         
-        cutoff_time = datetime.utcnow() - timedelta(minutes=5)
+        cutoff_time = get_active_cutoff()
         active_nodes = db.query(NetworkNode).filter(
             and_(
                 NetworkNode.status == NodeStatus.ACTIVE,
@@ -391,7 +421,7 @@ async def get_node_stats(db: Session = Depends(get_db)):
 
 
 @app.get("/api/v1/nodes/list")
-async def get_nodes_list(
+def get_nodes_list(
     request: Request,
     db: Session = Depends(get_db)
 ):
@@ -404,7 +434,7 @@ async def get_nodes_list(
         logger.info("🎮 GAMERS NODE LIST REQUEST")
         
         # Get active nodes within last 5 minutes
-        cutoff_time = datetime.utcnow() - timedelta(minutes=5)
+        cutoff_time = get_active_cutoff()
         
         active_nodes = db.query(NetworkNode).filter(
             and_(
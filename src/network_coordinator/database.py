@@ -5,9 +5,9 @@ Network Coordinator Database Configuration
 Fixed version with proper database session management
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import QueuePool, StaticPool
 import os
 import logging
 
@@ -18,16 +18,29 @@ DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./network_coordinator.db")
 
 # FIXED: Proper SQLite configuration for thread safety
 if DATABASE_URL.startswith("sqlite"):
+    # Route handlers run on FastAPI's threadpool, so each session needs its own connection;
+    # only an in-memory database must share a single one
+    in_memory = DATABASE_URL in ("sqlite://", "sqlite:///:memory:")
     engine = create_engine(
         DATABASE_URL,
         connect_args={
             "check_same_thread": False,
             "timeout": 30
         },
-        poolclass=StaticPool,
+        poolclass=StaticPool if in_memory else QueuePool,
         pool_pre_ping=True,
         echo=False  # Set to True for SQL debugging
     )
+    
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Let reads run alongside writes and cut fsyncs per commit"""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.close()
 else:
     # PostgreSQL or other databases
     engine = create_engine(
@@ -66,6 +79,11 @@ def init_database():
     try:
         from .models import Base
         Base.metadata.create_all(bind=engine)
+        # create_all skips existing tables along with their indexes, so add any
+        # index declared since the database was first created
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=engine, checkfirst=True)
         logger.info("✅ Database tables created successfully")
     except Exception as e:
         logger.error(f"❌ Database initialization failed: {e}")
@@ -5,22 +5,84 @@ Encryption and cryptographic utilities for Network Coordinator
 import os
 import hashlib
 import hmac
-from typing import Tuple, List
-from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from collections import OrderedDict
+from datetime import datetime
+from typing import Tuple, List, Union
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import ed25519
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.exceptions import InvalidTag
 import json
 import base64
 
-from .models import NetworkNode
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+from .models import NetworkNode, NodeStatus
+
+
+def _json_bytes(data: dict) -> bytes:
+    """Serialize a payload as UTF-8 JSON with sorted keys"""
+    if ORJSON_AVAILABLE:
+        # Naive datetimes stay naive so they match datetime.isoformat()
+        return orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(data, sort_keys=True).encode('utf-8')
+
+
+def _json_loads(data: bytes):
+    """Parse a UTF-8 JSON payload"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 class NetworkEncryption:
     """Handles encryption and decryption of network data"""
     
-    def __init__(self, master_key: bytes = None):
-        """Initialize with master key for encryption"""
+    # Derived keys kept per salt; sized to hold a registry's worth of encrypted IPs
+    KEY_CACHE_SIZE = 4096
+    
+    # AESGCM objects kept per salt, for salts that are encrypted or decrypted repeatedly
+    AEAD_CACHE_SIZE = 64
+    
+    # Context bound into every HKDF-derived key
+    HKDF_INFO = b"network-coordinator-v1"
+    
+    # KDF names as written to certificate_info.json and encrypted maps
+    KDF_HKDF = "HKDF-SHA256"
+    KDF_LEGACY_PBKDF2 = "PBKDF2-HMAC-SHA256"
+    
+    # Encrypted map versions, identifying the signature scheme
+    SIGNATURE_HMAC_SHA256 = 1
+    SIGNATURE_BLAKE3 = 2
+    
+    def __init__(self, master_key: bytes = None, signature_version: int = SIGNATURE_HMAC_SHA256,
+                 legacy_kdf_fallback: bool = False):
+        """
+        Initialize with master key for encryption
+        
+        Per-salt keys are derived with HKDF, which is only sound because the master
+        key is 32 random bytes (certificate or os.urandom), not a password.
+        
+        signature_version selects how encrypted maps are signed. It defaults to
+        HMAC-SHA256 so every peer can verify them; opt into SIGNATURE_BLAKE3 only
+        when all receivers have the blake3 package.
+        
+        legacy_kdf_fallback retries untagged data that fails HKDF authentication
+        with the pre-HKDF PBKDF2 key. Every failed packet then costs a full PBKDF2
+        derivation, so enable it only while migrating data stored by older versions.
+        """
         if master_key is None:
             # Try to load master key from AES certificate
             master_key = self.load_master_key_from_certificate()
@@ -32,6 +94,19 @@ class NetworkEncryption:
                 logger.warning("Run setup_coordinator_aes_certificate.py to create permanent certificate")
                 master_key = os.urandom(32)
         self.master_key = master_key
+        
+        if signature_version == self.SIGNATURE_BLAKE3:
+            if not BLAKE3_AVAILABLE:
+                raise ValueError("BLAKE3 signatures require the blake3 package")
+            # BLAKE3 keyed mode takes exactly 32 key bytes
+            if len(master_key) != 32:
+                raise ValueError("BLAKE3 signatures require a 32-byte master key")
+        elif signature_version != self.SIGNATURE_HMAC_SHA256:
+            raise ValueError(f"Unsupported signature version: {signature_version}")
+        self.signature_version = signature_version
+        self.legacy_kdf_fallback = legacy_kdf_fallback
+        self._key_cache: "OrderedDict[Tuple[bytes, bool], bytes]" = OrderedDict()
+        self._aead_cache: "OrderedDict[Tuple[bytes, bool], AESGCM]" = OrderedDict()
     
     def load_master_key_from_certificate(self) -> bytes:
         """Load master key from AES certificate"""
@@ -73,13 +148,54 @@ class NetworkEncryption:
     
     def derive_key(self, salt: bytes) -> bytes:
         """Derive encryption key from master key and salt"""
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-        )
-        return kdf.derive(self.master_key)
+        return self._cached_key(salt, legacy=False)
+    
+    def derive_legacy_key(self, salt: bytes) -> bytes:
+        """Derive the PBKDF2 key used before HKDF, for data stored by older versions"""
+        return self._cached_key(salt, legacy=True)
+    
+    def _cached_key(self, salt: bytes, legacy: bool) -> bytes:
+        """Derive a key for salt, reusing recently derived keys"""
+        cache_key = (salt, legacy)
+        key = self._key_cache.get(cache_key)
+        if key is not None:
+            self._key_cache.move_to_end(cache_key)
+            return key
+        
+        if legacy:
+            kdf = PBKDF2HMAC(
+                algorithm=hashes.SHA256(),
+                length=32,
+                salt=salt,
+                iterations=100000,
+            )
+        else:
+            kdf = HKDF(
+                algorithm=hashes.SHA256(),
+                length=32,
+                salt=salt,
+                info=self.HKDF_INFO,
+            )
+        key = kdf.derive(self.master_key)
+        
+        self._key_cache[cache_key] = key
+        if len(self._key_cache) > self.KEY_CACHE_SIZE:
+            self._key_cache.popitem(last=False)
+        return key
+    
+    def _get_aead(self, salt: bytes, legacy: bool = False) -> AESGCM:
+        """Return an AESGCM for salt, reusing it while the salt stays in use"""
+        cache_key = (salt, legacy)
+        aead = self._aead_cache.get(cache_key)
+        if aead is not None:
+            self._aead_cache.move_to_end(cache_key)
+            return aead
+        
+        aead = AESGCM(self._cached_key(salt, legacy))
+        self._aead_cache[cache_key] = aead
+        if len(self._aead_cache) > self.AEAD_CACHE_SIZE:
+            self._aead_cache.popitem(last=False)
+        return aead
     
     def encrypt_data(self, data: bytes, salt: bytes = None) -> Tuple[bytes, bytes]:
         """
@@ -89,46 +205,65 @@ class NetworkEncryption:
         if salt is None:
             salt = self.generate_salt()
         
-        key = self.derive_key(salt)
         iv = os.urandom(12)  # GCM mode uses 12-byte IV
+        sealed = memoryview(self._get_aead(salt).encrypt(iv, data, None))
         
-        cipher = Cipher(algorithms.AES(key), modes.GCM(iv))
-        encryptor = cipher.encryptor()
-        
-        ciphertext = encryptor.update(data) + encryptor.finalize()
+        # AESGCM appends the tag; the stored layout is IV, tag, then ciphertext
+        return b"".join((iv, sealed[-16:], sealed[:-16])), salt
+    
+    def decrypt_data(self, encrypted_data: bytes, salt: bytes, legacy: bool = False) -> bytes:
+        """
+        Decrypt data using AES-256-GCM
         
-        # Combine IV, tag, and ciphertext
-        encrypted_data = iv + encryptor.tag + ciphertext
+        legacy selects the PBKDF2 key for data known to predate HKDF; otherwise
+        the PBKDF2 retry only happens when legacy_kdf_fallback is enabled.
+        """
+        if legacy:
+            return self._decrypt_with(self._get_aead(salt, legacy=True), encrypted_data)
         
-        return encrypted_data, salt
+        try:
+            return self._decrypt_with(self._get_aead(salt), encrypted_data)
+        except InvalidTag:
+            if not self.legacy_kdf_fallback:
+                raise
+            # May have been encrypted before the switch from PBKDF2 to HKDF
+            return self._decrypt_with(self._get_aead(salt, legacy=True), encrypted_data)
     
-    def decrypt_data(self, encrypted_data: bytes, salt: bytes) -> bytes:
-        """Decrypt data using AES-256-GCM"""
-        key = self.derive_key(salt)
-        
+    @staticmethod
+    def _decrypt_with(aead: AESGCM, encrypted_data: bytes) -> bytes:
+        """Decrypt IV + tag + ciphertext with a keyed AESGCM"""
         # Extract IV, tag, and ciphertext
-        iv = encrypted_data[:12]
-        tag = encrypted_data[12:28]
-        ciphertext = encrypted_data[28:]
-        
-        cipher = Cipher(algorithms.AES(key), modes.GCM(iv, tag))
-        decryptor = cipher.decryptor()
+        encrypted = memoryview(encrypted_data)
+        iv = encrypted[:12]
+        tag = encrypted[12:28]
+        ciphertext = encrypted[28:]
         
-        plaintext = decryptor.update(ciphertext) + decryptor.finalize()
-        return plaintext
+        return aead.decrypt(iv, b"".join((ciphertext, tag)), None)
     
     def encrypt_node_list(self, nodes: List[NetworkNode]) -> dict:
         """Encrypt a list of network nodes"""
-        from datetime import datetime
+        # One timestamp for both the payload and the envelope
+        timestamp = datetime.utcnow().isoformat()
+        
+        # Serialize and count node types in a single pass; orjson formats the timestamps itself
+        iso_datetimes = not ORJSON_AVAILABLE
+        node_dicts = []
+        active_nodes = 0
+        genesis_nodes = 0
+        for node in nodes:
+            node_dicts.append(node.to_dict(iso_datetimes=iso_datetimes))
+            if node.status == NodeStatus.ACTIVE:
+                active_nodes += 1
+            if node.is_genesis:
+                genesis_nodes += 1
         
-        # Convert nodes to JSON
         node_data = {
-            'nodes': [node.to_dict() for node in nodes],
-            'timestamp': datetime.utcnow().isoformat(),
+            'nodes': node_dicts,
+            'timestamp': timestamp,
             'total_count': len(nodes)
         }
         
-        json_data = json.dumps(node_data, sort_keys=True).encode('utf-8')
+        json_data = _json_bytes(node_data)
         
         # Encrypt the data
         salt = self.generate_salt()
@@ -137,16 +272,13 @@ class NetworkEncryption:
         # Create signature
         signature = self.sign_data(encrypted_data + salt)
         
-        # Count node types
-        active_nodes = sum(1 for node in nodes if node.status.value == 'active')
-        genesis_nodes = sum(1 for node in nodes if node.is_genesis)
-        
         return {
             'encrypted_data': base64.b64encode(encrypted_data).decode('utf-8'),
             'salt': base64.b64encode(salt).decode('utf-8'),
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': timestamp,
             'signature': base64.b64encode(signature).decode('utf-8'),
-            'version': 1,
+            'version': self.signature_version,
+            'kdf': self.KDF_HKDF,
             'total_nodes': len(nodes),
             'active_nodes': active_nodes,
             'genesis_nodes': genesis_nodes
@@ -159,26 +291,46 @@ class NetworkEncryption:
         salt = base64.b64decode(encrypted_map['salt'])
         signature = base64.b64decode(encrypted_map['signature'])
         
-        # Verify signature
-        if not self.verify_signature(encrypted_data + salt, signature):
+        # Verify signature; maps from before BLAKE3 signing are HMAC-signed version 1
+        version = encrypted_map.get('version', self.SIGNATURE_HMAC_SHA256)
+        if not self.verify_signature(encrypted_data + salt, signature, version):
             raise ValueError("Invalid signature on encrypted network map")
         
+        # Maps from before HKDF carry no kdf tag and were encrypted with PBKDF2
+        kdf = encrypted_map.get('kdf', self.KDF_LEGACY_PBKDF2)
+        if kdf not in (self.KDF_HKDF, self.KDF_LEGACY_PBKDF2):
+            raise ValueError(f"Unsupported key derivation function: {kdf}")
+        
         # Decrypt the data
-        decrypted_data = self.decrypt_data(encrypted_data, salt)
+        decrypted_data = self.decrypt_data(encrypted_data, salt, legacy=(kdf == self.KDF_LEGACY_PBKDF2))
         
         # Parse JSON
-        node_data = json.loads(decrypted_data.decode('utf-8'))
+        node_data = _json_loads(decrypted_data)
         
         # Convert back to NetworkNode objects (simplified)
         return node_data['nodes']
     
-    def sign_data(self, data: bytes) -> bytes:
-        """Sign data using HMAC-SHA256"""
-        return hmac.new(self.master_key, data, hashlib.sha256).digest()
+    def sign_data(self, data: bytes, version: int = None) -> bytes:
+        """
+        Sign data with the master key
+        
+        Uses the scheme chosen at construction (HMAC-SHA256 by default); pass
+        version to produce a signature for a specific scheme.
+        """
+        if version is None:
+            version = self.signature_version
+        
+        if version == self.SIGNATURE_BLAKE3:
+            if not BLAKE3_AVAILABLE:
+                raise ValueError("BLAKE3 signatures require the blake3 package")
+            return blake3.blake3(data, key=self.master_key).digest()
+        if version == self.SIGNATURE_HMAC_SHA256:
+            return hmac.new(self.master_key, data, hashlib.sha256).digest()
+        raise ValueError(f"Unsupported signature version: {version}")
     
-    def verify_signature(self, data: bytes, signature: bytes) -> bool:
-        """Verify HMAC signature"""
-        expected_signature = self.sign_data(data)
+    def verify_signature(self, data: bytes, signature: bytes, version: int = None) -> bool:
+        """Verify a signature made by sign_data with the same version"""
+        expected_signature = self.sign_data(data, version)
         return hmac.compare_digest(expected_signature, signature)
 
 
@@ -207,21 +359,33 @@ class NodeAuthentication:
         public_bytes = base64.b64decode(public_key_str.encode('utf-8'))
         return ed25519.Ed25519PublicKey.from_public_bytes(public_bytes)
     
+    @staticmethod
+    def sign_message_raw(private_key: ed25519.Ed25519PrivateKey, message: bytes) -> bytes:
+        """Sign a message and return the raw 64-byte signature"""
+        return private_key.sign(message)
+    
+    @staticmethod
+    def verify_signature_raw(public_key: ed25519.Ed25519PublicKey, message: bytes, signature: bytes) -> bool:
+        """Verify a raw signature"""
+        try:
+            public_key.verify(signature, message)
+            return True
+        except Exception:
+            return False
+    
     @staticmethod
     def sign_message(private_key: ed25519.Ed25519PrivateKey, message: bytes) -> str:
         """Sign a message and return base64 encoded signature"""
-        signature = private_key.sign(message)
-        return base64.b64encode(signature).decode('utf-8')
+        return base64.b64encode(private_key.sign(message)).decode('utf-8')
     
     @staticmethod
     def verify_signature(public_key: ed25519.Ed25519PublicKey, message: bytes, signature_str: str) -> bool:
-        """Verify a signature"""
+        """Verify a base64 encoded signature"""
         try:
-            signature = base64.b64decode(signature_str.encode('utf-8'))
-            public_key.verify(signature, message)
-            return True
+            signature = base64.b64decode(signature_str)
         except Exception:
             return False
+        return NodeAuthentication.verify_signature_raw(public_key, message, signature)
     
     @staticmethod
     def create_node_id(public_key: ed25519.Ed25519PublicKey) -> str:
@@ -233,16 +397,23 @@ class NodeAuthentication:
         hash_digest = hashlib.sha256(public_bytes).hexdigest()
         return f"PG{hash_digest[:40]}"  # PlayerGold prefix + 40 chars
     
+    @staticmethod
+    def registration_message(node_id: str, public_ip: str, port: int) -> bytes:
+        """Build the signed b"node_id:public_ip:port" registration message"""
+        return b"%b:%b:%d" % (node_id.encode('utf-8'), public_ip.encode('utf-8'), port)
+    
     def create_registration_signature(self, private_key: ed25519.Ed25519PrivateKey, 
                                     node_id: str, public_ip: str, port: int) -> str:
         """Create signature for node registration"""
-        message = f"{node_id}:{public_ip}:{port}".encode('utf-8')
-        return self.sign_message(private_key, message)
+        return self.sign_message(private_key, self.registration_message(node_id, public_ip, port))
     
     def verify_registration_signature(self, public_key: ed25519.Ed25519PublicKey,
-                                    node_id: str, public_ip: str, port: int, signature: str) -> bool:
-        """Verify node registration signature"""
-        message = f"{node_id}:{public_ip}:{port}".encode('utf-8')
+                                    node_id: str, public_ip: str, port: int,
+                                    signature: Union[str, bytes]) -> bool:
+        """Verify node registration signature, given base64 encoded or raw"""
+        message = self.registration_message(node_id, public_ip, port)
+        if isinstance(signature, bytes):
+            return self.verify_signature_raw(public_key, message, signature)
         return self.verify_signature(public_key, message, signature)
 
 
@@ -3,12 +3,14 @@ Fork Detector - Detects and resolves blockchain forks in the network
 """
 
 import asyncio
+import bisect
 import logging
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
-from collections import defaultdict
 import uuid
 
+import numpy as np
+
 from .models import NetworkNode, ForkDetection, NetworkConflict, NodeStatus
 from .registry import NodeRegistry
 
@@ -18,55 +20,112 @@ logger = logging.getLogger(__name__)
 class ForkDetector:
     """Detects and resolves blockchain forks"""
     
+    # Window of registry.get_active_nodes() at its default max_age_minutes
+    ACTIVE_NODE_WINDOW = timedelta(minutes=5)
+    
     def __init__(self, registry: NodeRegistry):
         self.registry = registry
         self.detected_forks: Dict[str, ForkDetection] = {}
+        # (detected_at, fork_id) in time order, so cleanup only visits expired entries
+        self._forks_by_time: List[Tuple[datetime, str]] = []
         self.fork_threshold = 2  # Minimum height difference to consider a fork
         self.resolution_timeout = 300  # 5 minutes to resolve forks
+        
+        # Results over the active node set, valid while the registry epoch is unchanged
+        self._memo: Dict[str, Tuple[datetime, object]] = {}
+        self._memo_epoch = None
+    
+    def _cached(self, key: str) -> Tuple[bool, object]:
+        """Return (hit, result) for a result computed over the current active node set"""
+        epoch = self.registry.epoch
+        if epoch != self._memo_epoch:
+            self._memo.clear()
+            self._memo_epoch = epoch
+            return False, None
+        
+        entry = self._memo.get(key)
+        if entry is None or datetime.utcnow() >= entry[0]:
+            return False, None
+        return True, entry[1]
+    
+    def _remember(self, key: str, active_nodes: List[NetworkNode], result):
+        """Store a result until the registry changes or its oldest active node ages out"""
+        if self.registry.epoch != self._memo_epoch:
+            return  # Registry changed while computing
+        
+        if active_nodes:
+            expires_at = min(node.last_keepalive for node in active_nodes) + self.ACTIVE_NODE_WINDOW
+        else:
+            expires_at = datetime.max
+        self._memo[key] = (expires_at, result)
+    
+    def _record_fork(self, fork: ForkDetection):
+        """Store a fork, indexing it by detection time the first time it is seen"""
+        if fork.fork_id not in self.detected_forks:
+            bisect.insort(self._forks_by_time, (fork.detected_at, fork.fork_id))
+        self.detected_forks[fork.fork_id] = fork
     
     async def detect_forks(self) -> List[ForkDetection]:
         """Detect potential blockchain forks in the network"""
         try:
+            hit, forks = self._cached('detect_forks')
+            if hit:
+                return list(forks)
+            
             active_nodes = self.registry.get_active_nodes()
             
             if len(active_nodes) < 2:
                 return []  # Need at least 2 nodes to detect forks
             
-            # Group nodes by blockchain height
-            height_groups = defaultdict(list)
-            for node in active_nodes:
-                height_groups[node.blockchain_height].append(node)
-            
-            # Find significant height differences
-            heights = sorted(height_groups.keys(), reverse=True)
+            # Group nodes by blockchain height in one vectorized pass
+            heights = np.fromiter((node.blockchain_height or 0 for node in active_nodes),
+                                  dtype=np.int64, count=len(active_nodes))
+            is_genesis = np.fromiter((bool(node.is_genesis) for node in active_nodes),
+                                     dtype=bool, count=len(active_nodes))
+            unique_heights, inverse = np.unique(heights, return_inverse=True)
             detected_forks = []
             
-            if len(heights) > 1:
-                max_height = heights[0]
+            if len(unique_heights) > 1:
+                genesis_counts = np.bincount(inverse, weights=is_genesis).astype(np.int64)
+                
+                # Node indices grouped by height, in original order within each group
+                order = np.argsort(inverse, kind='stable')
+                height_groups = np.split(order, np.cumsum(np.bincount(inverse))[:-1])
+                
+                max_group = len(unique_heights) - 1
+                higher_nodes = [active_nodes[i] for i in height_groups[max_group]]
                 
-                for height in heights[1:]:
-                    height_diff = max_height - height
-                    
-                    if height_diff >= self.fork_threshold:
-                        # Potential fork detected
-                        fork = await self._analyze_fork(height_groups[max_height], height_groups[height])
-                        if fork:
-                            detected_forks.append(fork)
-                            self.detected_forks[fork.fork_id] = fork
-            
-            return detected_forks
+                # Heights far enough behind the tip, highest first
+                lagging = np.flatnonzero(unique_heights[max_group] - unique_heights >= self.fork_threshold)
+                for group in lagging[::-1]:
+                    # Potential fork detected
+                    lower_nodes = [active_nodes[i] for i in height_groups[group]]
+                    fork = await self._analyze_fork(
+                        higher_nodes, lower_nodes,
+                        (int(genesis_counts[max_group]), int(genesis_counts[group]))
+                    )
+                    if fork:
+                        detected_forks.append(fork)
+                        self._record_fork(fork)
+            
+            self._remember('detect_forks', active_nodes, detected_forks)
+            return list(detected_forks)
             
         except Exception as e:
             logger.error(f"Fork detection failed: {e}")
             return []
     
     async def _analyze_fork(self, higher_nodes: List[NetworkNode], 
-                           lower_nodes: List[NetworkNode]) -> Optional[ForkDetection]:
+                           lower_nodes: List[NetworkNode],
+                           genesis_counts: Optional[Tuple[int, int]] = None) -> Optional[ForkDetection]:
         """Analyze a potential fork between two groups of nodes"""
         try:
-            # Count genesis nodes in each group
-            higher_genesis = sum(1 for node in higher_nodes if node.is_genesis)
-            lower_genesis = sum(1 for node in lower_nodes if node.is_genesis)
+            # Count genesis nodes in each group unless the caller already has
+            if genesis_counts is not None:
+                higher_genesis, lower_genesis = genesis_counts
+            else:
+                higher_genesis = sum(1 for node in higher_nodes if node.is_genesis)
+                lower_genesis = sum(1 for node in lower_nodes if node.is_genesis)
             
             # Determine canonical chain based on rules:
             # 1. More genesis nodes
@@ -144,7 +203,7 @@ class ForkDetector:
             
             # Update fork status
             fork.resolution_status = "resolved"
-            self.detected_forks[fork.fork_id] = fork
+            self._record_fork(fork)
             
             logger.info(f"Fork {fork.fork_id} resolved: canonical chain is {fork.canonical_chain}")
             
@@ -158,26 +217,33 @@ class ForkDetector:
     async def detect_network_partitions(self) -> List[NetworkConflict]:
         """Detect network partitions based on node connectivity"""
         try:
+            hit, conflicts = self._cached('detect_network_partitions')
+            if hit:
+                return list(conflicts)
+            
             active_nodes = self.registry.get_active_nodes()
             conflicts = []
             
             # Group nodes by connected peers count
             low_connectivity_nodes = [node for node in active_nodes if node.connected_peers < 2]
+            low_count = len(low_connectivity_nodes)
+            node_count = len(active_nodes)
             
-            if len(low_connectivity_nodes) > len(active_nodes) * 0.3:  # More than 30% have low connectivity
+            if low_count > node_count * 0.3:  # More than 30% have low connectivity
                 conflict = NetworkConflict(
                     conflict_id=str(uuid.uuid4()),
                     conflict_type="partition",
                     detected_at=datetime.utcnow(),
                     affected_nodes=[node.node_id for node in low_connectivity_nodes],
-                    severity="high" if len(low_connectivity_nodes) > len(active_nodes) * 0.5 else "medium",
+                    severity="high" if low_count > node_count * 0.5 else "medium",
                     auto_resolvable=False
                 )
                 conflicts.append(conflict)
                 
-                logger.warning(f"Network partition detected: {len(low_connectivity_nodes)} nodes with low connectivity")
+                logger.warning(f"Network partition detected: {low_count} nodes with low connectivity")
             
-            return conflicts
+            self._remember('detect_network_partitions', active_nodes, conflicts)
+            return list(conflicts)
             
         except Exception as e:
             logger.error(f"Partition detection failed: {e}")
@@ -190,15 +256,23 @@ class ForkDetector:
             if not node:
                 return False
             
-            # Get consensus height from active nodes
-            active_nodes = self.registry.get_active_nodes()
-            if not active_nodes:
+            # Get consensus height from active nodes, shared by every node checked
+            hit, consensus_height = self._cached('consensus_height')
+            if not hit:
+                active_nodes = self.registry.get_active_nodes()
+                if active_nodes:
+                    # Calculate consensus height (median of active nodes); partition is O(N)
+                    heights = np.fromiter((n.blockchain_height or 0 for n in active_nodes),
+                                          dtype=np.int64, count=len(active_nodes))
+                    middle = len(heights) // 2
+                    consensus_height = int(np.partition(heights, middle)[middle])
+                else:
+                    consensus_height = None
+                self._remember('consensus_height', active_nodes, consensus_height)
+            
+            if consensus_height is None:
                 return True  # No other nodes to compare with
             
-            # Calculate consensus height (median of active nodes)
-            heights = sorted([n.blockchain_height for n in active_nodes])
-            consensus_height = heights[len(heights) // 2]
-            
             # Allow some tolerance for sync delays
             height_tolerance = 5
             
@@ -215,28 +289,38 @@ class ForkDetector:
     async def handle_isolated_nodes(self) -> int:
         """Handle nodes that appear to be isolated from the network"""
         try:
-            active_nodes = self.registry.get_active_nodes()
-            isolated_count = 0
-            
-            for node in active_nodes:
-                # Consider a node isolated if it has no peers and old blockchain height
-                if node.connected_peers == 0:
-                    # Check if it's significantly behind
-                    other_nodes = [n for n in active_nodes if n.node_id != node.node_id]
-                    if other_nodes:
-                        avg_height = sum(n.blockchain_height for n in other_nodes) / len(other_nodes)
-                        
-                        if node.blockchain_height < avg_height - 10:  # More than 10 blocks behind
-                            # Mark as needing assistance
-                            logger.info(f"Isolated node detected: {node.node_id} (height: {node.blockchain_height}, avg: {avg_height:.1f})")
-                            isolated_count += 1
+            # Which nodes are isolated is a pure query and can be memoized; handling them cannot
+            hit, isolated_nodes = self._cached('isolated_nodes')
+            if not hit:
+                active_nodes = self.registry.get_active_nodes()
+                isolated_nodes = []
+                
+                # The others' average is the total minus the node itself, so one sum suffices
+                node_count = len(active_nodes)
+                total_height = sum(n.blockchain_height for n in active_nodes)
+                
+                for node in active_nodes:
+                    # Consider a node isolated if it has no peers and old blockchain height
+                    if node.connected_peers == 0:
+                        # Check if it's significantly behind
+                        if node_count > 1:
+                            avg_height = (total_height - node.blockchain_height) / (node_count - 1)
                             
-                            # In a real implementation, we would:
-                            # 1. Provide bootstrap peers
-                            # 2. Offer sync assistance
-                            # 3. Monitor recovery progress
+                            if node.blockchain_height < avg_height - 10:  # More than 10 blocks behind
+                                isolated_nodes.append((node, avg_height))
+                
+                self._remember('isolated_nodes', active_nodes, isolated_nodes)
+            
+            for node, avg_height in isolated_nodes:
+                # Mark as needing assistance
+                logger.info(f"Isolated node detected: {node.node_id} (height: {node.blockchain_height}, avg: {avg_height:.1f})")
+                
+                # In a real implementation, we would:
+                # 1. Provide bootstrap peers
+                # 2. Offer sync assistance
+                # 3. Monitor recovery progress
             
-            return isolated_count
+            return len(isolated_nodes)
             
         except Exception as e:
             logger.error(f"Isolated node handling failed: {e}")
@@ -274,15 +358,19 @@ class ForkDetector:
             cutoff_time = datetime.utcnow() - timedelta(days=days_old)
             removed_count = 0
             
-            fork_ids_to_remove = []
-            for fork_id, fork in self.detected_forks.items():
-                if (fork.resolution_status in ["resolved", "failed"] and 
-                    fork.detected_at < cutoff_time):
-                    fork_ids_to_remove.append(fork_id)
-            
-            for fork_id in fork_ids_to_remove:
-                del self.detected_forks[fork_id]
-                removed_count += 1
+            # Only the prefix detected before the cutoff can expire; pending forks stay indexed
+            expired_end = bisect.bisect_left(self._forks_by_time, (cutoff_time,))
+            still_indexed = []
+            for detected_at, fork_id in self._forks_by_time[:expired_end]:
+                fork = self.detected_forks.get(fork_id)
+                if fork is None:
+                    continue
+                if fork.resolution_status in ["resolved", "failed"]:
+                    del self.detected_forks[fork_id]
+                    removed_count += 1
+                else:
+                    still_indexed.append((detected_at, fork_id))
+            self._forks_by_time[:expired_end] = still_indexed
             
             if removed_count > 0:
                 logger.info(f"Cleaned up {removed_count} old fork records")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Network Coordinator Keepalive Buffer
+
+Coalesces node keepalives in memory and writes them to the database in batches
+"""
+
+import logging
+import threading
+from typing import Callable, Dict
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm import Session
+
+from .models import NetworkNode
+
+logger = logging.getLogger(__name__)
+
+# Keyed by primary key; a separate name keeps it apart from the SET columns
+_UPDATE_KEEPALIVE = (
+    update(NetworkNode.__table__)
+    .where(NetworkNode.__table__.c.id == bindparam('node_pk'))
+)
+
+
+class KeepaliveBuffer:
+    """
+    Buffers keepalive updates per node and flushes them in a single transaction
+    
+    Keepalives from the same node between flushes collapse into the latest one,
+    so the database sees at most one write per node per flush instead of one
+    commit per request.
+    """
+    
+    def __init__(self, session_factory: Callable[[], Session]):
+        self.session_factory = session_factory
+        self._pending: Dict[int, dict] = {}
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._pending)
+    
+    def add(self, node_pk: int, values: dict):
+        """Queue column values for the node with primary key node_pk"""
+        with self._lock:
+            self._pending[node_pk] = values
+    
+    def flush(self) -> int:
+        """Write all pending updates, returning the number of nodes updated"""
+        with self._lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, {}
+        
+        db = self.session_factory()
+        try:
+            # Core executemany: rows deleted in the meantime are skipped rather than failing the batch
+            db.execute(_UPDATE_KEEPALIVE, [
+                {'node_pk': node_pk, **values} for node_pk, values in batch.items()
+            ])
+            db.commit()
+        except Exception as e:
+            logger.error(f"❌ Keepalive flush failed for {len(batch)} nodes: {e}")
+            db.rollback()
+            # Retry next flush unless a newer keepalive has arrived meanwhile
+            with self._lock:
+                for node_pk, values in batch.items():
+                    self._pending.setdefault(node_pk, values)
+            return 0
+        finally:
+            db.close()
+        
+        logger.debug(f"✅ Flushed keepalives for {len(batch)} nodes")
+        return len(batch)
@@ -5,7 +5,7 @@ Network Coordinator Database Models
 Fixed version that properly handles node registration and genesis node detection
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, Enum
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, Enum, Index, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 from enum import Enum as PyEnum
@@ -23,6 +23,10 @@ class NodeType(PyEnum):
     LIGHT = "light"
 
 
+# Lookup for registration node_type strings; unknown types default to genesis
+NODE_TYPE_BY_NAME = {node_type.value: node_type for node_type in NodeType}
+
+
 class NodeStatus(PyEnum):
     """Node status enumeration"""
     ACTIVE = "active"
@@ -68,33 +72,69 @@ class NetworkNode(Base):
     ai_model_loaded = Column(Boolean, default=False)
     mining_active = Column(Boolean, default=False)
     
+    __table_args__ = (
+        # Serves the active-node scan of the network map together with its latitude box
+        Index('ix_network_nodes_status_last_seen_latitude', 'status', 'last_seen', 'latitude'),
+    )
+    
     def __repr__(self):
         return f"<NetworkNode(node_id='{self.node_id}', type='{self.node_type}', genesis={self.is_genesis})>"
     
-    def to_dict(self):
-        """Convert to dictionary for JSON serialization"""
+    def to_dict(self, iso_datetimes: bool = True):
+        """
+        Convert to dictionary for JSON serialization
+        
+        The serialized dict is cached on the instance and dropped whenever a
+        serialized column is set, expired or refreshed; callers get a copy.
+        """
+        # Reading the timestamps also reloads them if the session expired them
+        key = (self.updated_at, self.last_seen, iso_datetimes)
+        cached = self.__dict__.get('_cached_dict')
+        if cached is not None and cached[0] == key:
+            return dict(cached[1])
+        
+        node_dict = self.serialize(self, iso_datetimes)
+        # Plain instance attribute: not a mapped column, so the session ignores it
+        self._cached_dict = (key, node_dict)
+        return dict(node_dict)
+    
+    @staticmethod
+    def serialize(node, iso_datetimes: bool = True):
+        """
+        Convert a node to dictionary for JSON serialization
+        Accepts a NetworkNode or a row selected with NODE_DICT_COLUMNS
+        
+        With iso_datetimes=False the timestamps are left as datetime objects for
+        encoders such as orjson that format them natively.
+        """
+        created_at, updated_at, last_seen = node.created_at, node.updated_at, node.last_seen
+        if iso_datetimes:
+            created_at = created_at.isoformat() if created_at else None
+            updated_at = updated_at.isoformat() if updated_at else None
+            last_seen = last_seen.isoformat() if last_seen else None
+        
         return {
-            'id': self.id,
-            'node_id': self.node_id,
-            'ip': self.public_ip,
-            'port': self.port,
-            'latitude': self.latitude,
-            'longitude': self.longitude,
-            'os_info': self.os_info,
-            'node_type': self.node_type.value if self.node_type else 'unknown',
-            'is_genesis': self.is_genesis,
-            'public_key': self.public_key,
-            'status': self.status.value if self.status else 'unknown',
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'last_seen': self.last_seen.isoformat() if self.last_seen else None,
-            'blockchain_height': self.blockchain_height,
-            'connected_peers': self.connected_peers,
-            'cpu_usage': self.cpu_usage,
-            'memory_usage': self.memory_usage,
-            'network_latency': self.network_latency,
-            'ai_model_loaded': self.ai_model_loaded,
-            'mining_active': self.mining_active
+            'id': node.id,
+            'node_id': node.node_id,
+            'ip': node.public_ip,
+            'port': node.port,
+            'latitude': node.latitude,
+            'longitude': node.longitude,
+            'os_info': node.os_info,
+            'node_type': node.node_type.value if node.node_type else 'unknown',
+            'is_genesis': node.is_genesis,
+            'public_key': node.public_key,
+            'status': node.status.value if node.status else 'unknown',
+            'created_at': created_at,
+            'updated_at': updated_at,
+            'last_seen': last_seen,
+            'blockchain_height': node.blockchain_height,
+            'connected_peers': node.connected_peers,
+            'cpu_usage': node.cpu_usage,
+            'memory_usage': node.memory_usage,
+            'network_latency': node.network_latency,
+            'ai_model_loaded': node.ai_model_loaded,
+            'mining_active': node.mining_active
         }
     
     @classmethod
@@ -102,19 +142,7 @@ class NetworkNode(Base):
         """Create NetworkNode from registration data with proper type handling"""
         # FIXED: Properly handle node_type conversion
         node_type_str = data.get('node_type', 'genesis').lower()
-        
-        # Map string to enum
-        node_type = NodeType.GENESIS  # Default
-        if node_type_str == 'genesis':
-            node_type = NodeType.GENESIS
-        elif node_type_str == 'validator':
-            node_type = NodeType.VALIDATOR
-        elif node_type_str == 'miner':
-            node_type = NodeType.MINER
-        elif node_type_str == 'relay':
-            node_type = NodeType.RELAY
-        elif node_type_str == 'light':
-            node_type = NodeType.LIGHT
+        node_type = NODE_TYPE_BY_NAME.get(node_type_str, NodeType.GENESIS)
         
         # FIXED: Set is_genesis based on node_type
         is_genesis = (node_type == NodeType.GENESIS)
@@ -133,14 +161,44 @@ class NetworkNode(Base):
             status=NodeStatus.ACTIVE
         )
     
+    @staticmethod
+    def keepalive_values(data):
+        """Column values applied by a keepalive"""
+        return {
+            'blockchain_height': data.get('blockchain_height', 0),
+            'connected_peers': data.get('connected_peers', 0),
+            'cpu_usage': data.get('cpu_usage', 0.0),
+            'memory_usage': data.get('memory_usage', 0.0),
+            'network_latency': data.get('network_latency', 0.0),
+            'ai_model_loaded': data.get('ai_model_loaded', False),
+            'mining_active': data.get('mining_active', False),
+            'status': NodeStatus.ACTIVE
+        }
+    
     def update_keepalive(self, data):
         """Update node with keepalive data"""
-        self.blockchain_height = data.get('blockchain_height', 0)
-        self.connected_peers = data.get('connected_peers', 0)
-        self.cpu_usage = data.get('cpu_usage', 0.0)
-        self.memory_usage = data.get('memory_usage', 0.0)
-        self.network_latency = data.get('network_latency', 0.0)
-        self.ai_model_loaded = data.get('ai_model_loaded', False)
-        self.mining_active = data.get('mining_active', False)
-        self.status = NodeStatus.ACTIVE
-        # last_seen will be updated automatically by onupdate=func.now()
\ No newline at end of file
+        for column, value in self.keepalive_values(data).items():
+            setattr(self, column, value)
+        # last_seen will be updated automatically by onupdate=func.now()
+
+
+# Columns read by NetworkNode.serialize, for selecting rows without ORM hydration
+NODE_DICT_COLUMNS = tuple(
+    getattr(NetworkNode, name) for name in (
+        'id', 'node_id', 'public_ip', 'port', 'latitude', 'longitude', 'os_info',
+        'node_type', 'is_genesis', 'public_key', 'status', 'created_at', 'updated_at',
+        'last_seen', 'blockchain_height', 'connected_peers', 'cpu_usage', 'memory_usage',
+        'network_latency', 'ai_model_loaded', 'mining_active'
+    )
+)
+
+
+def _drop_cached_dict(target, *args):
+    """Invalidate the to_dict cache when a serialized column changes"""
+    target.__dict__.pop('_cached_dict', None)
+
+
+for _column in NODE_DICT_COLUMNS:
+    event.listen(_column, 'set', _drop_cached_dict)
+for _event_name in ('expire', 'refresh', 'refresh_flush'):
+    event.listen(NetworkNode, _event_name, _drop_cached_dict)
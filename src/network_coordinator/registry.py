@@ -21,8 +21,19 @@ class NodeRegistry:
     def __init__(self, db_path: str = "network_nodes.db", encryption: NetworkEncryption = None):
         self.db_path = db_path
         self.encryption = encryption or NetworkEncryption()
+        # Bumped on every committed mutation so readers can tell when cached results are stale
+        self._registry_epoch = 0
         self._init_database()
     
+    @property
+    def epoch(self) -> int:
+        """Counter that changes whenever the registry contents change"""
+        return self._registry_epoch
+    
+    def _bump_epoch(self):
+        """Record that the registry contents changed"""
+        self._registry_epoch += 1
+    
     def _init_database(self):
         """Initialize the database schema"""
         with self._get_connection() as conn:
@@ -119,6 +130,7 @@ class NodeRegistry:
                     logger.info(f"Added new node {node.node_id}")
                 
                 conn.commit()
+                self._bump_epoch()
                 
             return True
             
@@ -149,6 +161,7 @@ class NodeRegistry:
                 conn.commit()
                 
                 if cursor.rowcount > 0:
+                    self._bump_epoch()
                     logger.debug(f"Updated status for node {node_id} to {status.value}")
                     return True
                 else:
@@ -214,6 +227,7 @@ class NodeRegistry:
                     new_node_data.status.value, public_key, node_id
                 ))
                 conn.commit()
+                self._bump_epoch()
                 
                 logger.info(f"Updated existing node {node_id} with new data")
                 return True
@@ -293,6 +307,7 @@ class NodeRegistry:
                 
                 inactive_count = cursor.rowcount
                 if inactive_count > 0:
+                    self._bump_epoch()
                     logger.info(f"Marked {inactive_count} nodes as inactive")
                 
                 return inactive_count
@@ -359,6 +374,7 @@ class NodeRegistry:
                 conn.commit()
                 
                 if cursor.rowcount > 0:
+                    self._bump_epoch()
                     logger.info(f"Removed node {node_id} from registry")
                     return True
                 else:
@@ -410,6 +426,7 @@ class NodeRegistry:
                 
                 removed_count = cursor.rowcount
                 if removed_count > 0:
+                    self._bump_epoch()
                     logger.info(f"Cleaned up {removed_count} old inactive nodes")
                 
                 return removed_count
@@ -454,6 +471,7 @@ class NodeRegistry:
                 conn.commit()
                 
                 if removed_count > 0:
+                    self._bump_epoch()
                     logger.info(f"Cleaned up {removed_count} duplicate IP nodes")
                 
                 return removed_count
@@ -8,10 +8,15 @@ Helper functions for the network coordinator
 import math
 import re
 import logging
-from typing import Optional
+from typing import Optional, Tuple
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Accepts PlayerGold-Wallet/x.y.z (optionally "(Electron)") and PlayerGold-Node/x.y.z
+_USER_AGENT_PATTERN = re.compile(r"PlayerGold-(?:Wallet|Node)/\d+\.\d+\.\d+")
+
 
 def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
@@ -33,6 +38,41 @@ def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     return c * r
 
 
+def calculate_distances(lat: float, lon: float, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """
+    Calculate great circle distances from one point to many points at once
+    Returns distances in kilometers; NaN coordinates yield NaN distances
+    """
+    lat1, lon1 = math.radians(lat), math.radians(lon)
+    lat2, lon2 = np.radians(latitudes), np.radians(longitudes)
+    
+    # Haversine formula, vectorised over the second point
+    a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    
+    return 2 * 6371 * np.arcsin(np.sqrt(a))
+
+
+def bounding_box(lat: float, lon: float, distance_km: float) -> Tuple[float, float, Optional[float], Optional[float]]:
+    """
+    Get a latitude/longitude box containing every point within distance_km
+    Returns (min_lat, max_lat, min_lon, max_lon); the longitude bounds are None
+    when the box spans a pole or the antimeridian and cannot prune longitudes
+    """
+    angular = distance_km / 6371
+    min_lat = lat - math.degrees(angular)
+    max_lat = lat + math.degrees(angular)
+    
+    if min_lat <= -90 or max_lat >= 90:
+        return max(min_lat, -90.0), min(max_lat, 90.0), None, None
+    
+    # Widest longitude offset reached on the circle, not at the centre latitude
+    delta_lon = math.degrees(math.asin(math.sin(angular) / math.cos(math.radians(lat))))
+    if lon - delta_lon < -180 or lon + delta_lon > 180:
+        return min_lat, max_lat, None, None
+    
+    return min_lat, max_lat, lon - delta_lon, lon + delta_lon
+
+
 def validate_user_agent(user_agent: Optional[str]) -> bool:
     """
     Validate User-Agent header for PlayerGold wallet access
@@ -40,16 +80,9 @@ def validate_user_agent(user_agent: Optional[str]) -> bool:
     if not user_agent:
         return False
     
-    # Check for PlayerGold wallet User-Agent
-    valid_patterns = [
-        r"PlayerGold-Wallet/\d+\.\d+\.\d+",
-        r"PlayerGold-Wallet/\d+\.\d+\.\d+ \(Electron\)",
-        r"PlayerGold-Node/\d+\.\d+\.\d+",
-    ]
-    
-    for pattern in valid_patterns:
-        if re.search(pattern, user_agent):
-            return True
+    # Check for PlayerGold wallet or node User-Agent
+    if _USER_AGENT_PATTERN.search(user_agent):
+        return True
     
     logger.warning(f"Invalid User-Agent: {user_agent}")
     return False
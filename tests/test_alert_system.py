@@ -3,12 +3,22 @@ Tests for Alert System
 """
 
 import pytest
+import json
+import asyncio
+import random
+import sched
+import sys
+import statistics
+import threading
 import time
+from src.monitoring import alert_system as alert_system_module
 from src.monitoring.alert_system import (
     AlertSystem, AlertType, AlertSeverity,
-    ConsoleAlertHandler, FileAlertHandler,
-    AnomalyDetector, create_alert_system
+    AlertHandler, ConsoleAlertHandler, FileAlertHandler, BinaryFileAlertHandler,
+    WebhookAlertHandler,
+    AnomalyDetector, HEALTH_SAMPLE_DTYPE, create_alert_system, read_alerts
 )
+import numpy as np
 import tempfile
 import os
 
@@ -40,6 +50,22 @@ def test_create_alert(alert_system):
     assert alert.alert_id.startswith("ALERT-")
 
 
+def test_alert_caches_enum_values(alert_system):
+    """Test alerts carry their type and severity strings for serialization"""
+    alert = alert_system.create_alert(AlertType.LOW_TPS, AlertSeverity.ERROR, "Low TPS")
+    
+    assert alert.type_str == "low_tps"
+    assert alert.severity_str == "error"
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need Python 3.10")
+def test_alert_is_slotted(alert_system):
+    """Test alerts don't carry a per-instance __dict__"""
+    alert = alert_system.create_alert(AlertType.LOW_TPS, AlertSeverity.WARNING, "Low TPS")
+    
+    assert not hasattr(alert, '__dict__')
+
+
 def test_resolve_alert(alert_system):
     """Test resolving an alert"""
     alert = alert_system.create_alert(
@@ -127,6 +153,9 @@ def test_console_alert_handler(alert_system, capsys):
         "Test console alert"
     )
     
+    # Handlers run on the dispatcher thread
+    alert_system.flush()
+    
     captured = capsys.readouterr()
     assert "WARNING" in captured.out
     assert "Test console alert" in captured.out
@@ -147,11 +176,131 @@ def test_file_alert_handler(alert_system):
             "Test file alert"
         )
         
+        # Delivery and writes happen on background threads
+        alert_system.flush()
+        
         # Read the file
         with open(filepath, 'r') as f:
             content = f.read()
             assert "Test file alert" in content
             assert "node_failure" in content
+        
+        handler.close()
+    finally:
+        os.unlink(filepath)
+
+
+def test_file_alert_handler_batches(alert_system):
+    """Test queued file alerts are all written, in order, by close()"""
+    with tempfile.NamedTemporaryFile(mode='w', delete=False) as f:
+        filepath = f.name
+    
+    try:
+        handler = FileAlertHandler(filepath)
+        alert_system.add_handler(handler)
+        
+        for i in range(200):
+            alert_system.create_alert(AlertType.LOW_TPS, AlertSeverity.WARNING, f"Alert {i}")
+        
+        alert_system.flush()
+        handler.close()
+        handler.close()
+        
+        with open(filepath, 'r') as f:
+            messages = [json.loads(line)['message'] for line in f]
+        
+        assert messages == [f"Alert {i}" for i in range(200)]
+    finally:
+        os.unlink(filepath)
+
+
+def test_file_alert_handler_json_lines(alert_system):
+    """Test file alerts are written as complete JSON records"""
+    with tempfile.NamedTemporaryFile(mode='w', delete=False) as f:
+        filepath = f.name
+    
+    try:
+        handler = FileAlertHandler(filepath)
+        alert_system.add_handler(handler)
+        
+        alert = alert_system.create_alert(
+            AlertType.SUSPICIOUS_ACTIVITY, AlertSeverity.ERROR, 'Quote " and \\ slash', {'node_id': 'node1'}
+        )
+        
+        alert_system.flush()
+        handler.close()
+        
+        with open(filepath, 'r') as f:
+            record = json.loads(f.readline())
+        
+        assert record == {
+            'alert_id': alert.alert_id,
+            'type': 'suspicious_activity',
+            'severity': 'error',
+            'message': 'Quote " and \\ slash',
+            'timestamp': alert.timestamp,
+            'details': {'node_id': 'node1'},
+            'resolved': False
+        }
+    finally:
+        os.unlink(filepath)
+
+
+def test_webhook_alert_handler_payload(alert_system, monkeypatch):
+    """Test webhook alerts post a JSON body through the shared session"""
+    posts = []
+    
+    class FakeSession:
+        def post(self, url, **kwargs):
+            posts.append((url, kwargs))
+    
+    monkeypatch.setattr(alert_system_module, '_webhook_session', FakeSession())
+    alert_system.add_handler(WebhookAlertHandler("https://example.com/hook"))
+    
+    alert = alert_system.create_alert(AlertType.LOW_TPS, AlertSeverity.WARNING, "Low TPS", {'tps': 3.5})
+    alert_system.flush()
+    
+    url, kwargs = posts[0]
+    
+    assert url == "https://example.com/hook"
+    assert kwargs['headers'] == {'Content-Type': 'application/json'}
+    assert json.loads(kwargs['data']) == {
+        'alert_id': alert.alert_id,
+        'type': 'low_tps',
+        'severity': 'warning',
+        'message': "Low TPS",
+        'timestamp': alert.timestamp,
+        'details': {'tps': 3.5}
+    }
+
+
+def test_binary_file_alert_handler(alert_system):
+    """Test binary alert records round-trip through read_alerts"""
+    with tempfile.NamedTemporaryFile(mode='w', delete=False) as f:
+        filepath = f.name
+    
+    try:
+        handler = BinaryFileAlertHandler(filepath)
+        alert_system.add_handler(handler)
+        
+        first = alert_system.create_alert(
+            AlertType.NODE_FAILURE, AlertSeverity.CRITICAL, "Nodes down: café", {'nodes': 3}
+        )
+        second = alert_system.create_alert(AlertType.LOW_TPS, AlertSeverity.WARNING, "Low TPS")
+        
+        alert_system.flush()
+        handler.close()
+        
+        records = list(read_alerts(filepath))
+        
+        assert records == [
+            {'alert_id': first.alert_id, 'type': 'node_failure', 'severity': 'critical',
+             'message': "Nodes down: café", 'timestamp': first.timestamp,
+             'details': {'nodes': 3}, 'resolved': False},
+            {'alert_id': second.alert_id, 'type': 'low_tps', 'severity': 'warning',
+             'message': "Low TPS", 'timestamp': second.timestamp,
+             'details': {}, 'resolved': False}
+        ]
     finally:
         os.unlink(filepath)
 
@@ -175,6 +324,108 @@ def test_anomaly_detector_tps(anomaly_detector):
     assert anomaly['deviation'] > 2.0
 
 
+def test_anomaly_detector_tracks_sliding_window(anomaly_detector):
+    """Test running moments match a full recomputation over the window"""
+    rng = random.Random(42)
+    for i in range(75):
+        anomaly_detector.add_sample(tps=rng.uniform(50, 150), latency=rng.uniform(10, 100), node_count=10)
+    
+    window = list(anomaly_detector.tps_history)
+    anomaly = anomaly_detector.detect_tps_anomaly(threshold_std=0.0)
+    
+    assert anomaly['mean'] == pytest.approx(statistics.mean(window))
+    assert anomaly['stdev'] == pytest.approx(statistics.stdev(window))
+    
+    anomaly_detector.add_sample(tps=100.0, latency=5000, node_count=10)
+    latency = anomaly_detector.detect_latency_anomaly()
+    
+    assert latency['average'] == pytest.approx(statistics.mean(anomaly_detector.latency_history))
+
+
+def test_anomaly_detector_window_moments_do_not_drift(anomaly_detector):
+    """Test the sliding-window stdev stays exact after the data level shifts"""
+    rng = random.Random(1)
+    for i in range(20000):
+        level = 1e9 if (i // 5000) % 2 == 0 else 1.0
+        anomaly_detector.add_sample(tps=level + rng.uniform(0, 1), latency=50, node_count=10)
+    
+    window = list(anomaly_detector.tps_history)
+    anomaly = anomaly_detector.detect_tps_anomaly(threshold_std=0.0)
+    
+    assert anomaly['mean'] == pytest.approx(statistics.mean(window))
+    assert anomaly['stdev'] == pytest.approx(statistics.stdev(window), rel=1e-6)
+
+
+def test_anomaly_detector_history_wraps(anomaly_detector):
+    """Test the ring buffers return the last window of samples in order"""
+    for i in range(45):
+        anomaly_detector.add_sample(tps=float(i), latency=float(i), node_count=i)
+    
+    assert list(anomaly_detector.tps_history) == [float(i) for i in range(25, 45)]
+    assert list(anomaly_detector.node_count_history) == list(range(25, 45))
+    
+    # Baseline is the mean of the last 10 samples, including the current one
+    anomaly_detector.add_sample(tps=1.0, latency=1.0, node_count=1)
+    failure = anomaly_detector.detect_node_failure()
+    
+    assert failure['current'] == 1
+    assert failure['recent_average'] == pytest.approx(sum(range(36, 45), 1) / 10)
+
+
+def test_anomaly_detector_ewma():
+    """Test the exponentially weighted TPS estimator flags outliers"""
+    detector = AnomalyDetector(window_size=20, ewma=True)
+    rng = random.Random(3)
+    
+    for i in range(50):
+        detector.add_sample(tps=rng.uniform(95, 105), latency=50, node_count=10)
+    
+    detector.add_sample(tps=102.0, latency=50, node_count=10)
+    assert detector.detect_tps_anomaly() is None
+    
+    detector.add_sample(tps=500.0, latency=50, node_count=10)
+    anomaly = detector.detect_tps_anomaly()
+    
+    assert anomaly['current'] == 500.0
+    assert anomaly['mean'] == pytest.approx(100, abs=3)
+    assert anomaly['deviation'] > 2.0
+
+
+def test_anomaly_detector_ewma_batch_matches_samples():
+    """Test batch ingestion produces the same EWMA state as per-sample ingestion"""
+    rng = random.Random(5)
+    rows = [(rng.uniform(50, 150), rng.uniform(10, 100), 10) for _ in range(60)]
+    samples = np.array(rows, dtype=HEALTH_SAMPLE_DTYPE)
+    
+    single = AnomalyDetector(window_size=20, ewma=True)
+    for tps, latency, nodes in rows:
+        single.add_sample(tps, latency, nodes)
+    
+    batched = AnomalyDetector(window_size=20, ewma=True)
+    batched.add_samples(samples['tps'][:25], samples['latency'][:25], samples['active_nodes'][:25])
+    batched.add_samples(samples['tps'][25:], samples['latency'][25:], samples['active_nodes'][25:])
+    
+    expected = single.detect_tps_anomaly(threshold_std=0.0)
+    actual = batched.detect_tps_anomaly(threshold_std=0.0)
+    
+    assert actual['mean'] == pytest.approx(expected['mean'])
+    assert actual['stdev'] == pytest.approx(expected['stdev'])
+
+
+def test_anomaly_detector_node_baseline_wraps():
+    """Test the node baseline is the last ten samples wherever the ring buffer head is"""
+    detector = AnomalyDetector(window_size=16)
+    counts = []
+    
+    for i in range(40):
+        counts.append(10 + i % 7)
+        detector.add_sample(tps=100.0, latency=50, node_count=counts[-1])
+        failure = detector.detect_node_failure(threshold_drop=-1.0)
+        
+        if len(counts) >= 10:
+            assert failure['recent_average'] == pytest.approx(sum(counts[-10:]) / 10)
+
+
 def test_anomaly_detector_latency(anomaly_detector):
     """Test latency anomaly detection"""
     # Add normal samples
@@ -213,6 +464,30 @@ def test_anomaly_detector_node_failure(anomaly_detector):
     assert failure['drop_percentage'] > 30
 
 
+def test_dispatch_does_not_block_on_slow_handlers(alert_system):
+    """Test alert creation returns before slow handlers finish"""
+    release = threading.Event()
+    delivered = []
+    
+    class SlowHandler(AlertHandler):
+        def handle(self, alert):
+            release.wait(timeout=5)
+            delivered.append(alert.alert_id)
+    
+    alert_system.add_handler(SlowHandler())
+    
+    alerts = [
+        alert_system.create_alert(AlertType.LOW_TPS, AlertSeverity.WARNING, f"Alert {i}")
+        for i in range(3)
+    ]
+    assert delivered == []
+    
+    release.set()
+    alert_system.flush()
+    
+    assert delivered == [a.alert_id for a in alerts]
+
+
 def test_check_network_health(alert_system):
     """Test network health checking"""
     metrics = {
@@ -232,6 +507,80 @@ def test_check_network_health(alert_system):
     assert AlertType.HIGH_LATENCY in alert_types
 
 
+def test_rules_map_to_thresholds(alert_system):
+    """Test the rules dict reads and updates the threshold attributes"""
+    assert alert_system.rules['high_latency_threshold'] == 2000
+    
+    alert_system.rules = {'high_latency_threshold': 5000}
+    alert_system.check_network_health({'tps': 100, 'latency': 2500, 'active_nodes': 10})
+    
+    assert alert_system.high_latency_threshold == 5000
+    assert alert_system.get_active_alerts(AlertSeverity.WARNING) == []
+    
+    with pytest.raises(KeyError):
+        alert_system.rules = {'unknown_threshold': 1}
+
+
+def test_check_network_health_batch(alert_system):
+    """Test batch health checks flag the same samples as per-sample checks"""
+    rng = random.Random(7)
+    rows = [(rng.uniform(5, 50), rng.uniform(100, 3000), 10) for _ in range(150)]
+    samples = np.array(rows, dtype=HEALTH_SAMPLE_DTYPE)
+    
+    reference = AlertSystem()
+    for tps, latency, nodes in rows:
+        reference.check_network_health({'tps': tps, 'latency': latency, 'active_nodes': nodes})
+    
+    alert_system.check_network_health_batch(samples)
+    
+    def threshold_alerts(system, alert_type):
+        return [a.details for a in system.alerts
+                if a.alert_type == alert_type and a.severity == AlertSeverity.WARNING]
+    
+    assert threshold_alerts(alert_system, AlertType.LOW_TPS) == threshold_alerts(reference, AlertType.LOW_TPS)
+    assert threshold_alerts(alert_system, AlertType.HIGH_LATENCY) == threshold_alerts(reference, AlertType.HIGH_LATENCY)
+    
+    detector = alert_system.anomaly_detector
+    expected = reference.anomaly_detector
+    assert list(detector.tps_history) == list(expected.tps_history)
+    assert detector.detect_tps_anomaly(0.0)['stdev'] == pytest.approx(expected.detect_tps_anomaly(0.0)['stdev'])
+
+
+def test_schedule_check(alert_system):
+    """Test scheduled health checks repeat until monitoring stops"""
+    clock = [0.0]
+    scheduler = sched.scheduler(lambda: clock[0], lambda delay: clock.__setitem__(0, clock[0] + delay))
+    calls = []
+    
+    def metrics_source():
+        calls.append(clock[0])
+        if len(calls) == 3:
+            alert_system.stop_monitoring()
+        return {'tps': 5, 'latency': 50, 'active_nodes': 10}
+    
+    alert_system.schedule_check(scheduler, 30, metrics_source)
+    scheduler.run()
+    
+    assert calls == [30.0, 60.0, 90.0]
+    assert len(alert_system.get_active_alerts(AlertSeverity.WARNING)) == 3
+
+
+def test_monitor_loop(alert_system):
+    """Test the asyncio monitoring loop runs checks until stopped"""
+    calls = []
+    
+    def metrics_source():
+        calls.append(1)
+        if len(calls) == 2:
+            alert_system.stop_monitoring()
+        return {'tps': 100, 'latency': 50, 'active_nodes': 10}
+    
+    asyncio.run(asyncio.wait_for(alert_system.monitor_loop(metrics_source, check_interval=0.01), 5))
+    
+    assert len(calls) == 2
+    assert not alert_system.monitoring_active
+
+
 def test_check_node_behavior(alert_system):
     """Test node behavior checking"""
     behavior_data = {
@@ -277,6 +626,60 @@ def test_get_statistics(alert_system):
     assert 'by_type' in stats
 
 
+def test_statistics_track_resolution(alert_system):
+    """Test indexed statistics stay consistent as alerts are resolved"""
+    alerts = [
+        alert_system.create_alert(AlertType.LOW_TPS, AlertSeverity.WARNING, f"Alert {i}")
+        for i in range(5)
+    ]
+    alert_system.create_alert(AlertType.NODE_FAILURE, AlertSeverity.CRITICAL, "Node down")
+    
+    assert alert_system.resolve_alert(alerts[1].alert_id)
+    assert not alert_system.resolve_alert(alerts[1].alert_id)
+    assert not alert_system.resolve_alert("ALERT-999999")
+    assert alert_system.get_alert(alerts[1].alert_id).resolved
+    assert alert_system.get_alert("ALERT-999999") is None
+    
+    stats = alert_system.get_statistics()
+    
+    assert stats['total_alerts'] == 6
+    assert stats['active_alerts'] == 5
+    assert stats['resolved_alerts'] == 1
+    assert stats['by_severity']['warning'] == 5
+    assert stats['by_severity']['info'] == 0
+    assert stats['by_type']['node_failure'] == 1
+    assert [a.message for a in alert_system.get_active_alerts(AlertSeverity.WARNING)] == [
+        "Alert 0", "Alert 2", "Alert 3", "Alert 4"
+    ]
+    assert len(alert_system.get_recent_alerts(hours=1)) == 6
+
+
+def test_alert_history_is_bounded():
+    """Test the oldest resolved alerts are evicted first once the history is full"""
+    system = AlertSystem(max_alerts=5)
+    alerts = [
+        system.create_alert(AlertType.LOW_TPS, AlertSeverity.WARNING, f"Alert {i}")
+        for i in range(5)
+    ]
+    system.resolve_alert(alerts[2].alert_id)
+    
+    system.create_alert(AlertType.NODE_FAILURE, AlertSeverity.CRITICAL, "Alert 5")
+    
+    assert [a.message for a in system.alerts] == ["Alert 0", "Alert 1", "Alert 3", "Alert 4", "Alert 5"]
+    assert system.get_alert(alerts[2].alert_id) is None
+    
+    # With nothing resolved the oldest alert goes
+    system.create_alert(AlertType.LOW_TPS, AlertSeverity.WARNING, "Alert 6")
+    
+    stats = system.get_statistics()
+    
+    assert [a.message for a in system.get_active_alerts()] == ["Alert 1", "Alert 3", "Alert 4", "Alert 5", "Alert 6"]
+    assert stats['total_alerts'] == 5
+    assert stats['resolved_alerts'] == 0
+    assert stats['by_type']['low_tps'] == 4
+    assert stats['by_severity']['critical'] == 1
+
+
 def test_create_alert_system_factory():
     """Test factory function"""
     system = create_alert_system()
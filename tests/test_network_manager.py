@@ -10,7 +10,8 @@ from pathlib import Path
 from src.network.network_manager import (
     NetworkManager,
     NetworkType,
-    NetworkConfig
+    NetworkConfig,
+    _parse_ip
 )
 
 
@@ -189,5 +190,94 @@ class TestNetworkManager:
             Path(config_path).unlink()
 
 
+class TestNetworkInfo:
+    """Tests for cached network information"""
+    
+    def test_network_info_tracks_config_changes(self):
+        """Test cached info is isolated from callers and refreshed on bootstrap changes"""
+        manager = NetworkManager()
+        
+        info = manager.get_network_info()
+        info['bootstrap_nodes'].append("mutated:1")
+        info['p2p_port'] = 1
+        
+        assert manager.get_network_info()['bootstrap_nodes'] == []
+        assert manager.get_network_info()['p2p_port'] == 18080
+        
+        manager.add_bootstrap_node("seed.example.com:18080")
+        
+        assert manager.get_network_info()['bootstrap_nodes'] == ["seed.example.com:18080"]
+        
+        manager.set_current_network(NetworkType.MAINNET)
+        
+        assert not manager.get_network_info(NetworkType.TESTNET)['is_current']
+        assert manager.get_all_networks_info()['mainnet']['is_current']
+
+
+class TestPeerIPValidation:
+    """Tests for network-aware peer IP classification"""
+    
+    PRIVATE_IPS = ["10.1.2.3", "172.16.0.1", "172.31.255.255", "192.168.1.1", "127.0.0.1",
+                   "169.254.10.10", "fc00::1", "fd12:3456::1", "fe80::1", "::1"]
+    PUBLIC_IPS = ["8.8.8.8", "172.32.0.1", "172.15.255.255", "9.255.255.255", "192.169.0.0", "11.0.0.1", "2001:4860:4860::8888", "::ffff:10.0.0.1"]
+    
+    def test_is_public_ip(self):
+        """Test private, loopback and link-local ranges are not public"""
+        manager = NetworkManager()
+        
+        for ip in self.PRIVATE_IPS:
+            assert not manager.is_public_ip(ip), ip
+        for ip in self.PUBLIC_IPS:
+            assert manager.is_public_ip(ip), ip
+    
+    def test_is_public_ip_range_search(self):
+        """Test the bisect range search used without pytricia"""
+        manager = NetworkManager()
+        manager._private_trie_v4 = manager._private_trie_v6 = None
+        
+        for ip in self.PRIVATE_IPS:
+            assert not manager.is_public_ip(ip), ip
+        for ip in self.PUBLIC_IPS:
+            assert manager.is_public_ip(ip), ip
+    
+    def test_is_public_ip_rejects_malformed(self):
+        """Test malformed addresses are never reported as public"""
+        manager = NetworkManager()
+        
+        for ip in ["", "abc", "1.2.3", "999.1.1.1", "1.2.3.4.5", "gggg::1"]:
+            assert not manager.is_public_ip(ip), ip
+    
+    def test_validate_peer_ip(self):
+        """Test testnet accepts local peers while mainnet requires public ones"""
+        manager = NetworkManager()
+        
+        local = manager.validate_peer_ip("192.168.1.1")
+        assert local['is_valid'] and not local['is_public']
+        assert local['ip_info'] == {
+            'address': "192.168.1.1", 'type': 'IPv4',
+            'is_private': True, 'is_loopback': False, 'is_link_local': False
+        }
+        
+        manager.set_current_network(NetworkType.MAINNET)
+        
+        assert not manager.validate_peer_ip("192.168.1.1")['is_valid']
+        assert "Private" in manager.validate_peer_ip("10.0.0.1")['rejection_reason']
+        public = manager.validate_peer_ip("2001:4860:4860::8888")
+        assert public['is_valid'] and public['is_public']
+        assert public['ip_info']['type'] == 'IPv6'
+        invalid = manager.validate_peer_ip("not-an-ip")
+        assert not invalid['is_valid']
+        assert "Invalid" in invalid['rejection_reason']
+    
+    def test_parse_ip_is_cached(self):
+        """Test repeated peers reuse the cached parse"""
+        _parse_ip("203.0.113.7")
+        hits = _parse_ip.cache_info().hits
+        
+        _parse_ip("203.0.113.7")
+        
+        assert _parse_ip.cache_info().hits == hits + 1
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
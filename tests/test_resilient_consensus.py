@@ -4,6 +4,8 @@ Tests for Resilient Consensus System
 
 import pytest
 import asyncio
+import sys
+import threading
 import time
 from unittest.mock import Mock, AsyncMock
 
@@ -16,10 +18,27 @@ from src.consensus.resilient_consensus import (
     AttackType,
     NetworkPartition,
     SyncState,
-    AttackDetection
+    AttackDetection,
+    BlockedNodeSet,
+    MessageRateTracker,
+    FloodingEvidence
 )
 
 
+class TestRecords:
+    """Tests for the consensus record dataclasses"""
+    
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="slotted dataclasses need Python 3.10+")
+    def test_records_are_slotted(self):
+        """Test that hot-path records do not carry a per-instance __dict__"""
+        partition = NetworkPartition(partition_id="p", node_ids={"node0"}, partition_size=1, is_majority=False)
+        sync_state = SyncState(node_id="node0", last_sync_time=0.0, blocks_behind=0)
+        attack = AttackDetection(attack_type=AttackType.FLOODING, suspected_nodes=["node0"])
+        
+        for record in (partition, sync_state, attack):
+            assert not hasattr(record, '__dict__')
+
+
 class TestPartitionDetector:
     """Tests for PartitionDetector"""
     
@@ -57,6 +76,26 @@ class TestPartitionDetector:
         assert not partition.is_majority
         assert partition.partition_size == 3
     
+    def test_detect_partition_unchanged_returns_cached(self):
+        """Test that repeated detection with unchanged connectivity reuses the partition"""
+        detector = PartitionDetector(total_nodes=10)
+        
+        all_nodes = {f"node{i}" for i in range(10)}
+        reachable_nodes = {f"node{i}" for i in range(7)}
+        
+        first = detector.detect_partition(reachable_nodes, all_nodes)
+        second = detector.detect_partition(set(reachable_nodes), all_nodes)
+        
+        assert second is first
+        assert len(detector.partitions) == 1
+        
+        # Once cleared, the same input yields a fresh partition
+        detector.clear_partition(first.partition_id)
+        third = detector.detect_partition(reachable_nodes, all_nodes)
+        
+        assert third is not first
+        assert third.partition_id in detector.partitions
+    
     def test_no_partition_detected(self):
         """Test when no significant partition exists"""
         detector = PartitionDetector(total_nodes=10)
@@ -103,6 +142,23 @@ class TestPartitionDetector:
         assert detector.is_in_majority_partition("node0")
         assert not detector.is_in_majority_partition("node9")
     
+    def test_majority_membership_follows_partition_changes(self):
+        """Test majority membership after minority detection and clearing"""
+        detector = PartitionDetector(total_nodes=10)
+        
+        all_nodes = {f"node{i}" for i in range(10)}
+        majority = detector.detect_partition({f"node{i}" for i in range(7)}, all_nodes)
+        
+        # node0 moves into a minority partition
+        detector.detect_partition({"node0", "node8", "node9"}, all_nodes)
+        
+        assert not detector.is_in_majority_partition("node0")
+        assert detector.is_in_majority_partition("node1")
+        
+        detector.clear_partition(majority.partition_id)
+        
+        assert not detector.is_in_majority_partition("node1")
+    
     def test_merge_partitions(self):
         """Test merging multiple partitions"""
         detector = PartitionDetector(total_nodes=10)
@@ -121,6 +177,8 @@ class TestPartitionDetector:
         assert merged is not None
         assert merged.partition_size == 10
         assert merged.is_majority
+        assert list(detector.partitions) == [merged.partition_id]
+        assert set(detector.node_to_partition.values()) == {merged.partition_id}
     
     def test_clear_partition(self):
         """Test clearing a partition"""
@@ -179,6 +237,29 @@ class TestAutoSynchronizer:
         assert result
         assert synchronizer.sync_states["node1"].blocks_behind == 0
     
+    @pytest.mark.asyncio
+    async def test_synchronize_node_height_probe(self):
+        """Test that a matching height probe skips the full state transfer"""
+        synchronizer = AutoSynchronizer()
+        
+        heights = {"ref_node1": 100, "node1": 100, "node2": 90}
+        get_blockchain_state = AsyncMock(return_value={'block_height': 100, 'blocks': []})
+        
+        synchronizer.register_sync_callback("peek_height", AsyncMock(side_effect=heights.get))
+        synchronizer.register_sync_callback("get_blockchain_state", get_blockchain_state)
+        synchronizer.register_sync_callback(
+            "get_local_state",
+            AsyncMock(return_value={'block_height': 90, 'blocks': []})
+        )
+        
+        assert await synchronizer.synchronize_node("node1", ["ref_node1"])
+        assert get_blockchain_state.call_count == 0
+        assert synchronizer.sync_states["node1"].sync_progress == 1.0
+        
+        # A height mismatch falls through to the full synchronization path
+        assert await synchronizer.synchronize_node("node2", ["ref_node1"])
+        assert get_blockchain_state.call_count == 1
+    
     @pytest.mark.asyncio
     async def test_synchronize_node_behind(self):
         """Test synchronizing a node that's behind"""
@@ -208,6 +289,58 @@ class TestAutoSynchronizer:
         assert synchronizer.sync_states["node1"].blocks_behind == 0
         assert synchronizer.sync_states["node1"].sync_progress == 1.0
     
+    @pytest.mark.asyncio
+    async def test_synchronize_node_blocking_callbacks(self):
+        """Test that synchronous callbacks run off the event loop thread"""
+        synchronizer = AutoSynchronizer()
+        loop_thread = threading.get_ident()
+        apply_threads = []
+        
+        def validate_and_apply_blocks(node_id):
+            apply_threads.append(threading.get_ident())
+            return True
+        
+        synchronizer.register_sync_callback(
+            "get_blockchain_state",
+            Mock(return_value={'block_height': 100, 'blocks': []})
+        )
+        synchronizer.register_sync_callback(
+            "get_local_state",
+            AsyncMock(return_value={'block_height': 90, 'blocks': []})
+        )
+        synchronizer.register_sync_callback("validate_and_apply_blocks", validate_and_apply_blocks)
+        
+        result = await synchronizer.synchronize_node("node1", ["ref_node1"])
+        
+        assert result
+        assert len(apply_threads) == 1
+        assert apply_threads[0] != loop_thread
+    
+    @pytest.mark.asyncio
+    async def test_async_callables_are_awaited(self):
+        """Test that callables wrapping coroutines are awaited on the event loop"""
+        synchronizer = AutoSynchronizer()
+        loop_thread = threading.get_ident()
+        state_threads = []
+        
+        async def get_blockchain_state(node_id):
+            state_threads.append(threading.get_ident())
+            return {'block_height': 100, 'blocks': []}
+        
+        class LocalState:
+            async def __call__(self, node_id):
+                state_threads.append(threading.get_ident())
+                return {'block_height': 90, 'blocks': []}
+        
+        synchronizer.register_sync_callback("get_blockchain_state", lambda node_id: get_blockchain_state(node_id))
+        synchronizer.register_sync_callback("get_local_state", LocalState())
+        synchronizer.register_sync_callback("validate_and_apply_blocks", Mock(return_value=True))
+        
+        result = await synchronizer.synchronize_node("node1", ["ref_node1"])
+        
+        assert result
+        assert state_threads == [loop_thread, loop_thread]
+    
     @pytest.mark.asyncio
     async def test_synchronize_node_failure(self):
         """Test synchronization failure"""
@@ -240,7 +373,7 @@ class TestAutoSynchronizer:
         # Create sync state
         synchronizer.sync_states["node1"] = SyncState(
             node_id="node1",
-            last_sync_time=time.time(),
+            last_sync_time=time.monotonic(),
             blocks_behind=0,
             sync_progress=0.75
         )
@@ -294,6 +427,59 @@ class TestAttackDefenseSystem:
         
         assert anomaly_score > 0.7  # Should be high for anomalous behavior
     
+    def test_analyze_node_behavior_streamed_samples(self):
+        """Test timing analysis from single samples over a sliding window"""
+        defense = AttackDefenseSystem(response_window_size=4)
+        
+        for sample in [50, 60, 55, 58]:
+            assert defense.analyze_node_behavior("node1", {'response_time': sample}) == 0.0
+        
+        # Slow samples push the oldest fast ones out of the window
+        scores = [defense.analyze_node_behavior("node1", {'response_time': 600}) for _ in range(2)]
+        
+        assert scores == [0.0, pytest.approx(0.3)]
+        assert len(defense.response_windows["node1"]) == 4
+        assert defense.response_windows["node1"].average == pytest.approx((55 + 58 + 600 * 2) / 4)
+    
+    def test_analyze_all(self):
+        """Test batch behavior analysis matches per-node analysis"""
+        defense = AttackDefenseSystem()
+        
+        behavior_frame = {
+            'fast': {'response_times': [50, 60], 'validation_failures': 1, 'total_validations': 100},
+            'slow': {'response_times': [400, 500]},
+            'failing': {'validation_failures': 50, 'total_validations': 100, 'pattern_score': 0.5},
+            'idle': {}
+        }
+        
+        node_ids, scores = defense.analyze_all(behavior_frame)
+        
+        assert node_ids == ['fast', 'slow', 'failing', 'idle']
+        assert scores.tolist() == pytest.approx([0.0, 0.3, 0.55, 0.0])
+        
+        for node_id, behavior_data in behavior_frame.items():
+            single = AttackDefenseSystem().analyze_node_behavior(node_id, behavior_data)
+            assert single == pytest.approx(scores[node_ids.index(node_id)])
+        
+        assert defense.node_behavior_scores['failing'] == pytest.approx(0.45)
+    
+    def test_node_behavior_scores(self):
+        """Test behavior scores recorded by analysis"""
+        defense = AttackDefenseSystem()
+        
+        assert defense.node_behavior_scores['unknown'] == 1.0
+        
+        for i in range(100):
+            defense.analyze_node_behavior(f"node{i}", {'response_times': [50]})
+        defense.analyze_node_behavior("node42", {
+            'validation_failures': 50,
+            'total_validations': 100
+        })
+        
+        assert len(defense.node_behavior_scores) == 100
+        assert defense.node_behavior_scores['node42'] == pytest.approx(0.6)
+        assert defense.node_behavior_scores.scores_below(0.7) == ['node42']
+    
     def test_detect_sybil_attack(self):
         """Test detecting Sybil attack"""
         defense = AttackDefenseSystem()
@@ -349,6 +535,34 @@ class TestAttackDefenseSystem:
         assert 'node11' in attack.suspected_nodes
         assert 'node12' in attack.suspected_nodes
     
+    def test_detect_flooding_attack_with_tracker(self):
+        """Test flooding detection from an incrementally updated rate tracker"""
+        defense = AttackDefenseSystem()
+        
+        tracker = MessageRateTracker()
+        for i in range(10):
+            tracker.set_rate(f'node{i}', 100)
+        tracker.set_rate('node10', 50)
+        tracker.set_rate('node10', 20000)  # Rate update replaces previous value
+        
+        assert tracker.average == pytest.approx((100 * 10 + 20000) / 11)
+        
+        attack = defense.detect_flooding_attack(tracker)
+        
+        assert attack is not None
+        assert attack.suspected_nodes == ['node10']
+        assert isinstance(attack.evidence, FloodingEvidence)
+        assert attack.evidence_dict() == {
+            'avg_rate': tracker.average,
+            'threshold': tracker.average * 5
+        }
+        
+        tracker.remove('node10')
+        
+        assert len(tracker) == 10
+        assert tracker.average == 100
+        assert defense.detect_flooding_attack(tracker) is None
+    
     def test_detect_consensus_manipulation(self):
         """Test detecting consensus manipulation"""
         defense = AttackDefenseSystem()
@@ -407,6 +621,36 @@ class TestAttackDefenseSystem:
         assert 'node1' not in defense.blocked_nodes
         assert defense.node_behavior_scores['node1'] == 0.5
     
+    def test_blocked_node_filter(self):
+        """Test that the blocked-node filter never hides a blocked node"""
+        defense = AttackDefenseSystem()
+        
+        defense.blocked_nodes.update(f"node{i}" for i in range(500))
+        defense.blocked_nodes |= {"late_node"}
+        
+        assert all(defense.is_node_blocked(f"node{i}") for i in range(500))
+        assert defense.is_node_blocked("late_node")
+        assert not any(defense.is_node_blocked(f"peer{i}") for i in range(500))
+        
+        defense.unblock_node("node0")
+        
+        assert not defense.is_node_blocked("node0")
+        assert defense.is_node_blocked("node1")
+    
+    def test_blocked_node_set_mutations_bump_version(self):
+        """Test that every supported mutation bumps the version and unsupported ones are absent"""
+        blocked = BlockedNodeSet({"node1"})
+        
+        for mutate in (lambda: blocked.add("node2"), lambda: blocked.update(["node3"]),
+                       lambda: blocked.remove("node1"), lambda: blocked.discard("node2"),
+                       blocked.clear):
+            version = blocked.version
+            mutate()
+            assert blocked.version > version
+        
+        for name in ("pop", "difference_update", "intersection_update", "__isub__", "__iand__"):
+            assert not hasattr(blocked, name)
+    
     def test_get_defense_stats(self):
         """Test getting defense statistics"""
         defense = AttackDefenseSystem()
@@ -434,6 +678,35 @@ class TestAttackDefenseSystem:
         assert stats['mitigated_attacks'] == 1
         assert stats['blocked_nodes'] == 1
         assert stats['mitigation_rate'] == 50.0
+    
+    @pytest.mark.asyncio
+    async def test_attack_history_is_bounded(self):
+        """Test that attack history evicts old attacks and keeps stats consistent"""
+        defense = AttackDefenseSystem(max_attack_history=3)
+        
+        attacks = [
+            AttackDetection(attack_type=AttackType.FLOODING, suspected_nodes=[f'node{i}'])
+            for i in range(4)
+        ]
+        defense.detected_attacks.extend(attacks)
+        
+        await defense.mitigate_attack(attacks[1])
+        
+        stats = defense.get_defense_stats()
+        
+        assert len(defense.get_attack_history()) == 3
+        assert defense.get_attack_history()[0] is attacks[1]
+        assert stats['total_attacks_detected'] == 3
+        assert stats['mitigated_attacks'] == 1
+        assert stats['attack_types'] == {'flooding': 3}
+        
+        defense.detected_attacks.append(
+            AttackDetection(attack_type=AttackType.SYBIL_ATTACK, suspected_nodes=['node9'])
+        )
+        stats = defense.get_defense_stats()
+        
+        assert stats['mitigated_attacks'] == 0
+        assert stats['attack_types'] == {'flooding': 2, 'sybil_attack': 1}
 
 
 class TestResilientConsensusSystem:
@@ -497,6 +770,48 @@ class TestResilientConsensusSystem:
         assert state['active_partitions'] == 0
         assert state['blocked_nodes'] == 0
         assert 'defense_stats' in state
+    
+    @pytest.mark.asyncio
+    async def test_get_system_state_tracks_changes(self):
+        """Test that cached system state is refreshed when components change"""
+        system = ResilientConsensusSystem(total_nodes=10)
+        
+        assert system.get_system_state() == system.get_system_state()
+        
+        attack = AttackDetection(attack_type=AttackType.FLOODING, suspected_nodes=['node1'])
+        system.attack_defense.detected_attacks.append(attack)
+        await system.attack_defense.mitigate_attack(attack)
+        
+        state = system.get_system_state()
+        
+        assert state['detected_attacks'] == 1
+        assert state['blocked_nodes'] == 1
+        assert state['defense_stats']['mitigated_attacks'] == 1
+        
+        all_nodes = {f"node{i}" for i in range(10)}
+        await system.handle_partition({f"node{i}" for i in range(7)}, all_nodes)
+        
+        state = system.get_system_state()
+        
+        assert state['network_state'] == NetworkState.PARTITIONED.value
+        assert state['active_partitions'] == 1
+        
+        system.attack_defense.unblock_node('node1')
+        
+        assert system.get_system_state()['defense_stats']['blocked_nodes'] == 0
+    
+    def test_cached_state_is_not_shared(self):
+        """Test that mutating returned state does not corrupt the cached copy"""
+        system = ResilientConsensusSystem(total_nodes=10)
+        system.attack_defense.detected_attacks.append(
+            AttackDetection(attack_type=AttackType.FLOODING, suspected_nodes=['node1'])
+        )
+        
+        system.get_system_state()['defense_stats']['attack_types'].clear()
+        system.attack_defense.get_defense_stats()['attack_types'].clear()
+        
+        assert system.get_system_state()['defense_stats']['attack_types'] == {'flooding': 1}
+        assert system.attack_defense.get_defense_stats()['attack_types'] == {'flooding': 1}
 
 
 if __name__ == "__main__":
@@ -0,0 +1,219 @@
+"""
+Tests for wallet and cryptographic utilities
+"""
+
+import pytest
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives.asymmetric import ed25519
+
+from src.crypto.wallet import (
+    BURN_ADDRESS,
+    FAUCET_ADDRESS,
+    LIQUIDITY_POOL_ADDRESS,
+    derive_address,
+    derive_address_from_pubkey,
+    generate_burn_address,
+    generate_faucet_address,
+    generate_keypair,
+    generate_keypair_async,
+    generate_keypairs_batch,
+    generate_liquidity_pool_address,
+    generate_mnemonic_from_key,
+    generate_system_address,
+    generate_system_address_async,
+    generate_validator_address,
+    restore_keypair_from_mnemonic,
+    sign_transaction,
+    sign_transaction_async,
+    sign_transaction_bytes,
+    validate_address,
+    validate_addresses,
+    verify_signature,
+    verify_signature_async,
+    verify_signature_bytes,
+    verify_signatures_batch
+)
+
+
+PRIVATE_KEY_HEX = "11" * 32
+PUBLIC_KEY_HEX = "d04ab232742bb4ab3a1368bd4615e4e6d0224ab71a016baf8520a332c9778737"
+ADDRESS = "PG1PREM9Eg7cGMMCTyCL2gkLh8PM8ZqztVbQ"
+MNEMONIC = "actress pelican hand disorder raven dinner devote place offer early travel label"
+
+
+class TestAddresses:
+    """Tests for address derivation and validation"""
+    
+    def test_derive_address(self):
+        """Test deriving a known address from a public key"""
+        assert derive_address(PUBLIC_KEY_HEX) == ADDRESS
+        assert derive_address_from_pubkey(bytes.fromhex(PUBLIC_KEY_HEX)) == ADDRESS
+    
+    def test_validate_address(self):
+        """Test validating well-formed and malformed addresses"""
+        assert validate_address(ADDRESS)
+        assert not validate_address("XX" + ADDRESS[2:])
+        assert not validate_address(ADDRESS[:-1] + ("1" if ADDRESS[-1] != "1" else "2"))
+        assert not validate_address("PG0OIl")
+        assert not validate_address("PG")
+    
+    def test_validate_addresses(self):
+        """Test bulk validation matches single-address validation"""
+        addresses = [ADDRESS, "XX" + ADDRESS[2:], "PG0OIl", "PG", ADDRESS[:-1] + "2", None]
+        
+        assert validate_addresses(addresses) == [True, False, False, False, False, False]
+        assert validate_addresses(addresses[:-1]) == [validate_address(a) for a in addresses[:-1]]
+    
+    def test_system_addresses(self):
+        """Test that system addresses are deterministic"""
+        assert generate_faucet_address() == "PG16xEo1bdgWjS5Vs5vqjHYTB4hFEFUZHNZi"
+        assert generate_burn_address() == "PG1QB3jhjHwFhCc8SPsE8jPddGT21Da7QTzd"
+        assert generate_liquidity_pool_address() == "PG1HZ4DJJVRiSPe1zAazXAeqmr3r2e2WJ64"
+        assert generate_validator_address("node1") == "PG1N4aiaj2xGzxEq8utGiRNi9xQHrb82rUZm"
+        assert FAUCET_ADDRESS == generate_system_address("FAUCET")
+        assert BURN_ADDRESS == generate_system_address("BURN_ADDRESS")
+        assert LIQUIDITY_POOL_ADDRESS == generate_system_address("LIQUIDITY_POOL")
+    
+    def test_system_address_is_memoized(self):
+        """Test that repeated system address requests hit the cache"""
+        generate_system_address("MEMO_TEST")
+        hits = generate_system_address.cache_info().hits
+        
+        generate_system_address("MEMO_TEST")
+        
+        assert generate_system_address.cache_info().hits == hits + 1
+
+
+class TestKeys:
+    """Tests for key pairs, mnemonics and signatures"""
+    
+    def test_generate_keypair(self):
+        """Test generating a new key pair"""
+        keypair = generate_keypair()
+        
+        assert len(bytes.fromhex(keypair['private_key'])) == 32
+        assert len(bytes.fromhex(keypair['public_key'])) == 32
+        assert len(keypair['mnemonic'].split()) == 12
+        assert validate_address(derive_address(keypair['public_key']))
+    
+    def test_generate_keypairs_batch(self):
+        """Test batch key generation produces matching key pairs"""
+        keypairs = generate_keypairs_batch(8)
+        
+        assert keypairs['private_keys'].shape == (8, 32)
+        assert keypairs['public_keys'].shape == (8, 32)
+        assert len({row.tobytes() for row in keypairs['private_keys']}) == 8
+        
+        for private_key, public_key in zip(keypairs['private_keys'], keypairs['public_keys']):
+            signature = sign_transaction(private_key.tobytes().hex(), "hello")
+            assert verify_signature(public_key.tobytes().hex(), signature, "hello")
+    
+    def test_mnemonic_round_trip(self):
+        """Test generating and restoring from a mnemonic"""
+        assert generate_mnemonic_from_key(bytes.fromhex(PRIVATE_KEY_HEX)) == MNEMONIC
+        
+        restored = restore_keypair_from_mnemonic(MNEMONIC)
+        
+        assert restored == {
+            'private_key': "1555c6715fa2510cfdb21cda2ee7255f37f5fd83cd39381bb09d8ddf724fd678",
+            'public_key': "35be4286576d66276ac3dc80da6dade5f7146226a9f2db77c5ef294ffccf04eb",
+            'mnemonic': MNEMONIC
+        }
+        assert restore_keypair_from_mnemonic("not a valid mnemonic") is None
+    
+    def test_restore_rejects_bad_checksum(self):
+        """Test that phrases of valid words with a wrong checksum are rejected"""
+        assert restore_keypair_from_mnemonic(" ".join(["abandon"] * 11 + ["about"])) is not None
+        assert restore_keypair_from_mnemonic(" ".join(["abandon"] * 12)) is None
+        assert restore_keypair_from_mnemonic(" ".join(["zoo"] * 23 + ["vote"])) is not None
+        assert restore_keypair_from_mnemonic(" ".join(["zoo"] * 24)) is None
+    
+    def test_sign_and_verify(self):
+        """Test signing and verifying transaction data"""
+        signature = sign_transaction(PRIVATE_KEY_HEX, "hello")
+        
+        assert signature.startswith("edbf4dd3087f7b7c")
+        assert verify_signature(PUBLIC_KEY_HEX, signature, "hello")
+        assert not verify_signature(PUBLIC_KEY_HEX, signature, "hello!")
+        assert not verify_signature("not hex", signature, "hello")
+    
+    def test_sign_and_verify_bytes(self):
+        """Test the raw-bytes signing path matches the hex API"""
+        private_key = bytes.fromhex(PRIVATE_KEY_HEX)
+        public_key = bytes.fromhex(PUBLIC_KEY_HEX)
+        
+        signature = sign_transaction_bytes(private_key, b"hello")
+        
+        assert signature.hex() == sign_transaction(PRIVATE_KEY_HEX, "hello")
+        assert verify_signature_bytes(public_key, signature, b"hello")
+        assert not verify_signature_bytes(public_key, signature[:-1], b"hello")
+        assert not verify_signature_bytes(public_key[:-1], signature, b"hello")
+    
+    def test_verify_matches_transaction_backend(self):
+        """Test that verification agrees with cryptography even when PyNaCl is installed"""
+        # Small-order edge case where OpenSSL and libsodium disagree
+        identity = b"\x01" + b"\x00" * 31
+        signature = identity + b"\x00" * 32
+        
+        try:
+            ed25519.Ed25519PublicKey.from_public_bytes(identity).verify(signature, b"hello")
+            expected = True
+        except InvalidSignature:
+            expected = False
+        
+        assert verify_signature_bytes(identity, signature, b"hello") == expected
+        assert verify_signatures_batch([(identity.hex(), signature.hex(), "hello")]) == [expected]
+    
+    def test_verify_signatures_batch(self):
+        """Test batch verification keeps per-item results in order"""
+        other = generate_keypair()
+        items = []
+        expected = []
+        for i in range(300):
+            data = f"tx{i}"
+            if i % 3 == 0:
+                items.append((PUBLIC_KEY_HEX, sign_transaction(PRIVATE_KEY_HEX, data), data))
+                expected.append(True)
+            elif i % 3 == 1:
+                items.append((other['public_key'], sign_transaction(PRIVATE_KEY_HEX, data), data))
+                expected.append(False)
+            else:
+                items.append(("zz", "00", data))
+                expected.append(False)
+        
+        assert verify_signatures_batch(items) == expected
+        assert verify_signatures_batch([]) == []
+    
+    def test_verify_rejects_malformed_input(self):
+        """Test that non-str and None inputs verify as False instead of raising"""
+        signature = sign_transaction(PRIVATE_KEY_HEX, "hello")
+        malformed = [
+            (None, signature, "hello"),
+            (b"..", "00" * 64, "hello"),
+            (PUBLIC_KEY_HEX, None, "hello"),
+            (PUBLIC_KEY_HEX, signature, None),
+            (["unhashable"], signature, "hello"),
+            (PUBLIC_KEY_HEX, 123, "hello"),
+        ]
+        
+        for item in malformed:
+            assert verify_signature(*item) is False
+        assert not verify_signature_bytes(None, b"", b"hello")
+        assert not verify_signature_bytes(bytes.fromhex(PUBLIC_KEY_HEX), bytes.fromhex(signature), "hello")
+        
+        results = verify_signatures_batch(malformed + [(PUBLIC_KEY_HEX, signature, "hello")])
+        assert results == [False] * len(malformed) + [True]
+
+    
+    @pytest.mark.asyncio
+    async def test_async_wrappers(self):
+        """Test the thread-pool backed async variants"""
+        keypair = await generate_keypair_async()
+        signature = await sign_transaction_async(keypair['private_key'], "hello")
+        
+        assert await verify_signature_async(keypair['public_key'], signature, "hello")
+        assert await generate_system_address_async("FAUCET") == FAUCET_ADDRESS
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])